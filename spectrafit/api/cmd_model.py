@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+
 from datetime import datetime
 from datetime import timezone
 from getpass import getuser
@@ -19,6 +21,7 @@ from spectrafit import __version__
 from spectrafit.api.tools_model import AutopeakAPI
 from spectrafit.api.tools_model import DataPreProcessingAPI
 from spectrafit.api.tools_model import GlobalFittingAPI
+from spectrafit.api.tools_model import SolverModelsAPI
 
 
 class DescriptionAPI(BaseModel):
@@ -78,6 +81,9 @@ class CMDModelAPI(BaseModel):
     energy_start: float | None = DataPreProcessingAPI().energy_start
     energy_stop: float | None = DataPreProcessingAPI().energy_stop
     smooth: int | None = DataPreProcessingAPI().smooth
+    smooth_method: str = DataPreProcessingAPI().smooth_method
+    smooth_order: int = DataPreProcessingAPI().smooth_order
+    smooth_kernel: list[float] | None = DataPreProcessingAPI().smooth_kernel
     shift: float | None = DataPreProcessingAPI().shift
     column: list[int | str] = DataPreProcessingAPI().column
     separator: str = "\t"
@@ -85,8 +91,83 @@ class CMDModelAPI(BaseModel):
     header: int | None = None
     comment: str | None = None
     global_: int = Field(GlobalFittingAPI().global_)
+    backend: str = SolverModelsAPI().backend
+    cache: str | None = Field(default=None, description="Directory of the fit cache")
+    data_cache: bool = Field(
+        default=False,
+        description="Store the parsed data as binary sidecar next to the data file",
+    )
+    cache_size: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum size of the fit cache in megabytes",
+    )
+    cache_age: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum age of the unused cache entries in days",
+    )
+    timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Wall-clock budget of the fit in seconds",
+    )
+    progress: str | None = Field(
+        default=None,
+        description="Stream the progress to 'stderr' or to a JSON-lines file",
+    )
     autopeak: AutopeakAPI | bool | Any = False
     noplot: bool = False
     version: bool = False
     verbose: int = Field(default=0, ge=0, le=2)
     description: DescriptionAPI | None = Field(DescriptionAPI())
+
+
+class BatchAPI(BaseModel):
+    """Model for the batch fitting command line argument."""
+
+    infiles: list[str] = Field(
+        default=[],
+        description="Filenames or glob patterns of the spectra",
+    )
+    manifest: str | None = Field(
+        default=None,
+        description="Text file listing one filename or glob pattern per line",
+    )
+    input: str = Field(default="fitting_input.toml")
+    outdir: str = Field(
+        default="spectrafit_batch",
+        description="Directory for the results of the single fits",
+    )
+    workers: int = Field(
+        default_factory=lambda: os.cpu_count() or 1,
+        ge=1,
+        description="Number of worker processes",
+    )
+    retries: int = Field(
+        default=1,
+        ge=0,
+        description="Number of retries of failed fits",
+    )
+    summary: str = Field(
+        default="batch_summary.csv",
+        description="Filename of the combined summary table within `outdir`",
+    )
+    series: bool = Field(
+        default=False,
+        description="Start each fit from the best values of the previous fit",
+    )
+    chunks: int = Field(
+        default=1,
+        ge=1,
+        description="Number of chunks of the series, which are chained in parallel",
+    )
+    resume: bool = Field(
+        default=True,
+        description="Skip the spectra, which are already successfully fitted",
+    )
+    timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Wall-clock budget of each fit in seconds",
+    )
@@ -15,6 +15,11 @@ class MoessbauerConstants(BaseModel):
         description="Nuclear magneton in J/T",
     )
 
+    joule_to_ev: float = Field(
+        default=1 / 1.602176634e-19,
+        description="Convert energy in J to eV",
+    )
+
     # 57Fe specific constants
     gamma_57fe: float = Field(
         default=8.67e-9,
@@ -22,6 +27,10 @@ class MoessbauerConstants(BaseModel):
     )
     g_factor_57fe: float = Field(
         default=0.18,
+        description="g-factor for 57Fe ground state",
+    )
+    g_factor_57fe_excited: float = Field(
+        default=-0.10327,
         description="g-factor for 57Fe excited state",
     )
     quadrupole_moment_57fe: float = Field(
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import Literal
 
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import Field
+from pydantic import field_validator
 
 
 class AutopeakAPI(BaseModel):
@@ -52,6 +54,19 @@ class DataPreProcessingAPI(BaseModel):
         ge=0,
         description="Smoothing level of the spectra; default to 0.",
     )
+    smooth_method: Literal["box", "gaussian", "savgol", "kernel"] = Field(
+        default="box",
+        description="Filter of the smoothing; default to 'box'.",
+    )
+    smooth_order: int = Field(
+        default=2,
+        ge=0,
+        description="Polynomial order of the Savitzky-Golay filter; default to 2.",
+    )
+    smooth_kernel: list[float] | None = Field(
+        default=None,
+        description="Kernel of the 'kernel' smoothing; default to None.",
+    )
     shift: float = Field(
         default=0,
         description="Shift the energy axis; default to 0.",
@@ -69,6 +84,171 @@ class GlobalFittingAPI(BaseModel):
     global_: int = Field(default=0, ge=0, le=2, description="Global fitting routine.")
 
 
+class MultiStartAPI(BaseModel):
+    """Definition of the multi-start optimization of SpectraFit."""
+
+    starts: int = Field(
+        default=16,
+        ge=1,
+        description="Number of the sampled initial parameter sets",
+    )
+    sampling: Literal["sobol", "lhs"] = Field(
+        default="sobol",
+        description="Sobol sequence or Latin hypercube sampling of the bounds",
+    )
+    workers: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of worker processes; default to the number of CPUs",
+    )
+    max_nfev: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of function evaluations of each start",
+    )
+    target: float | None = Field(
+        default=None,
+        ge=0,
+        description="Stop once a start reaches a chi-square below the target",
+    )
+    seed: int | None = Field(default=None, description="Seed of the sampling")
+    model_config = ConfigDict(extra="forbid")
+
+
+class DecompositionAPI(BaseModel):
+    """Definition of the region decomposition of SpectraFit."""
+
+    window: float = Field(
+        default=3.0,
+        gt=0,
+        description="Extent of the peaks in multiples of their FWHM around the center",
+    )
+    workers: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of worker processes; default to the number of CPUs",
+    )
+    refine: bool = Field(
+        default=True,
+        description="Refine the merged parameters by a joint fit of all parameters",
+    )
+    model_config = ConfigDict(extra="forbid")
+
+
+class MultiResolutionAPI(BaseModel):
+    """Definition of the coarse-to-fine multi-resolution fitting of SpectraFit."""
+
+    levels: list[int] = Field(
+        default=[8, 2],
+        min_length=1,
+        description="Reduction factors of the resolution of the coarse fits",
+    )
+    binning: Literal["mean", "decimate"] = Field(
+        default="mean",
+        description="Average the bins of the spectrum or keep every n-th point",
+    )
+    max_nfev: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of function evaluations of each coarse fit",
+    )
+    model_config = ConfigDict(extra="forbid")
+
+    @field_validator("levels")
+    @classmethod
+    def check_levels(cls, v: list[int]) -> list[int]:
+        """Check if the reduction factors are reducing the resolution."""
+        if all(level >= 2 for level in v):  # noqa: PLR2004
+            return v
+        msg = f"The reduction factors {v} have to be at least 2."
+        raise ValueError(msg)
+
+
+class MarkovChainAPI(BaseModel):
+    """Definition of the Markov chain Monte Carlo sampling of SpectraFit."""
+
+    walkers: int | None = Field(
+        default=None,
+        ge=2,
+        description="Number of walkers; default to max(32, 2 · n_varys + 2)",
+    )
+    steps: int = Field(
+        default=5000,
+        ge=1,
+        description="Maximum number of steps of the walkers",
+    )
+    burn: int | None = Field(
+        default=None,
+        ge=0,
+        description="Discarded steps; default to twice the autocorrelation time",
+    )
+    thin: int | None = Field(
+        default=None,
+        ge=1,
+        description="Thinning of the chain; default to half the autocorrelation time",
+    )
+    vectorize: bool = Field(
+        default=True,
+        description="Evaluate the log-probability of all walkers in one call",
+    )
+    workers: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of worker processes for the walkers instead of vectorize",
+    )
+    autocorr: bool = Field(
+        default=True,
+        description="Stop early, once the chain is longer than `tau_factor` · tau",
+    )
+    check: int = Field(
+        default=100,
+        ge=1,
+        description="Interval of the steps for the estimation of tau",
+    )
+    tau_factor: float = Field(
+        default=50.0,
+        gt=0,
+        description="Minimum length of the chain in multiples of tau",
+    )
+    tau_rtol: float = Field(
+        default=0.01,
+        gt=0,
+        description="Maximum relative change of tau for the convergence",
+    )
+    seed: int | None = Field(default=None, description="Seed of the walkers")
+    model_config = ConfigDict(extra="forbid")
+
+
+class MonitorAPI(BaseModel):
+    """Definition of the convergence monitor of SpectraFit."""
+
+    timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Wall-clock budget of the fit in seconds",
+    )
+    rtol: float | None = Field(
+        default=None,
+        gt=0,
+        description="Minimum relative improvement of the best chi-square",
+    )
+    patience: int = Field(
+        default=100,
+        ge=1,
+        description="Function evaluations without `rtol` improvement before stopping",
+    )
+    progress: str | None = Field(
+        default=None,
+        description="Stream the progress to 'stderr' or to a JSON-lines file",
+    )
+    interval: float = Field(
+        default=1.0,
+        ge=0,
+        description="Interval of the progress records in seconds",
+    )
+    model_config = ConfigDict(extra="forbid")
+
+
 class SolverModelsAPI(BaseModel):
     """Definition of the solver of SpectraFit."""
 
@@ -80,6 +260,87 @@ class SolverModelsAPI(BaseModel):
         default={"max_nfev": None, "method": "leastsq"},
         description="Optimzer options",
     )
+    jacobian: bool = Field(
+        default=False,
+        description=(
+            "Use the analytic Jacobian of the models for the `leastsq` and "
+            "`least_squares` optimizer"
+        ),
+    )
+    sparse: bool = Field(
+        default=False,
+        description=(
+            "Use the sparse Jacobian of the global fitting with the `least_squares` "
+            "optimizer"
+        ),
+    )
+    projection: bool = Field(
+        default=False,
+        description=(
+            "Solve the linear parameters like the amplitudes by linear least squares "
+            "within the fit of the nonlinear parameters"
+        ),
+    )
+    backend: Literal["numpy", "numexpr", "numba"] = Field(
+        default="numpy",
+        description="Kernel backend of the models",
+    )
+    links: bool = Field(
+        default=False,
+        description=(
+            "Link the shared parameters of the global fitting natively instead of "
+            "by `lmfit` expressions"
+        ),
+    )
+    faddeeva: Literal["wofz", "humlicek"] = Field(
+        default="wofz",
+        description=(
+            "Implementation of the Faddeeva function of the Voigt models, which is "
+            "the exact `wofz` or the fast approximation `humlicek`"
+        ),
+    )
+    window: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Evaluate the localized models only within center ± window · FWHM"
+        ),
+    )
+    multistart: MultiStartAPI | None = Field(
+        default=None,
+        description=(
+            "Start short local fits from sampled initial parameters in parallel "
+            "and refine the best one"
+        ),
+    )
+    decomposition: DecompositionAPI | None = Field(
+        default=None,
+        description=(
+            "Fit the independent regions of separated peak clusters in parallel "
+            "before the joint fit"
+        ),
+    )
+    multiresolution: MultiResolutionAPI | None = Field(
+        default=None,
+        description=(
+            "Fit binned versions of the spectrum from coarse to fine resolution "
+            "before the fit of the full resolution"
+        ),
+    )
+    mcmc: MarkovChainAPI | None = Field(
+        default=None,
+        description=(
+            "Sample the posterior of the free parameters around the best fit by a "
+            "vectorized or pooled emcee ensemble"
+        ),
+    )
+    monitor: MonitorAPI | None = Field(
+        default=None,
+        description=(
+            "Stop the fit after a wall-clock budget or once the chi-square stalls, "
+            "and stream the progress"
+        ),
+    )
 
 
 class GeneralSolverModelsAPI(BaseModel):
@@ -0,0 +1,541 @@
+"""SpectraFit batch, the command line tool for fitting many spectra in parallel."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+
+from collections import Counter
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from copy import deepcopy
+from glob import glob
+from hashlib import sha256
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+
+from tabulate import tabulate
+
+from spectrafit.api.cmd_model import BatchAPI
+from spectrafit.models.builtin import GLOBAL_STANDARD
+from spectrafit.models.builtin import GLOBAL_WITH_PRE
+from spectrafit.spectrafit import fitting_routine
+from spectrafit.spectrafit import merge_input_file
+from spectrafit.tools import SaveResult
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+SUMMARY_COLUMNS = (
+    "file",
+    "outfile",
+    "status",
+    "attempts",
+    "seconds",
+    "chi_square",
+    "reduced_chi_square",
+    "akaike_information",
+    "bayesian_information",
+    "nfev",
+    "success",
+    "error",
+)
+
+
+def get_args() -> dict[str, Any]:
+    """Get the arguments from the command line.
+
+    Returns:
+        Dict[str, Any]: Return the batch arguments as a dictionary.
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Parallel batch fitting of many spectra with one input file.",
+        usage="spectrafit-batch [options] infiles",
+        epilog="For more information, visit https://anselmoo.github.io/spectrafit/",
+        prog="spectrafit-batch",
+    )
+    parser.add_argument(
+        "infiles",
+        type=str,
+        nargs="*",
+        help="Filenames or glob patterns like 'data/**/*.txt' of the spectra.",
+    )
+    parser.add_argument(
+        "-m",
+        "--manifest",
+        type=str,
+        default=None,
+        help="Text file listing one filename or glob pattern per line.",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default="fitting_input.toml",
+        help=(
+            "Filename for the input parameter, which are shared by all spectra; "
+            "default to set to 'fitting_input.toml'."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--outdir",
+        type=str,
+        default="spectrafit_batch",
+        help="Directory for the results; default to 'spectrafit_batch'.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=BatchAPI().workers,
+        help="Number of worker processes; default to the number of CPUs.",
+    )
+    parser.add_argument(
+        "-r",
+        "--retries",
+        type=int,
+        default=1,
+        help="Number of retries of failed fits; default to 1.",
+    )
+    parser.add_argument(
+        "-s",
+        "--summary",
+        type=str,
+        default="batch_summary.csv",
+        help="Filename of the summary table; default to 'batch_summary.csv'.",
+    )
+    parser.add_argument(
+        "--series",
+        action="store_true",
+        default=False,
+        help=(
+            "Fit the spectra as an ordered series, where each fit starts from the "
+            "best values of the previous fit; default to False."
+        ),
+    )
+    parser.add_argument(
+        "-n",
+        "--chunks",
+        type=int,
+        default=1,
+        help=(
+            "Number of chunks of the series, which are chained in parallel and "
+            "start from the input file; default to 1."
+        ),
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        default=None,
+        help=(
+            "Wall-clock budget of each fit in seconds, after which the fit is "
+            "aborted with the best parameters so far; default to None."
+        ),
+    )
+    parser.add_argument(
+        "--no-resume",
+        dest="resume",
+        action="store_false",
+        help="Refit the spectra, which are already listed as successful.",
+    )
+    return vars(parser.parse_args())
+
+
+def warm_start(
+    peaks: dict[str, Any],
+    seed: dict[str, float],
+    global_: int,
+) -> dict[str, Any]:
+    """Replace the initial values of the peaks by the best values of a previous fit.
+
+    !!! note "About the warm start"
+
+        Only the `value` of the parameters is replaced, so that the bounds and the
+        `vary` attributes of the input file are kept. Parameters defined via `expr`
+        are skipped. For the global fitting with automatically defined parameters,
+        the shared parameters are seeded by the values of the first spectrum.
+
+    Args:
+        peaks (Dict[str, Any]): The `peaks` of the input file.
+        seed (Dict[str, float]): Best values of the previous fit by parameter name.
+        global_ (int): The global fitting mode.
+
+    Returns:
+        Dict[str, Any]: Copy of the `peaks` with the seeded initial values.
+
+    """
+    peaks = deepcopy(peaks)
+    for name, parameter in iter_parameters(peaks, global_):
+        if name in seed and "expr" not in parameter:
+            parameter["value"] = seed[name]
+    return peaks
+
+
+def iter_parameters(
+    peaks: dict[str, Any],
+    global_: int,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Iterate over the parameters of the peaks by the names of the fit.
+
+    Args:
+        peaks (Dict[str, Any]): The `peaks` of the input file.
+        global_ (int): The global fitting mode.
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: Name of the parameter in the fit, e.g.
+            `gaussian_center_1`, and its attributes of the input file.
+
+    """
+    if global_ == GLOBAL_WITH_PRE:
+        for key_1, value_1 in peaks.items():
+            for key_2, value_2 in value_1.items():
+                for key_3, value_3 in value_2.items():
+                    for key_4, value_4 in value_3.items():
+                        yield f"{key_3}_{key_4}_{key_2}_{key_1}", value_4
+        return
+    suffix = "_1" if global_ == GLOBAL_STANDARD else ""
+    for key_1, value_1 in peaks.items():
+        for key_2, value_2 in value_1.items():
+            for key_3, value_3 in value_2.items():
+                yield f"{key_2}_{key_3}_{key_1}{suffix}", value_3
+
+
+def load_seed(outfile: str) -> dict[str, float] | None:
+    """Load the best values of a previously exported fit.
+
+    Args:
+        outfile (str): Prefix of the exported files of the fit.
+
+    Returns:
+        Optional[Dict[str, float]]: Best values by parameter name, or `None` if the
+            fit has not been exported.
+
+    """
+    fname = Path(f"{outfile}_summary.json")
+    if not fname.is_file():
+        return None
+    with fname.open(encoding="utf-8") as f:
+        variables = json.load(f)["fit_insights"]["variables"]
+    return {name: value["best_value"] for name, value in variables.items()}
+
+
+def fit_file(
+    infile: str,
+    outfile: str,
+    args: dict[str, Any],
+    seed: dict[str, float] | None = None,
+) -> dict[str, Any]:
+    """Fit a single spectrum and save its results.
+
+    Args:
+        infile (str): Filename of the spectrum.
+        outfile (str): Prefix of the exported files of the fit.
+        args (Dict[str, Any]): The input file arguments shared by all spectra.
+        seed (Dict[str, float], optional): Best values of a previous fit, which are
+            used as initial values. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: Statistics of the fit for the summary table, and the best
+            values of the fit as `seed`.
+
+    """
+    start = perf_counter()
+    _args = deepcopy(args)
+    _args.update(infile=infile, outfile=outfile)
+    if seed is not None and not _args["autopeak"] and "peaks" in _args:
+        _args["peaks"] = warm_start(
+            peaks=_args["peaks"],
+            seed=seed,
+            global_=_args["global_"],
+        )
+    df, _args = fitting_routine(args=_args)
+    SaveResult(df=df, args=_args)()
+    return {
+        **_args["fit_insights"]["statistics"],
+        "nfev": _args["fit_insights"]["computational"]["nfev"],
+        "success": _args["fit_insights"]["computational"]["success"],
+        "seconds": round(perf_counter() - start, 3),
+        "seed": {
+            name: value["best_value"]
+            for name, value in _args["fit_insights"]["variables"].items()
+        },
+    }
+
+
+class BatchFitting:
+    """Fit many spectra with one input file in parallel.
+
+    !!! info "About the batch fitting"
+
+        The spectra are distributed over a pool of worker processes, so that the
+        start-up and import costs are paid once per worker instead of once per
+        spectrum. The results of each spectrum are exported via `SaveResult` into
+        `outdir`, and each finished fit is appended as one row to the summary
+        table. Failed fits, including unreadable files, which are terminating the
+        single fit via `SystemExit`, are resubmitted up to `retries` times.
+
+    !!! info "About the series mode"
+
+        In the series mode, the spectra are fitted in their given order, and each
+        fit starts from the best values of the previous fit, see `warm_start`. For
+        the parallel "leapfrog" scheme, the series is split into `chunks`
+        contiguous chunks. The head of each chunk starts from the input file and
+        the chunks are chained in parallel. A failed fit is retried from the input
+        file, and the next spectrum starts from the last successful fit.
+
+    !!! tip "About resuming"
+
+        An interrupted batch can be restarted with the same arguments. All
+        spectra, which are listed as `success` in the summary table, are skipped.
+        In the series mode, the first remaining spectrum of a chunk starts from the
+        exported fit of its predecessor.
+    """
+
+    def __init__(self, args: dict[str, Any]) -> None:
+        """Initialize the batch fitting.
+
+        Args:
+            args (Dict[str, Any]): The batch arguments, see `BatchAPI`.
+
+        """
+        self.args = BatchAPI(**args)
+        self.outdir = Path(self.args.outdir)
+        self.summary = self.outdir / self.args.summary
+        self.fit_args = merge_input_file(
+            {"infile": "", "input": self.args.input, "timeout": self.args.timeout},
+        )
+        self.fit_args.update(verbose=0, noplot=True)
+
+    def __call__(self) -> list[dict[str, Any]]:
+        """Run the batch fitting.
+
+        Returns:
+            List[Dict[str, Any]]: Records of the summary table of this run.
+
+        """
+        self.outdir.mkdir(parents=True, exist_ok=True)
+        finished = self.finished()
+        jobs = self.jobs()
+        chains, seeds = self.chains(jobs, finished)
+        records: list[dict[str, Any]] = []
+        attempts: dict[str, int] = defaultdict(int)
+        pending: dict[Future[dict[str, Any]], int] = {}
+        with self.executor(len(chains)) as executor:
+
+            def submit(chain: int, seed: dict[str, float] | None) -> None:
+                infile = chains[chain][0]
+                future = executor.submit(
+                    fit_file,
+                    infile,
+                    jobs[infile],
+                    self.fit_args,
+                    seed,
+                )
+                pending[future] = chain
+
+            for chain, seed in enumerate(seeds):
+                if chains[chain]:
+                    submit(chain, seed)
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        chain = pending.pop(future)
+                        infile = chains[chain][0]
+                        attempts[infile] += 1
+                        try:
+                            record = {"status": "success", **future.result()}
+                            seeds[chain] = record.pop("seed")
+                        except (Exception, SystemExit) as exc:  # noqa: BLE001
+                            if attempts[infile] <= self.args.retries:
+                                submit(chain, None)
+                                continue
+                            record = {
+                                "status": "failed",
+                                "error": f"{type(exc).__name__}: {exc}",
+                            }
+                        record.update(
+                            file=infile,
+                            outfile=jobs[infile],
+                            attempts=attempts[infile],
+                        )
+                        self.append(record)
+                        records.append(record)
+                        chains[chain].pop(0)
+                        if chains[chain]:
+                            submit(chain, seeds[chain] if self.args.series else None)
+            except KeyboardInterrupt:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        self.report(records, skipped=len(finished & jobs.keys()))
+        return records
+
+    def chains(
+        self,
+        jobs: dict[str, str],
+        finished: set[str],
+    ) -> tuple[list[list[str]], list[dict[str, float] | None]]:
+        """Split the jobs into the chains of fits, which are run one after another.
+
+        Args:
+            jobs (Dict[str, str]): Filename of each spectrum and the prefix of its
+                exported files.
+            finished (Set[str]): Filenames of the successfully fitted spectra.
+
+        Returns:
+            Tuple[List[List[str]], List[Optional[Dict[str, float]]]]: The remaining
+                spectra of each chain, and the seed of the first remaining spectrum.
+                Without the series mode, each spectrum is a chain of its own.
+
+        """
+        infiles = list(jobs)
+        if not self.args.series:
+            chains = [[infile] for infile in infiles if infile not in finished]
+            return chains, [None] * len(chains)
+
+        n_chunks = min(self.args.chunks, len(infiles))
+        size, rest = divmod(len(infiles), n_chunks)
+        chains = []
+        seeds: list[dict[str, float] | None] = []
+        start = 0
+        for i in range(n_chunks):
+            stop = start + size + (i < rest)
+            chunk = infiles[start:stop]
+            head = next(
+                (j for j, infile in enumerate(chunk) if infile not in finished),
+                len(chunk),
+            )
+            chains.append([infile for infile in chunk[head:] if infile not in finished])
+            seeds.append(
+                load_seed(jobs[chunk[head - 1]]) if 0 < head < len(chunk) else None,
+            )
+            start = stop
+        return chains, seeds
+
+    def executor(self, n_jobs: int) -> Executor:
+        """Return the executor of the fits.
+
+        Args:
+            n_jobs (int): Number of spectra to fit.
+
+        Returns:
+            Executor: Pool of worker processes, or a single thread for one worker.
+
+        """
+        workers = min(self.args.workers, max(n_jobs, 1))
+        if workers == 1:
+            return ThreadPoolExecutor(max_workers=1)
+        return ProcessPoolExecutor(max_workers=workers)
+
+    def jobs(self) -> dict[str, str]:
+        """Expand the filenames and glob patterns into the jobs of the batch.
+
+        Raises:
+            FileNotFoundError: If no spectrum is found.
+
+        Returns:
+            Dict[str, str]: Absolute filename of each spectrum and the prefix of its
+                exported files. Spectra with the same name in different directories
+                are distinguished by a hash of their absolute filename, so that the
+                prefix does not depend on the order of the spectra.
+
+        """
+        patterns = list(self.args.infiles)
+        if self.args.manifest:
+            patterns.extend(
+                line.strip()
+                for line in Path(self.args.manifest)
+                .read_text(encoding="utf-8")
+                .splitlines()
+                if line.strip() and not line.strip().startswith("#")
+            )
+        infiles = dict.fromkeys(
+            str(Path(infile).resolve())
+            for pattern in patterns
+            for infile in sorted(glob(pattern, recursive=True))  # noqa: PTH207
+            if Path(infile).is_file()
+        )
+        if not infiles:
+            msg = f"No spectra found for {patterns}!"
+            raise FileNotFoundError(msg)
+
+        stems = Counter(Path(infile).stem for infile in infiles)
+        result: dict[str, str] = {}
+        for infile in infiles:
+            stem = Path(infile).stem
+            if stems[stem] > 1:
+                stem = f"{stem}_{sha256(infile.encode()).hexdigest()[:8]}"
+            result[infile] = str(self.outdir / stem)
+        return result
+
+    def finished(self) -> set[str]:
+        """Return the spectra, which are already successfully fitted.
+
+        Returns:
+            Set[str]: Absolute filenames of the successfully fitted spectra.
+
+        """
+        if not self.args.resume or not self.summary.is_file():
+            return set()
+        with self.summary.open(encoding="utf-8", newline="") as f:
+            return {
+                str(Path(row["file"]).resolve())
+                for row in csv.DictReader(f)
+                if row["status"] == "success"
+            }
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Append a record to the summary table.
+
+        Args:
+            record (Dict[str, Any]): Record of a finished fit.
+
+        """
+        header = not self.summary.is_file()
+        with self.summary.open("a", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS, restval="")
+            if header:
+                writer.writeheader()
+            writer.writerow({key: record.get(key, "") for key in SUMMARY_COLUMNS})
+
+    def report(self, records: list[dict[str, Any]], skipped: int) -> None:
+        """Print the overview of the batch.
+
+        Args:
+            records (List[Dict[str, Any]]): Records of the summary table of this run.
+            skipped (int): Number of spectra, which have been skipped by resuming.
+
+        """
+        failed = [record for record in records if record["status"] == "failed"]
+        print(  # noqa: T201
+            tabulate(
+                [
+                    ["success", len(records) - len(failed)],
+                    ["failed", len(failed)],
+                    ["skipped", skipped],
+                ],
+                headers=["status", "spectra"],
+                tablefmt="simple",
+            ),
+        )
+        for record in failed:
+            print(f"{record['file']}: {record['error']}")  # noqa: T201
+        print(f"Summary table: {self.summary}")  # noqa: T201
+
+
+def command_line_runner() -> None:
+    """Run the batch fitting from the command line."""
+    BatchFitting(args=get_args())()
@@ -0,0 +1,286 @@
+"""Kernel backends for the distribution models.
+
+The NumPy kernels of `spectrafit.models.regular` are the reference implementation.
+For dense spectra, the most frequently used kernels can be dispatched to fused and
+multi-threaded kernels of the optional dependencies `numexpr` or `numba`, which
+avoid the temporary arrays of the NumPy expressions.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from importlib import import_module
+from importlib.util import find_spec
+from inspect import signature
+from math import exp
+from math import pi
+from typing import TYPE_CHECKING
+from typing import Any
+
+from spectrafit.models.regular import FWHMG2SIG
+from spectrafit.models.regular import FWHML2SIG
+from spectrafit.models.regular import SQ2PI
+from spectrafit.models.regular import exponential
+from spectrafit.models.regular import gaussian
+from spectrafit.models.regular import linear
+from spectrafit.models.regular import lorentzian
+from spectrafit.models.regular import orcagaussian
+from spectrafit.models.regular import pseudovoigt
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import numpy as np
+
+    from numpy.typing import NDArray
+
+
+BACKENDS = ("numpy", "numexpr", "numba")
+
+# Reference kernels of the models, which are supported by the optional backends
+REFERENCE_KERNELS: dict[str, Callable[..., NDArray[np.float64]]] = {
+    "gaussian": gaussian,
+    "orcagaussian": orcagaussian,
+    "lorentzian": lorentzian,
+    "pseudovoigt": pseudovoigt,
+    "exponential": exponential,
+    "linear": linear,
+}
+
+_PSEUDOVOIGT_FWHM = (
+    "(fwhmg ** 5 + 2.69269 * fwhmg ** 4 * fwhml + 2.42843 * fwhmg ** 3 * fwhml ** 2"
+    " + 4.47163 * fwhmg ** 2 * fwhml ** 3 + 0.07842 * fwhmg * fwhml ** 4"
+    " + fwhml ** 5) ** 0.2"
+)
+
+NUMEXPR_EXPRESSIONS: dict[str, str] = {
+    "gaussian": (
+        "amplitude / (SQ2PI * fwhmg * FWHMG2SIG)"
+        " * exp(-((x - center) ** 2) / (2 * (fwhmg * FWHMG2SIG) ** 2))"
+    ),
+    "orcagaussian": "amplitude * exp(-((x - center) ** 2) / (2 * width ** 2))",
+    "lorentzian": (
+        "amplitude / (1 + ((x - center) / (fwhml * FWHML2SIG)) ** 2)"
+        " / (PI * fwhml * FWHML2SIG)"
+    ),
+    "pseudovoigt": (
+        f"(1.36603 * (fwhml / {_PSEUDOVOIGT_FWHM})"
+        f" - 0.47719 * (fwhml / {_PSEUDOVOIGT_FWHM}) ** 2"
+        f" + 0.11116 * (fwhml / {_PSEUDOVOIGT_FWHM}) ** 3)"
+        " * amplitude / (1 + ((x - center) / (fwhml * FWHML2SIG)) ** 2)"
+        " / (PI * fwhml * FWHML2SIG)"
+        f" + (1 - 1.36603 * (fwhml / {_PSEUDOVOIGT_FWHM})"
+        f" + 0.47719 * (fwhml / {_PSEUDOVOIGT_FWHM}) ** 2"
+        f" - 0.11116 * (fwhml / {_PSEUDOVOIGT_FWHM}) ** 3)"
+        " * amplitude / (SQ2PI * fwhmg * FWHMG2SIG)"
+        " * exp(-((x - center) ** 2) / (2 * (fwhmg * FWHMG2SIG) ** 2))"
+    ),
+    "exponential": "amplitude * exp(-x / decay) + intercept",
+    "linear": "slope * x + intercept",
+}
+
+NUMEXPR_CONSTANTS = {
+    "FWHMG2SIG": FWHMG2SIG,
+    "FWHML2SIG": FWHML2SIG,
+    "SQ2PI": SQ2PI,
+    "PI": pi,
+}
+
+
+def _gaussian(x: float, amplitude: float, center: float, fwhmg: float) -> float:
+    """Return the Gaussian distribution of a single point."""
+    sigma = fwhmg * FWHMG2SIG
+    return amplitude / (SQ2PI * sigma) * exp(-((x - center) ** 2) / (2 * sigma**2))
+
+
+def _orcagaussian(x: float, amplitude: float, center: float, width: float) -> float:
+    """Return the ORCA Gaussian distribution of a single point."""
+    return amplitude * exp(-((x - center) ** 2) / (2 * width**2))
+
+
+def _lorentzian(x: float, amplitude: float, center: float, fwhml: float) -> float:
+    """Return the Lorentzian distribution of a single point."""
+    sigma = fwhml * FWHML2SIG
+    return amplitude / (1 + ((x - center) / sigma) ** 2) / (pi * sigma)
+
+
+def _pseudovoigt(
+    x: float,
+    amplitude: float,
+    center: float,
+    fwhmg: float,
+    fwhml: float,
+) -> float:
+    """Return the Pseudo-Voigt distribution of a single point."""
+    f = (
+        fwhmg**5
+        + 2.69269 * fwhmg**4 * fwhml
+        + 2.42843 * fwhmg**3 * fwhml**2
+        + 4.47163 * fwhmg**2 * fwhml**3
+        + 0.07842 * fwhmg * fwhml**4
+        + fwhml**5
+    ) ** 0.2
+    n = 1.36603 * (fwhml / f) - 0.47719 * (fwhml / f) ** 2 + 0.11116 * (fwhml / f) ** 3
+    # The profiles are inlined, since `numba` cannot call uncompiled functions.
+    sigma_l = fwhml * FWHML2SIG
+    sigma_g = fwhmg * FWHMG2SIG
+    lorentzian = amplitude / (1 + ((x - center) / sigma_l) ** 2) / (pi * sigma_l)
+    gaussian = (
+        amplitude / (SQ2PI * sigma_g) * exp(-((x - center) ** 2) / (2 * sigma_g**2))
+    )
+    return n * lorentzian + (1 - n) * gaussian
+
+
+def _exponential(x: float, amplitude: float, decay: float, intercept: float) -> float:
+    """Return the exponential decay of a single point."""
+    return amplitude * exp(-x / decay) + intercept
+
+
+def _linear(x: float, slope: float, intercept: float) -> float:
+    """Return the linear function of a single point."""
+    return slope * x + intercept
+
+
+# Scalar kernels, which are compiled by `numba` into fused, parallel ufuncs
+SCALAR_KERNELS: dict[str, Callable[..., float]] = {
+    "gaussian": _gaussian,
+    "orcagaussian": _orcagaussian,
+    "lorentzian": _lorentzian,
+    "pseudovoigt": _pseudovoigt,
+    "exponential": _exponential,
+    "linear": _linear,
+}
+
+
+def available_backends() -> list[str]:
+    """Return the kernel backends, which are installed.
+
+    Returns:
+        List[str]: Names of the available backends.
+
+    """
+    return [
+        backend
+        for backend in BACKENDS
+        if backend == "numpy" or find_spec(backend) is not None
+    ]
+
+
+def get_kernels(backend: str) -> dict[str, Callable[..., NDArray[np.float64]]]:
+    """Return the kernels of a backend by the name of their models.
+
+    !!! note "About the dispatch"
+
+        The returned kernels have the same signature as the reference kernels of
+        `spectrafit.models.regular` and support the same broadcasting. Models,
+        which are not part of the returned dictionary, are evaluated by the NumPy
+        reference. Hence, the `numpy` backend returns an empty dictionary.
+
+    Args:
+        backend (str): Name of the backend, which is `numpy`, `numexpr`, or `numba`.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the optional dependency of the backend is not installed.
+
+    Returns:
+        Dict[str, Callable[..., NDArray[np.float64]]]: Kernels of the backend.
+
+    """
+    if backend not in BACKENDS:
+        msg = f"Backend '{backend}' is not supported! Choose one of {BACKENDS}."
+        raise ValueError(msg)
+    if backend == "numpy":
+        return {}
+    if backend not in available_backends():
+        msg = (
+            f"Backend '{backend}' requires the optional dependency '{backend}', "
+            f"which can be installed via `pip install {backend}`."
+        )
+        raise ImportError(msg)
+    if backend == "numexpr":
+        return _numexpr_kernels()
+    return _numba_kernels()
+
+
+def _dispatch(
+    model: str,
+    function: Callable[..., NDArray[np.float64]],
+) -> Callable[..., NDArray[np.float64]]:
+    """Wrap a positional kernel into the keyword signature of the reference kernel.
+
+    Args:
+        model (str): Name of the model.
+        function (Callable[..., NDArray[np.float64]]): Kernel, which takes `x` and
+            all arguments of the model as positional arguments.
+
+    Returns:
+        Callable[..., NDArray[np.float64]]: Kernel with the keyword signature of the
+            reference kernel.
+
+    """
+    parameters = list(signature(REFERENCE_KERNELS[model]).parameters.values())[1:]
+
+    def kernel(x: NDArray[np.float64], **kwargs: Any) -> NDArray[np.float64]:
+        return function(
+            x,
+            *(kwargs.get(param.name, param.default) for param in parameters),
+        )
+
+    kernel.__name__ = kernel.__qualname__ = model
+    kernel.__doc__ = REFERENCE_KERNELS[model].__doc__
+    return kernel
+
+
+@cache
+def _numexpr_kernels() -> dict[str, Callable[..., NDArray[np.float64]]]:
+    """Return the fused `numexpr` kernels.
+
+    Returns:
+        Dict[str, Callable[..., NDArray[np.float64]]]: Kernels of the backend.
+
+    """
+    numexpr = import_module("numexpr")
+
+    def compile_expression(model: str) -> Callable[..., NDArray[np.float64]]:
+        names = list(signature(REFERENCE_KERNELS[model]).parameters)
+        expression = NUMEXPR_EXPRESSIONS[model]
+
+        def function(*args: Any) -> NDArray[np.float64]:
+            return numexpr.evaluate(
+                expression,
+                local_dict={**NUMEXPR_CONSTANTS, **dict(zip(names, args))},
+            )
+
+        return function
+
+    return {
+        model: _dispatch(model, compile_expression(model))
+        for model in NUMEXPR_EXPRESSIONS
+    }
+
+
+@cache
+def _numba_kernels() -> dict[str, Callable[..., NDArray[np.float64]]]:
+    """Return the fused and parallel `numba` kernels.
+
+    !!! note "About the compilation"
+
+        The scalar kernels are compiled into ufuncs on the first request of the
+        backend, so that importing `SpectraFit` does not trigger the compilation.
+
+    Returns:
+        Dict[str, Callable[..., NDArray[np.float64]]]: Kernels of the backend.
+
+    """
+    numba = import_module("numba")
+    kernels = {}
+    for model, function in SCALAR_KERNELS.items():
+        n_args = len(signature(function).parameters)
+        ufunc = numba.vectorize(
+            [f"float64({', '.join(['float64'] * n_args)})"],
+            target="parallel",
+        )(function)
+        kernels[model] = _dispatch(model, ufunc)
+    return kernels
@@ -2,55 +2,93 @@
 
 from __future__ import annotations
 
+import json
+import os
+import sys
+import warnings
+
 from collections import defaultdict
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from copy import copy
 from dataclasses import dataclass
+from dataclasses import replace
+from functools import partial
 from math import log
 from math import pi
 from math import sqrt
+from multiprocessing import Pool
+from pathlib import Path
+from time import perf_counter
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import ClassVar
 
+import emcee
 import numpy as np
 
 from lmfit import Minimizer
 from lmfit import Parameters
+from scipy.optimize import lsq_linear
+from scipy.optimize import nnls
 from scipy.signal import find_peaks
+from scipy.sparse import csr_matrix
+from scipy.sparse import issparse
 from scipy.stats import hmean
+from scipy.stats import qmc
 
 from spectrafit.api.models_model import DistributionModelAPI
 from spectrafit.api.tools_model import AutopeakAPI
 from spectrafit.api.tools_model import GlobalFittingAPI
 from spectrafit.api.tools_model import SolverModelsAPI
+from spectrafit.models.backend import get_kernels
 from spectrafit.models.moessbauer import moessbauer_doublet as _moessbauer_doublet
 from spectrafit.models.moessbauer import moessbauer_octet as _moessbauer_octet
 from spectrafit.models.moessbauer import moessbauer_sextet as _moessbauer_sextet
 from spectrafit.models.moessbauer import moessbauer_singlet as _moessbauer_singlet
 from spectrafit.models.regular import atan_step as _atan
+from spectrafit.models.regular import atan_step_jacobian as _atan_jacobian
 from spectrafit.models.regular import cgaussian as _cgaussian
 from spectrafit.models.regular import clorentzian as _clorentzian
 from spectrafit.models.regular import constant as _constant
+from spectrafit.models.regular import constant_jacobian as _constant_jacobian
 from spectrafit.models.regular import cvoigt as _cvoigt
 from spectrafit.models.regular import erf_step as _erf
+from spectrafit.models.regular import erf_step_jacobian as _erf_jacobian
 from spectrafit.models.regular import exponential as _exponential
+from spectrafit.models.regular import exponential_jacobian as _exponential_jacobian
 from spectrafit.models.regular import gaussian as _gaussian
+from spectrafit.models.regular import gaussian_jacobian as _gaussian_jacobian
 from spectrafit.models.regular import heaviside as _heaviside
+from spectrafit.models.regular import heaviside_jacobian as _heaviside_jacobian
 from spectrafit.models.regular import linear as _linear
+from spectrafit.models.regular import linear_jacobian as _linear_jacobian
 from spectrafit.models.regular import log_step as _log
+from spectrafit.models.regular import log_step_jacobian as _log_jacobian
 from spectrafit.models.regular import lorentzian as _lorentzian
+from spectrafit.models.regular import lorentzian_jacobian as _lorentzian_jacobian
 from spectrafit.models.regular import orcagaussian as _orcagaussian
+from spectrafit.models.regular import orcagaussian_jacobian as _orcagaussian_jacobian
 from spectrafit.models.regular import pearson1 as _pearson1
 from spectrafit.models.regular import pearson2 as _pearson2
 from spectrafit.models.regular import pearson3 as _pearson3
 from spectrafit.models.regular import pearson4 as _pearson4
 from spectrafit.models.regular import polynom2 as _polynom2
+from spectrafit.models.regular import polynom2_jacobian as _polynom2_jacobian
 from spectrafit.models.regular import polynom3 as _polynom3
+from spectrafit.models.regular import polynom3_jacobian as _polynom3_jacobian
 from spectrafit.models.regular import power as _power
 from spectrafit.models.regular import pseudovoigt as _pseudovoigt
+from spectrafit.models.regular import pseudovoigt_jacobian as _pseudovoigt_jacobian
 from spectrafit.models.regular import voigt as _voigt
+from spectrafit.models.regular import voigt_jacobian as _voigt_jacobian
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     import pandas as pd
 
     from numpy.typing import NDArray
@@ -60,6 +98,10 @@ GLOBAL_NONE = 0  # No global fitting
 GLOBAL_STANDARD = 1  # Standard global fitting
 GLOBAL_WITH_PRE = 2  # Global fitting with pre-processing
 
+# Relative step of the central finite differences, which is optimal for the
+# truncation and rounding error of float64
+FINITE_DIFFERENCE_STEP = np.finfo(np.float64).eps ** (1 / 3)
+
 
 class DistributionModels:
     """Distribution models for the fit.
@@ -81,6 +123,25 @@ class DistributionModels:
         `sigma` parameter.
     """
 
+    __jacobians__: ClassVar[
+        dict[str, Callable[..., dict[str, NDArray[np.float64]]]]
+    ] = {
+        "gaussian": _gaussian_jacobian,
+        "orcagaussian": _orcagaussian_jacobian,
+        "lorentzian": _lorentzian_jacobian,
+        "voigt": _voigt_jacobian,
+        "pseudovoigt": _pseudovoigt_jacobian,
+        "exponential": _exponential_jacobian,
+        "linear": _linear_jacobian,
+        "constant": _constant_jacobian,
+        "erf": _erf_jacobian,
+        "heaviside": _heaviside_jacobian,
+        "atan": _atan_jacobian,
+        "log": _log_jacobian,
+        "polynom2": _polynom2_jacobian,
+        "polynom3": _polynom3_jacobian,
+    }
+
     @staticmethod
     def gaussian(
         x: NDArray[np.float64],
@@ -162,6 +223,7 @@ class DistributionModels:
         center: float = 0.0,
         fwhmv: float = 1.0,
         gamma: float | None = None,
+        approximation: str = "wofz",
     ) -> NDArray[np.float64]:
         r"""Return a 1-dimensional Voigt distribution.
 
@@ -179,12 +241,21 @@ class DistributionModels:
             gamma (float, optional): Scaling factor of the complex part of the
                 [Faddeeva Function](https://en.wikipedia.org/wiki/Faddeeva_function).
                 Defaults to None.
+            approximation (str, optional): Implementation of the Faddeeva function,
+                which is `wofz` or the about two times faster `humlicek` with a
+                relative error below $10^{-4}$. Defaults to "wofz".
 
         Returns:
             NDArray[np.float64]: Voigt distribution of `x` given.
 
         """
-        return _voigt(x=x, center=center, fwhmv=fwhmv, gamma=gamma)
+        return _voigt(
+            x=x,
+            center=center,
+            fwhmv=fwhmv,
+            gamma=gamma,
+            approximation=approximation,
+        )
 
     @staticmethod
     def pseudovoigt(
@@ -781,6 +852,7 @@ class DistributionModels:
             fwhml=fwhml,
             center=center,
             background=background,
+            synthetic=False,
         )
 
     @staticmethod
@@ -817,6 +889,7 @@ class DistributionModels:
             quadrupole_splitting=quadrupolesplitting,
             center=center,
             background=background,
+            synthetic=False,
         )
 
     @staticmethod
@@ -858,6 +931,7 @@ class DistributionModels:
             center=center,
             angle_theta_phi=anglethetaphi,
             background=background,
+            synthetic=False,
         )
 
     @staticmethod
@@ -917,6 +991,7 @@ class DistributionModels:
             sod_shift=sodshift,
             site_fraction=sitefraction,
             background=background,
+            synthetic=False,
         )
 
 
@@ -944,6 +1019,67 @@ class ReferenceKeys:
         "moessbaueroctet",
     ]
 
+    # Localized models with the arguments and factors defining their FWHM
+    __window_models__: ClassVar[dict[str, tuple[tuple[str, float], ...]]] = {
+        "gaussian": (("fwhmg", 1.0),),
+        "orcagaussian": (("width", 2 * sqrt(2 * log(2))),),
+        "lorentzian": (("fwhml", 1.0),),
+        "voigt": (("fwhmv", 1.0), ("gamma", 2.0)),
+        "pseudovoigt": (("fwhmg", 1.0), ("fwhml", 1.0)),
+        "pearson1": (("sigma", 2.0),),
+        "pearson2": (("sigma", 2.0),),
+        "pearson3": (("sigma", 2.0),),
+        "pearson4": (("sigma", 2.0),),
+    }
+
+    # Models, which can be evaluated for several peaks in one broadcast call
+    __broadcast_models__: ClassVar[list[str]] = [
+        "gaussian",
+        "orcagaussian",
+        "lorentzian",
+        "voigt",
+        "pseudovoigt",
+        "exponential",
+        "power",
+        "linear",
+        "cgaussian",
+        "clorentzian",
+        "cvoigt",
+        "polynom2",
+        "polynom3",
+        "pearson1",
+        "pearson2",
+        "pearson3",
+        "pearson4",
+        "moessbauersinglet",
+        "moessbauerdoublet",
+        "moessbauersextet",
+    ]
+
+    # Models, which are a linear combination of the listed arguments without offset
+    __linear_models__: ClassVar[dict[str, tuple[str, ...]]] = {
+        "gaussian": ("amplitude",),
+        "orcagaussian": ("amplitude",),
+        "lorentzian": ("amplitude",),
+        "pseudovoigt": ("amplitude",),
+        "exponential": ("amplitude", "intercept"),
+        "power": ("amplitude", "intercept"),
+        "linear": ("slope", "intercept"),
+        "constant": ("amplitude",),
+        "erf": ("amplitude",),
+        "heaviside": ("amplitude",),
+        "atan": ("amplitude",),
+        "log": ("amplitude",),
+        "cgaussian": ("amplitude",),
+        "cvoigt": ("amplitude",),
+        "polynom2": ("coefficient0", "coefficient1", "coefficient2"),
+        "polynom3": ("coefficient0", "coefficient1", "coefficient2", "coefficient3"),
+        "pearson1": ("amplitude",),
+        "pearson2": ("amplitude",),
+        "pearson3": ("amplitude",),
+        "pearson4": ("amplitude",),
+    }
+
     def model_check(self, model: str) -> None:
         """Check if model is available.
 
@@ -954,7 +1090,7 @@ class ReferenceKeys:
             NotImplementedError: If the model is not implemented.
 
         """
-        model_prefix = model.split("_")[0]
+        model_prefix = model.split("_", maxsplit=1)[0]
 
         # Check in main models list
         if (
@@ -1697,180 +1833,2929 @@ class ModelParameters(AutoPeakDetection):
                         self.params.add(f"{key_3}_{key_4}_{key_2}_{key_1}", **value_4)
 
 
-class SolverModels(ModelParameters):
-    """Solving models for 2D and 3D data sets.
+@dataclass(frozen=True)
+class PlanComponent:
+    """Single model contribution of a compiled `FitPlan`.
+
+    Attributes:
+        model (str): Name of the distribution model, e.g. `gaussian`.
+        peak (str): Peak identifier of the contribution.
+        column (Optional[int]): Zero-based column index of the spectrum in case of
+            global fitting, otherwise `None`.
+        function (Callable[..., NDArray[np.float64]]): Resolved kernel of the model.
+        arguments (Tuple[str, ...]): Keyword names of the kernel arguments.
+        index (NDArray[np.int64]): Position of the arguments in `FitPlan.names`.
+        jacobian (Optional[Callable[..., Dict[str, NDArray[np.float64]]]]): Analytic
+            partial derivatives of the kernel, if available.
+        label (str): Name of the contribution like `gaussian_1` or `gaussian_1_2`.
+    """
 
-    !!! hint "Solver Modes"
-        * `"2D"`: Solve 2D models via the classic `lmfit` function.
-        * `"3D"`: Solve 3D models via global git. For the `global-fitting` procedure,
-             the `lmfit` function is used to solve the models with an extended set of
-             parameters.
-          the `lmfit` function is used.
+    model: str
+    peak: str
+    column: int | None
+    function: Callable[..., NDArray[np.float64]]
+    arguments: tuple[str, ...]
+    index: NDArray[np.int64]
+    jacobian: Callable[..., dict[str, NDArray[np.float64]]] | None = None
+    label: str = ""
+
+
+@dataclass(frozen=True)
+class PlanGroup:
+    """Contributions of a compiled `FitPlan`, which are evaluated together.
+
+    Attributes:
+        function (Callable[..., NDArray[np.float64]]): Resolved kernel of the model.
+        arguments (Tuple[str, ...]): Keyword names of the kernel arguments.
+        components (Tuple[PlanComponent, ...]): Contributions of the group.
+        index (NDArray[np.int64]): Position of the arguments in `FitPlan.names` of
+            the shape `(n_peaks, n_arguments)`.
+        broadcast (bool): If True, all peaks are evaluated in one broadcast call.
+        layers (Optional[Tuple[Tuple[slice, slice | NDArray[np.int64]], ...]]):
+            Pairs of the peaks and the columns of the spectra they are written to
+            in case of global fitting on 2D data, otherwise `None`. Each layer
+            contains every column at most once.
+        widths (Optional[Tuple[Tuple[str, float], ...]]): Arguments and factors
+            defining the FWHM of the peaks, if the group is evaluated within a
+            window around the center of the peaks, otherwise `None`.
+        columns (Optional[NDArray[np.int64]]): Column of each peak in case of
+            global fitting on 2D data, otherwise `None`.
     """
 
-    def __init__(self, df: pd.DataFrame, args: dict[str, Any]) -> None:
-        """Initialize the solver modes.
+    function: Callable[..., NDArray[np.float64]]
+    arguments: tuple[str, ...]
+    components: tuple[PlanComponent, ...]
+    index: NDArray[np.int64]
+    broadcast: bool
+    layers: tuple[tuple[slice, slice | NDArray[np.int64]], ...] | None
+    widths: tuple[tuple[str, float], ...] | None = None
+    columns: NDArray[np.int64] | None = None
+
+
+class FitPlan:
+    r"""Compiled evaluation plan of the model parameters.
+
+    !!! info "About the fit plan"
+
+        The parameter names like `gaussian_amplitude_1` or `gaussian_amplitude_1_2`
+        are parsed **once** into the model, the peak, and the column of the
+        spectrum. The plan stores the resolved kernel functions, the index arrays
+        of their arguments, and a preallocated buffer for the model. Consequently,
+        the residual functions of `SolverModels` only have to gather the current
+        parameter values and call the kernels.
+
+    !!! info "About the grouped evaluation"
+
+        Peaks of the same model are grouped and evaluated in one broadcast call on
+        a grid of the shape `(n_points, n_peaks)`, which is reduced by a single sum.
+        Hence, the Python overhead of the evaluation is nearly independent of the
+        number of peaks. Models, which are not broadcast-safe, like the step
+        functions or the Moessbauer octet, are evaluated peak by peak. For global
+        fitting, the peaks of all columns are stacked into one call and written
+        column-wise into the preallocated buffer, whose row-major layout already
+        matches the order of the flattened residual.
+
+    !!! info "About the peak windowing"
+
+        If `window` is defined, the localized models of `ReferenceKeys`
+        `__window_models__` are only evaluated within `center ± window · FWHM`.
+        The index range of each peak is found by `np.searchsorted` on the
+        ascending `x`-values, so that the evaluation cost scales with the number
+        of points in the windows instead of `n_peaks · n_points`. Outside the
+        window, the model is set to zero, which bounds the error relative to the
+        maximum of the peak by:
+
+        - Gaussian: $2^{-4 k^2}$, e.g. $1.5 \cdot 10^{-11}$ for $k = 3$
+        - Lorentzian: $1 / (1 + 4 k^2)$, e.g. $10^{-4}$ for $k = 50$
+
+        The Voigt, Pseudo-Voigt, and Pearson models are bounded by their
+        Lorentzian-like tails. The analytic Jacobian is not truncated.
+
+    !!! info "About the linked parameters"
+
+        In global fitting, the shape parameters of the columns `2..N` are tied to
+        the ones of the first column. If `links` is defined, these parameters are
+        not part of `params`, but their contributions read the value of the
+        parameter they are linked to. Hence, the shared parameters are stored
+        once and broadcast to the columns without any `asteval` expression.
+    """
+
+    def __init__(
+        self,
+        params: Parameters,
+        shape: tuple[int, ...],
+        global_fit: int,
+        window: float | None = None,
+        backend: str = "numpy",
+        faddeeva: str = "wofz",
+        links: dict[str, str] | None = None,
+    ) -> None:
+        """Initialize the fit plan.
 
         Args:
-            df (pd.DataFrame): DataFrame containing the input data (`x` and `data`).
-            args (Dict[str, Any]): The input file arguments as a dictionary with
-                 additional information beyond the command line arguments.
+            params (Parameters): Model parameters of the fit.
+            shape (Tuple[int, ...]): Shape of the data, which is 1D for the local
+                 fitting and 2D for the global fitting.
+            global_fit (int): If 1 or 2, the plan is compiled for the global fit.
+            window (float, optional): Cutoff of the localized models in multiples
+                 of their FWHM. Defaults to None, which evaluates the models on the
+                 full `x`-range.
+            backend (str, optional): Kernel backend of the models, which is `numpy`,
+                 `numexpr`, or `numba`. Defaults to "numpy".
+            faddeeva (str, optional): Implementation of the Faddeeva function of the
+                 Voigt models and their derivatives, which is `wofz` or `humlicek`.
+                 Defaults to "wofz".
+            links (Dict[str, str], optional): Names of the linked parameters, which
+                 are not part of `params`, and the names of the parameters they are
+                 tied to. Defaults to None.
+
+        Raises:
+            NotImplementedError: If a model of the parameters is not implemented.
 
         """
-        super().__init__(df=df, args=args)
-        self.args_solver = SolverModelsAPI(**args).model_dump()
-        self.args_global = GlobalFittingAPI(**args).model_dump()
-        self.params = self.return_params
+        self.names: list[str] = list(params.keys())
+        self.links = dict(links or {})
+        self.global_fit = global_fit
+        self.window = window
+        self.backend = backend
+        self.faddeeva = faddeeva
+        self.kernels = {
+            **get_kernels(backend),
+            "voigt": partial(DistributionModels.voigt, approximation=faddeeva),
+        }
+        self.jacobians = {
+            **DistributionModels.__jacobians__,
+            "voigt": partial(_voigt_jacobian, approximation=faddeeva),
+        }
+        self.components = self.compile_components()
+        self.groups = self.compile_groups(shape)
+        self.buffer = np.zeros(shape, dtype=np.float64)
 
-    def __call__(self) -> tuple[Minimizer, Any]:
-        """Solve the fitting model.
+    def __reduce__(self) -> tuple[type[FitPlan], tuple[Any, ...]]:
+        """Pickle the plan by its definition for the worker processes.
+
+        The kernels of the optional backends are closures, which cannot be pickled.
+        Hence, the plan is recompiled from the parameter names in the worker.
 
         Returns:
-            Tuple[Minimizer, Any]: Minimizer class and the fitting results.
+            Tuple[Type[FitPlan], Tuple[Any, ...]]: Class and arguments of the plan.
 
         """
-        if self.args_global["global_"]:
-            minimizer = Minimizer(
-                self.solve_global_fitting,
-                params=self.params,
-                fcn_args=(self.x, self.data),
-                **self.args_solver["minimizer"],
+        return (
+            type(self),
+            (
+                dict.fromkeys(self.names),
+                self.buffer.shape,
+                self.global_fit,
+                self.window,
+                self.backend,
+                self.faddeeva,
+                self.links,
+            ),
+        )
+
+    def compile_components(self) -> list[PlanComponent]:
+        """Compile the parameter names into the model contributions.
+
+        !!! note "About the order of the arguments"
+
+            The linked parameters follow the parameters of `params`. Hence, the
+            arguments of a peak are ordered like in its first column, so that the
+            columns are grouped into the same broadcast call.
+
+        Returns:
+            List[PlanComponent]: Model contributions in order of their appearance.
+
+        """
+        reference = ReferenceKeys()
+        position = {name: i for i, name in enumerate(self.names)}
+        groups: dict[tuple[str, ...], dict[str, int]] = defaultdict(dict)
+        for name, i in [
+            *position.items(),
+            *((name, position[source]) for name, source in self.links.items()),
+        ]:
+            _name = name.lower()
+            reference.model_check(model=_name)
+            c_name = _name.split("_")
+            if self.global_fit:
+                groups[(c_name[0], c_name[2], c_name[3])][c_name[1]] = i
+            else:
+                groups[(c_name[0], c_name[2])][c_name[1]] = i
+        if self.links:
+            order: dict[tuple[str, ...], list[str]] = {}
+            for key, arguments in groups.items():
+                reference_order = order.setdefault(key[:2], list(arguments))
+                if set(reference_order) == arguments.keys():
+                    groups[key] = {
+                        argument: arguments[argument] for argument in reference_order
+                    }
+
+        return [
+            PlanComponent(
+                model=key[0],
+                peak=key[1],
+                column=int(key[2]) - 1 if self.global_fit else None,
+                function=self.kernels.get(key[0], getattr(DistributionModels, key[0])),
+                arguments=tuple(arguments),
+                index=np.fromiter(arguments.values(), dtype=np.int64),
+                jacobian=self.jacobians.get(key[0]),
+                label="_".join(key),
             )
-        else:
-            minimizer = Minimizer(
-                self.solve_local_fitting,
-                params=self.params,
-                fcn_args=(self.x, self.data),
-                **self.args_solver["minimizer"],
+            for key, arguments in groups.items()
+        ]
+
+    def compile_groups(self, shape: tuple[int, ...]) -> list[PlanGroup]:
+        """Group the contributions of the same model for the broadcast evaluation.
+
+        Args:
+            shape (Tuple[int, ...]): Shape of the data.
+
+        Returns:
+            List[PlanGroup]: Groups of the contributions.
+
+        """
+        groups: dict[tuple[str, ...], list[PlanComponent]] = defaultdict(list)
+        for component in self.components:
+            if component.model in ReferenceKeys.__broadcast_models__:
+                groups[(component.model, *component.arguments)].append(component)
+            else:
+                groups[(component.label,)].append(component)
+
+        result = []
+        for components in groups.values():
+            layers, columns = None, None
+            if self.global_fit and len(shape) > 1:
+                components, layers = self.compile_layers(components, shape[-1])
+                columns = np.array(
+                    [(component.column or 0) % shape[-1] for component in components],
+                    dtype=np.int64,
+                )
+            model, arguments = components[0].model, components[0].arguments
+            widths = ReferenceKeys.__window_models__.get(model)
+            if (
+                self.window is None
+                or widths is None
+                or "center" not in arguments
+                or not any(argument in arguments for argument, _ in widths)
+            ):
+                widths = None
+            result.append(
+                PlanGroup(
+                    function=components[0].function,
+                    arguments=arguments,
+                    components=tuple(components),
+                    index=np.stack([component.index for component in components]),
+                    broadcast=model in ReferenceKeys.__broadcast_models__,
+                    layers=layers,
+                    widths=widths,
+                    columns=columns,
+                ),
+            )
+        return result
+
+    @staticmethod
+    def compile_layers(
+        components: list[PlanComponent],
+        n_columns: int,
+    ) -> tuple[
+        list[PlanComponent],
+        tuple[tuple[slice, slice | NDArray[np.int64]], ...],
+    ]:
+        """Order the contributions of a group into layers of unique columns.
+
+        !!! info "About the layers"
+
+            The contributions are sorted by their occurrence per column and by the
+            column itself. Hence, each layer is a contiguous block of peaks, which
+            is added to the columns of the buffer in one step. In the common case
+            of one peak per column, the layer covers all columns and is added
+            without any fancy indexing.
+
+        Args:
+            components (List[PlanComponent]): Contributions of the group.
+            n_columns (int): Number of columns of the spectra.
+
+        Returns:
+            Tuple[List[PlanComponent], Tuple[Tuple[slice, slice | NDArray[np.int64]],
+                ...]]: Sorted contributions and their layers.
+
+        """
+        occurrence: dict[int, int] = defaultdict(int)
+        keys = []
+        for component in components:
+            column = (component.column or 0) % n_columns
+            keys.append((occurrence[column], column))
+            occurrence[column] += 1
+        order = sorted(range(len(components)), key=keys.__getitem__)
+
+        layers: list[tuple[slice, slice | NDArray[np.int64]]] = []
+        start = 0
+        for layer in range(max(occurrence.values())):
+            columns = np.array(
+                [keys[i][1] for i in order if keys[i][0] == layer],
+                dtype=np.int64,
+            )
+            stop = start + columns.size
+            layers.append(
+                (
+                    slice(start, stop),
+                    slice(None)
+                    if np.array_equal(columns, np.arange(n_columns))
+                    else columns,
+                ),
             )
+            start = stop
+        return [components[i] for i in order], tuple(layers)
+
+    def values(self, params: Parameters) -> NDArray[np.float64]:
+        """Gather the current values of the parameters in order of the plan.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
 
-        result = minimizer.minimize(
-            **self.args_solver["optimizer"],
+        Returns:
+            NDArray[np.float64]: Parameter values as 1d-array.
+
+        """
+        return np.fromiter(
+            (params[name].value for name in self.names),
+            dtype=np.float64,
+            count=len(self.names),
         )
-        self.args_solver["optimizer"]["max_nfev"] = minimizer.max_nfev
-        return minimizer, result
 
-    @staticmethod
-    def solve_local_fitting(
-        params: dict[str, Parameters],
+    def evaluate(
+        self,
+        params: Parameters,
         x: NDArray[np.float64],
-        data: NDArray[np.float64],
     ) -> NDArray[np.float64]:
-        """Solving the fitting problem.
+        """Evaluate the model for the current parameters.
+
+        !!! warning "About the returned buffer"
+
+            The returned array is the preallocated buffer of the plan, which will be
+            overwritten by the next evaluation.
 
         Args:
-            params (Dict[str, Parameters]): The best optimized parameters of the fit.
+            params (Parameters): Current parameters of the fit.
             x (NDArray[np.float64]): `x`-values of the data.
-            data (NDArray[np.float64]): `y`-values of the data as 1d-array.
 
         Returns:
-            NDArray[np.float64]: The best-fitted data based on the proposed model.
+            NDArray[np.float64]: Model of the shape of the data.
+
+        """
+        return self.evaluate_values(self.values(params), x)
+
+    def evaluate_values(
+        self,
+        values: NDArray[np.float64],
+        x: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Evaluate the model for the parameter values in order of the plan.
+
+        Args:
+            values (NDArray[np.float64]): Parameter values in order of the plan.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            NDArray[np.float64]: Model of the shape of the data in the preallocated
+                buffer of the plan.
+
+        """
+        val = self.buffer
+        val.fill(0.0)
+        for group in self.groups:
+            if group.widths is not None:
+                points, contributions = self.evaluate_window(group, values, x)
+                if group.columns is not None:
+                    points = points * val.shape[1] + group.columns[:, np.newaxis]
+                val += np.bincount(
+                    points.ravel(),
+                    weights=contributions.ravel(),
+                    minlength=val.size,
+                ).reshape(val.shape)
+                continue
+            contributions = self.evaluate_group(group, values, x)
+            if group.layers is None:
+                val += contributions.sum(axis=1)
+                continue
+            for peaks, columns in group.layers:
+                val[:, columns] += contributions[:, peaks]
+        return val
+
+    def evaluate_batch(
+        self,
+        values: NDArray[np.float64],
+        x: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Evaluate the model for a batch of parameter values at once.
+
+        !!! info "About the batch evaluation"
+
+            The broadcast models are evaluated for all parameter sets and peaks of
+            a group in one call on a grid of the shape `(n_points, n_batch,
+            n_peaks)`. All other models and the windowed groups are evaluated for
+            each parameter set separately.
+
+        Args:
+            values (NDArray[np.float64]): Parameter values in order of the plan of
+                the shape `(n_batch, n_names)`.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            NDArray[np.float64]: Models of the shape `(n_batch, *data.shape)`.
+
+        """
+        n_batch = values.shape[0]
+        val = np.zeros((n_batch, *self.buffer.shape), dtype=np.float64)
+        for group in self.groups:
+            if group.broadcast and group.widths is None:
+                arguments = values[:, group.index]
+                kwargs = {
+                    argument: arguments[np.newaxis, :, :, k]
+                    for k, argument in enumerate(group.arguments)
+                }
+                contributions = np.broadcast_to(
+                    group.function(x[:, np.newaxis, np.newaxis], **kwargs),
+                    (x.size, n_batch, len(group.components)),
+                ).transpose(1, 0, 2)
+            else:
+                contributions = np.stack(
+                    [self.evaluate_dense(group, row, x) for row in values],
+                )
+            if group.layers is None:
+                val += contributions.sum(axis=2)
+                continue
+            for peaks, columns in group.layers:
+                val[:, :, columns] += contributions[:, :, peaks]
+        return val
+
+    def contributions(
+        self,
+        params: Parameters,
+        x: NDArray[np.float64],
+    ) -> dict[str, NDArray[np.float64]]:
+        """Evaluate the single contributions of the model for the current parameters.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            Dict[str, NDArray[np.float64]]: Single contributions named by their
+                model and peak in order of their appearance.
 
         """
-        val = np.zeros(x.shape)
-        peak_kwargs: dict[tuple[str, str], Parameters] = defaultdict(dict)
-        for model_name, param_value in params.items():
-            _model = model_name.lower()
-            ReferenceKeys().model_check(model=_model)
-            c_name = _model.split("_")
+        values = self.values(params)
+        result = {}
+        for group in self.groups:
+            contributions = self.evaluate_dense(group, values, x)
+            for component, contribution in zip(group.components, contributions.T):
+                result[component.label] = contribution
+        return {
+            component.label: result[component.label] for component in self.components
+        }
+
+    def evaluate_dense(
+        self,
+        group: PlanGroup,
+        values: NDArray[np.float64],
+        x: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Evaluate all peaks of a group on the full `x`-range.
 
-            model_key = c_name[0]
-            param_name = c_name[1]
-            peak_id = c_name[2]
-            peak_kwargs[(model_key, peak_id)][param_name] = param_value
+        Args:
+            group (PlanGroup): Group of the contributions.
+            values (NDArray[np.float64]): Parameter values in order of the plan.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            NDArray[np.float64]: Contributions of the shape `(n_points, n_peaks)`,
+                which are zero outside the window of the peaks, if defined.
 
-        for key, _kwarg in peak_kwargs.items():
-            val += getattr(DistributionModels(), key[0])(x, **_kwarg)
-        return np.array(val - data, dtype=np.float64)
+        """
+        if group.widths is None:
+            return self.evaluate_group(group, values, x)
+        points, weights = self.evaluate_window(group, values, x)
+        n_peaks = len(group.components)
+        points = points + x.size * np.arange(n_peaks)[:, np.newaxis]
+        return (
+            np.bincount(
+                points.ravel(),
+                weights=weights.ravel(),
+                minlength=n_peaks * x.size,
+            )
+            .reshape(n_peaks, x.size)
+            .T
+        )
 
     @staticmethod
-    def solve_global_fitting(
-        params: dict[str, Parameters],
+    def evaluate_group(
+        group: PlanGroup,
+        values: NDArray[np.float64],
         x: NDArray[np.float64],
-        data: NDArray[np.float64],
     ) -> NDArray[np.float64]:
-        r"""Solving the fitting for global problem.
+        """Evaluate all peaks of a group.
 
-        !!! note "About implemented models"
-            `solve_global_fitting` is the global solution of `solve_local_fitting` a
-            wrapper function for the calling the implemented moldels. For the kind of
-            supported models see `solve_local_fitting`.
+        Args:
+            group (PlanGroup): Group of the contributions.
+            values (NDArray[np.float64]): Parameter values in order of the plan.
+            x (NDArray[np.float64]): `x`-values of the data.
 
-        !!! note "About the global solution"
-            The global solution is a solution for the problem, where the `x`-values is
-            the energy, but the y-values are the intensities, which has to be fitted as
-            one unit. For this reason, the residual is calculated as the difference
-            between all the y-values and the global proposed solution. Later the
-            residual has to be flattened to a 1-dimensional array and minimized by the
-            `lmfit`-optimizer.
+        Returns:
+            NDArray[np.float64]: Contributions of the shape `(n_points, n_peaks)`.
+
+        """
+        if group.broadcast:
+            kwargs = dict(zip(group.arguments, values[group.index].T))
+            return np.broadcast_to(
+                group.function(x[:, np.newaxis], **kwargs),
+                (x.size, len(group.components)),
+            )
+        return np.stack(
+            [
+                group.function(x, **dict(zip(group.arguments, row.tolist())))
+                for row in values[group.index]
+            ],
+            axis=1,
+        )
 
+    def evaluate_window(
+        self,
+        group: PlanGroup,
+        values: NDArray[np.float64],
+        x: NDArray[np.float64],
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """Evaluate all peaks of a group within the window around their centers.
+
+        Args:
+            group (PlanGroup): Group of the contributions with defined `widths`.
+            values (NDArray[np.float64]): Parameter values in order of the plan.
+            x (NDArray[np.float64]): Ascending `x`-values of the data.
+
+        Returns:
+            Tuple[NDArray[np.int64], NDArray[np.float64]]: Indices of the points and
+                the contributions of the shape `(n_peaks, n_window)`, which are zero
+                outside the window of the peak.
+
+        """
+        kwargs = dict(zip(group.arguments, values[group.index].T))
+        width = np.max(
+            [
+                factor * np.abs(kwargs[argument])
+                for argument, factor in group.widths or ()
+                if argument in kwargs
+            ],
+            axis=0,
+        ) * (self.window or 0.0)
+        lower = np.searchsorted(x, kwargs["center"] - width)
+        upper = np.searchsorted(x, kwargs["center"] + width, side="right")
+        points = lower[:, np.newaxis] + np.arange(max(int(np.max(upper - lower)), 1))
+        inside = points < upper[:, np.newaxis]
+        points = np.minimum(points, x.size - 1)
+        contributions = group.function(
+            x[points],
+            **{key: value[:, np.newaxis] for key, value in kwargs.items()},
+        )
+        return points, np.where(inside, contributions, 0.0)
+
+    @staticmethod
+    def check_window(x: NDArray[np.float64], window: float | None) -> None:
+        """Check that the `x`-values allow the peak windowing.
 
         Args:
-            params (Dict[str, Parameters]): The best optimized parameters of the fit.
             x (NDArray[np.float64]): `x`-values of the data.
-            data (NDArray[np.float64]): `y`-values of the data as 2D-array.
+            window (float, optional): Cutoff of the localized models in multiples
+                 of their FWHM.
+
+        Raises:
+            ValueError: If the `x`-values are not ascending or the window is not
+                positive.
+
+        """
+        if window is None:
+            return
+        if window <= 0:
+            msg = f"The peak window has to be positive, but got {window}!"
+            raise ValueError(msg)
+        if np.any(np.diff(x) < 0):
+            msg = "The peak window requires ascending x-values!"
+            raise ValueError(msg)
+
+    def jacobian(
+        self,
+        params: Parameters,
+        x: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Assemble the Jacobian of the residual with respect to the free parameters.
+
+        !!! info "About the Jacobian"
+
+            The partial derivatives of the models are taken from the analytic
+            derivatives of `DistributionModels.__jacobians__`. Models without an
+            analytic derivative, like the Pearson or Moessbauer models, fall back to
+            central finite differences of their kernel. Parameters, which are tied
+            by an expression, contribute via the chain rule to the free parameters
+            of their expression.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
 
         Returns:
-            NDArray[np.float64]: The best-fitted data based on the proposed model.
+            NDArray[np.float64]: Jacobian of the shape `(n_residual, n_varys)` with
+                the free parameters in order of the parameters.
 
         """
-        val = np.zeros(data.shape)
-        peak_kwargs: dict[tuple[str, str, str], Parameters] = defaultdict(dict)
+        varys = [name for name, param in params.items() if param.vary]
+        weights = self.chain_weights(params, varys)
+        values = self.values(params)
+        jac = np.zeros((*self.buffer.shape, len(varys)), dtype=np.float64)
+        for component in self.components:
+            kwargs = dict(
+                zip(component.arguments, values[component.index].tolist()),
+            )
+            partials = (
+                component.jacobian(x, **kwargs)
+                if component.jacobian is not None
+                else {}
+            )
+            target = jac if component.column is None else jac[:, component.column]
+            for argument, i in zip(component.arguments, component.index.tolist()):
+                if not weights[self.names[i]]:
+                    continue
+                derivative = partials.get(argument)
+                if derivative is None:
+                    derivative = self.finite_difference(component, kwargs, argument, x)
+                for j, weight in weights[self.names[i]]:
+                    target[:, j] += weight * derivative
+        return jac.reshape(-1, len(varys))
+
+    def sparsity(self, params: Parameters) -> csr_matrix:
+        """Return the sparsity pattern of the Jacobian for the global fitting.
+
+        !!! info "About the sparsity pattern"
+
+            In global fitting, the parameters of a column only affect the residual
+            of this column, while the parameters linked by expressions are shared
+            by all columns of their expressions. Hence, the Jacobian is
+            block-sparse and its pattern follows from the parameter layout only.
 
-        for model, value in params.items():
-            model_lower = model.lower()
-            ReferenceKeys().model_check(model=model_lower)
-            c_name = model_lower.split("_")
-            peak_kwargs[(c_name[0], c_name[2], c_name[3])][c_name[1]] = value
-        for key, _kwarg in peak_kwargs.items():
-            i = int(key[2]) - 1
-            val[:, i] += getattr(DistributionModels(), key[0])(x, **_kwarg)
+        Args:
+            params (Parameters): Parameters of the fit.
 
-        val -= data
-        return val.flatten()
+        Returns:
+            csr_matrix: Boolean pattern of the shape `(n_residual, n_varys)` with
+                the free parameters in order of the parameters.
 
+        """
+        varys = [name for name, param in params.items() if param.vary]
+        position = {name: j for j, name in enumerate(varys)}
+        n_points = self.buffer.shape[0]
+        n_columns = self.buffer.shape[1] if self.buffer.ndim > 1 else 1
+        pairs: set[tuple[int, int]] = set()
+        for component in self.components:
+            column = component.column if component.column is not None else 0
+            for i in component.index.tolist():
+                pairs.update(
+                    (column % n_columns, position[name])
+                    for name in self.free_dependencies(params, self.names[i])
+                )
+        rows, cols = [], []
+        for column, j in sorted(pairs):
+            rows.append(np.arange(n_points) * n_columns + column)
+            cols.append(np.full(n_points, j))
+        return csr_matrix(
+            (
+                np.ones(n_points * len(pairs), dtype=bool),
+                (
+                    np.concatenate(rows) if rows else np.empty(0, dtype=np.int64),
+                    np.concatenate(cols) if cols else np.empty(0, dtype=np.int64),
+                ),
+            ),
+            shape=(n_points * n_columns, len(varys)),
+        )
 
-def calculated_model(
-    params: dict[str, Parameters],
-    x: NDArray[np.float64],
-    df: pd.DataFrame,
-    global_fit: int,
-) -> pd.DataFrame:
-    r"""Calculate the single contributions of the models and add them to the dataframe.
+    @staticmethod
+    def free_dependencies(params: Parameters, name: str) -> set[str]:
+        """Return the free parameters, which a parameter depends on.
 
-    !!! note "About calculated models"
-        `calculated_model` are also wrapper functions similar to `solve_model`. The
-        overall goal is to extract from the best parameters the single contributions in
-        the model. Currently, `lmfit` provides only a single model, so the best-fit.
+        Args:
+            params (Parameters): Parameters of the fit.
+            name (str): Name of the parameter.
 
-    Args:
-        params (Dict[str, Parameters]): The best optimized parameters of the fit.
-        x (NDArray[np.float64]): `x`-values of the data.
-        df (pd.DataFrame): DataFrame containing the input data (`x` and `data`),
-             as well as the best fit and the corresponding residuum. Hence, it will be
-             extended by the single contribution of the model.
-        global_fit (int): If 1 or 2, the model is calculated for the global fit.
+        Returns:
+            Set[str]: Names of the free parameters.
 
-    Returns:
-        pd.DataFrame: Extended dataframe containing the single contributions of the
-            models.
+        """
+        result = set()
+        stack = [name]
+        visited = set()
+        while stack:
+            dependency = stack.pop()
+            if dependency in visited or dependency not in params:
+                continue
+            visited.add(dependency)
+            if params[dependency].vary:
+                result.add(dependency)
+            elif params[dependency].expr:
+                stack.extend(params[dependency]._expr_deps)  # noqa: SLF001
+        return result
+
+    def chain_weights(
+        self,
+        params: Parameters,
+        varys: list[str],
+    ) -> dict[str, list[tuple[int, float]]]:
+        """Return the derivatives of the parameters with respect to the free ones.
 
-    """
-    peak_kwargs: dict[Any, Parameters] = defaultdict(dict)
-
-    for model, value in params.items():
-        model_lower = model.lower()
-        ReferenceKeys().model_check(model=model_lower)
-        p_name = model_lower.split("_")
-        if global_fit:
-            peak_kwargs[(p_name[0], p_name[2], p_name[3])][p_name[1]] = value
-        else:
-            peak_kwargs[(p_name[0], p_name[2])][p_name[1]] = value
+        Args:
+            params (Parameters): Current parameters of the fit.
+            varys (List[str]): Names of the free parameters.
+
+        Returns:
+            Dict[str, List[Tuple[int, float]]]: Position of the free parameters and
+                the derivative of the parameter with respect to them.
+
+        """
+        position = {name: j for j, name in enumerate(varys)}
+        weights: dict[str, list[tuple[int, float]]] = {}
+
+        def resolve(name: str) -> list[tuple[int, float]]:
+            if name not in weights:
+                param = params[name]
+                expr = param.expr.strip() if param.expr else None
+                if name in position:
+                    weights[name] = [(position[name], 1.0)]
+                elif expr is None:
+                    weights[name] = []
+                elif expr in params:
+                    weights[name] = resolve(expr)
+                else:
+                    weights[name] = self.expression_weights(params, name, position)
+            return weights[name]
+
+        for name in self.names:
+            resolve(name)
+        return weights
+
+    @staticmethod
+    def expression_weights(
+        params: Parameters,
+        name: str,
+        position: dict[str, int],
+    ) -> list[tuple[int, float]]:
+        """Differentiate a general constraint expression by central differences.
+
+        !!! note "About the bounds"
+
+            `lmfit` clips the shifted dependencies to their bounds, so that the
+            difference is divided by the actually applied step, which becomes a
+            one-sided difference for a dependency at its bound.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
+            name (str): Name of the parameter defined by an expression.
+            position (Dict[str, int]): Position of the free parameters.
+
+        Returns:
+            List[Tuple[int, float]]: Position of the free parameters and the
+                derivative of the expression with respect to them.
+
+        """
+        dependencies: set[str] = set()
+        stack = list(params[name]._expr_deps)  # noqa: SLF001
+        while stack:
+            dependency = stack.pop()
+            if dependency in dependencies or dependency not in params:
+                continue
+            dependencies.add(dependency)
+            stack.extend(params[dependency]._expr_deps)  # noqa: SLF001
+
+        result = []
+        for dependency in sorted(dependencies & position.keys(), key=position.get):
+            param = params[dependency]
+            value = param.value
+            step = FINITE_DIFFERENCE_STEP * max(abs(value), 1.0)
+            param.value = value + step
+            params.update_constraints()
+            upper, value_plus = params[name].value, param.value
+            param.value = value - step
+            params.update_constraints()
+            lower, value_minus = params[name].value, param.value
+            param.value = value
+            params.update_constraints()
+            if value_plus > value_minus:
+                derivative = (upper - lower) / (value_plus - value_minus)
+                result.append((position[dependency], derivative))
+        return result
+
+    @staticmethod
+    def finite_difference(
+        component: PlanComponent,
+        kwargs: dict[str, float],
+        argument: str,
+        x: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Differentiate a kernel by central differences with respect to one argument.
+
+        Args:
+            component (PlanComponent): Model contribution to differentiate.
+            kwargs (Dict[str, float]): Current arguments of the kernel.
+            argument (str): Name of the argument to differentiate.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            NDArray[np.float64]: Partial derivative of the kernel.
+
+        """
+        value = kwargs[argument]
+        step = FINITE_DIFFERENCE_STEP * max(abs(value), 1.0)
+        upper = component.function(x, **{**kwargs, argument: value + step})
+        lower = component.function(x, **{**kwargs, argument: value - step})
+        return np.subtract(upper, lower) / (2 * step)
+
+
+@dataclass(frozen=True)
+class ProjectionGroup:
+    """Linear parameters of a `PlanGroup`, which are solved by the projection.
+
+    Attributes:
+        group (PlanGroup): Group of the contributions.
+        offset (bool): If True, the contributions of the group are not vanishing
+            for linear parameters of zero, e.g. due to a fixed intercept.
+        slots (Tuple[Tuple[int, NDArray[np.int64], NDArray[np.int64]], ...]):
+            Position of the linear argument in `PlanGroup.arguments`, the peaks of
+            the group, and the position of their linear parameters in
+            `VariableProjection.names`.
+    """
+
+    group: PlanGroup
+    offset: bool
+    slots: tuple[tuple[int, NDArray[np.int64], NDArray[np.int64]], ...]
+
+
+class VariableProjection:
+    r"""Variable projection of the linear parameters of a `FitPlan`.
+
+    !!! info "About the variable projection"
+
+        Most models are a linear combination of their `amplitude` or of the
+        coefficients of the background, see `ReferenceKeys.__linear_models__`.
+        Within the variable projection, only the nonlinear parameters like
+        `center` or `fwhmg` are varied by the optimizer, while the linear
+        parameters $a$ are solved exactly for each evaluation of the residual:
+
+        $$
+        \min_{\theta} \min_{a} \| A(\theta) a - (y - y_0(\theta)) \|^2
+        $$
+
+        The columns of $A(\theta)$ are the contributions of the models for a
+        linear parameter of one, and $y_0(\theta)$ is the model for all linear
+        parameters of zero. The linear problem is solved by `numpy.linalg.lstsq`
+        for unbounded parameters, by `scipy.optimize.nnls` for non-negative
+        parameters, and by `scipy.optimize.lsq_linear` for all other bounds. In
+        global fitting, the linear parameters of each spectrum are solved
+        independently.
+
+        Free parameters, which are referenced by an expression, remain part of the
+        nonlinear problem.
+    """
+
+    def __init__(self, plan: FitPlan, params: Parameters) -> None:
+        """Initialize the variable projection.
+
+        Args:
+            plan (FitPlan): Compiled plan of the parameters.
+            params (Parameters): Parameters of the fit.
+
+        """
+        self.plan = plan
+        self.names, self.index, columns = self.compile_names(params)
+        self.groups = self.compile_groups()
+        self.blocks = self.compile_blocks(params, columns)
+
+    def compile_names(
+        self,
+        params: Parameters,
+    ) -> tuple[list[str], NDArray[np.int64], NDArray[np.int64]]:
+        """Select the free linear parameters of the plan.
+
+        Args:
+            params (Parameters): Parameters of the fit.
+
+        Returns:
+            Tuple[List[str], NDArray[np.int64], NDArray[np.int64]]: Names of the
+                linear parameters, their position in `FitPlan.names`, and the
+                column of their spectrum.
+
+        """
+        referenced = {
+            name
+            for param in params.values()
+            for name in param._expr_deps  # noqa: SLF001
+        }
+        n_columns = self.plan.buffer.shape[1] if self.plan.buffer.ndim > 1 else 1
+        index, columns = [], []
+        for component in self.plan.components:
+            linear = ReferenceKeys.__linear_models__.get(component.model, ())
+            for argument, i in zip(component.arguments, component.index.tolist()):
+                param = params[self.plan.names[i]]
+                if (
+                    argument in linear
+                    and param.vary
+                    and not param.expr
+                    and param.name not in referenced
+                ):
+                    index.append(i)
+                    columns.append((component.column or 0) % n_columns)
+        return (
+            [self.plan.names[i] for i in index],
+            np.array(index, dtype=np.int64),
+            np.array(columns, dtype=np.int64),
+        )
+
+    def compile_groups(self) -> list[ProjectionGroup]:
+        """Assign the linear parameters to the groups of the plan.
+
+        Returns:
+            List[ProjectionGroup]: Groups with at least one linear parameter.
+
+        """
+        position = {i: k for k, i in enumerate(self.index.tolist())}
+        result = []
+        for group in self.plan.groups:
+            linear = ReferenceKeys.__linear_models__.get(group.components[0].model, ())
+            offset = not set(linear) <= set(group.arguments)
+            slots = []
+            for k, argument in enumerate(group.arguments):
+                if argument not in linear:
+                    continue
+                column = group.index[:, k].tolist()
+                peaks = [p for p, i in enumerate(column) if i in position]
+                offset |= len(peaks) < len(column)
+                if peaks:
+                    slots.append(
+                        (
+                            k,
+                            np.array(peaks, dtype=np.int64),
+                            np.array([position[column[p]] for p in peaks]),
+                        ),
+                    )
+            if slots:
+                result.append(
+                    ProjectionGroup(group=group, offset=offset, slots=tuple(slots)),
+                )
+        return result
+
+    def compile_blocks(
+        self,
+        params: Parameters,
+        columns: NDArray[np.int64],
+    ) -> list[
+        tuple[int | None, NDArray[np.int64], NDArray[np.float64], NDArray[np.float64]]
+    ]:
+        """Split the linear parameters into the independent problems per spectrum.
+
+        Args:
+            params (Parameters): Parameters of the fit.
+            columns (NDArray[np.int64]): Column of the spectrum of each linear
+                parameter.
+
+        Returns:
+            List[Tuple[int | None, NDArray[np.int64], NDArray[np.float64],
+                NDArray[np.float64]]]: Column of the spectrum or `None` for the
+                local fitting, the position of the linear parameters, and their
+                lower and upper bounds.
+
+        """
+        lower = np.array([params[name].min for name in self.names], dtype=np.float64)
+        upper = np.array([params[name].max for name in self.names], dtype=np.float64)
+        if self.plan.buffer.ndim == 1:
+            block = np.arange(len(self.names))
+            return [(None, block, lower, upper)] if block.size else []
+        blocks = []
+        for column in np.unique(columns).tolist():
+            block = np.flatnonzero(columns == column)
+            blocks.append((column, block, lower[block], upper[block]))
+        return blocks
+
+    def basis(
+        self,
+        values: NDArray[np.float64],
+        x: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Evaluate the contributions of the linear parameters.
+
+        Args:
+            values (NDArray[np.float64]): Parameter values in order of the plan.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.float64]]: Basis of the shape
+                `(n_points, n_linear)` and the parameter values with all linear
+                parameters set to zero.
+
+        """
+        zero = values.copy()
+        zero[self.index] = 0.0
+        basis = np.empty((x.size, self.index.size), dtype=np.float64)
+        for projection in self.groups:
+            group = projection.group
+            offset = (
+                self.plan.evaluate_dense(group, zero, x) if projection.offset else 0.0
+            )
+            for k, peaks, coefficients in projection.slots:
+                unit = zero.copy()
+                unit[group.index[peaks, k]] = 1.0
+                contributions = self.plan.evaluate_dense(group, unit, x) - offset
+                basis[:, coefficients] = contributions[:, peaks]
+        return basis, zero
+
+    def solve(
+        self,
+        params: Parameters,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Solve the linear parameters for the current nonlinear parameters.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.float64]]: Linear parameters in
+                order of `names` and the model in the preallocated buffer of the
+                plan.
+
+        """
+        basis, zero = self.basis(self.plan.values(params), x)
+        model = self.plan.evaluate_values(zero, x)
+        coefficients = np.zeros(self.index.size, dtype=np.float64)
+        for column, block, lower, upper in self.blocks:
+            target = model if column is None else model[:, column]
+            coefficients[block] = self.least_squares(
+                basis[:, block],
+                (data if column is None else data[:, column]) - target,
+                lower,
+                upper,
+            )
+            target += basis[:, block] @ coefficients[block]
+        return coefficients, model
+
+    def update(
+        self,
+        params: Parameters,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+    ) -> None:
+        """Set the linear parameters to their solution for the current parameters.
+
+        Args:
+            params (Parameters): Current parameters of the fit, which are updated.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data.
+
+        """
+        coefficients, _ = self.solve(params, x, data)
+        for name, value in zip(self.names, coefficients.tolist()):
+            params[name].value = value
+
+    @staticmethod
+    def least_squares(
+        a: NDArray[np.float64],
+        b: NDArray[np.float64],
+        lower: NDArray[np.float64],
+        upper: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Solve the linear least squares problem within the bounds.
+
+        Args:
+            a (NDArray[np.float64]): Basis of the shape `(n_points, n_linear)`.
+            b (NDArray[np.float64]): Target of the shape `(n_points,)`.
+            lower (NDArray[np.float64]): Lower bounds of the linear parameters.
+            upper (NDArray[np.float64]): Upper bounds of the linear parameters.
+
+        Returns:
+            NDArray[np.float64]: Linear parameters.
+
+        """
+        if np.all(np.isneginf(lower)) and np.all(np.isposinf(upper)):
+            return np.linalg.lstsq(a, b, rcond=None)[0]
+        if np.all(lower == 0) and np.all(np.isposinf(upper)):
+            return nnls(a, b)[0]
+        return lsq_linear(a, b, bounds=(lower, upper), method="bvls").x
+
+
+class SharedProjection(VariableProjection):
+    r"""Variable projection of the global fitting with shared peak shapes.
+
+    !!! info "About the shared projection"
+
+        In global fitting with linked parameters, all spectra share the shapes of
+        the peaks and only differ by their linear parameters like the amplitudes.
+        For fixed shapes, the basis $A(\theta)$ of the shape `(n_points,
+        n_linear)` is the same for all spectra. Hence, it is evaluated once for
+        the peaks of the first spectrum, and the linear parameters $X$ of all
+        spectra follow from one matrix solve:
+
+        $$
+        \min_{X} \| A(\theta) X - (Y - y_0(\theta)) \|^2
+        $$
+
+        Only the spectra, whose unconstrained solution violates the bounds of
+        their linear parameters, are solved again by `scipy.optimize.nnls` or
+        `scipy.optimize.lsq_linear`. Consequently, the cost of the projection
+        grows with the number of spectra only by a matrix product instead of
+        one basis and one solve per spectrum.
+    """
+
+    def __init__(self, plan: FitPlan, params: Parameters) -> None:
+        """Initialize the shared projection.
+
+        Args:
+            plan (FitPlan): Compiled plan of the parameters of the global fit.
+            params (Parameters): Parameters of the fit.
+
+        """
+        super().__init__(plan=plan, params=params)
+        self.lower = np.array([params[name].min for name in self.names])
+        self.upper = np.array([params[name].max for name in self.names])
+        self.shared, self.layout = self.compile_layout()
+
+    def compile_layout(
+        self,
+    ) -> tuple[list[ProjectionGroup], NDArray[np.int64] | None]:
+        """Compile the groups of the first spectrum and the layout of the spectra.
+
+        Returns:
+            Tuple[List[ProjectionGroup], NDArray[np.int64] | None]: Groups of the
+                peaks of the first spectrum with their position in the basis, and
+                the position of the linear parameters in `names` of the shape
+                `(n_linear, n_columns)`. The layout is `None`, if the spectra do
+                not share their shapes or their linear parameters are not all
+                free.
+
+        """
+        if self.plan.buffer.ndim == 1 or not self.names:
+            return [], None
+        n_columns = self.plan.buffer.shape[1]
+        position = {i: k for k, i in enumerate(self.index.tolist())}
+        shapes: dict[tuple[str, str], dict[int, NDArray[np.int64]]] = defaultdict(
+            dict,
+        )
+        linear: dict[tuple[str, str, str], dict[int, int]] = defaultdict(dict)
+        for component in self.plan.components:
+            column = (component.column or 0) % n_columns
+            arguments = ReferenceKeys.__linear_models__.get(component.model, ())
+            key = (component.model, component.peak)
+            mask = np.array(
+                [argument not in arguments for argument in component.arguments]
+            )
+            shapes[key][column] = component.index[mask]
+            for argument, i in zip(component.arguments, component.index.tolist()):
+                if argument not in arguments:
+                    continue
+                if i not in position:
+                    return [], None
+                linear[(*key, argument)][column] = position[i]
+        if any(
+            len(columns) != n_columns
+            or any(not np.array_equal(index, columns[0]) for index in columns.values())
+            for columns in shapes.values()
+        ) or any(len(columns) != n_columns for columns in linear.values()):
+            return [], None
+
+        slots = {key: k for k, key in enumerate(linear)}
+        groups = []
+        for group in self.plan.groups:
+            peaks = [
+                p
+                for p, component in enumerate(group.components)
+                if (component.column or 0) % n_columns == 0
+            ]
+            if not peaks:
+                continue
+            first = replace(
+                group,
+                components=tuple(group.components[p] for p in peaks),
+                index=group.index[peaks],
+                layers=None,
+                columns=None,
+            )
+            arguments = ReferenceKeys.__linear_models__.get(
+                group.components[0].model,
+                (),
+            )
+            groups.append(
+                ProjectionGroup(
+                    group=first,
+                    offset=not set(arguments) <= set(group.arguments),
+                    slots=tuple(
+                        (
+                            k,
+                            np.arange(len(peaks), dtype=np.int64),
+                            np.array(
+                                [
+                                    slots[(component.model, component.peak, argument)]
+                                    for component in first.components
+                                ],
+                                dtype=np.int64,
+                            ),
+                        )
+                        for k, argument in enumerate(group.arguments)
+                        if argument in arguments
+                    ),
+                ),
+            )
+        layout = np.array(
+            [[columns[c] for c in range(n_columns)] for columns in linear.values()],
+            dtype=np.int64,
+        )
+        return groups, layout
+
+    def basis(
+        self,
+        values: NDArray[np.float64],
+        x: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Evaluate the shared basis and the model without the linear parameters.
+
+        Args:
+            values (NDArray[np.float64]): Parameter values in order of the plan.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.float64]]: Basis of the shape
+                `(n_points, n_linear)` of the first spectrum and the model of the
+                shape `(n_points,)` for all linear parameters set to zero.
+
+        """
+        zero = values.copy()
+        zero[self.index] = 0.0
+        basis = np.empty((x.size, self.layout.shape[0]), dtype=np.float64)
+        model = np.zeros(x.size, dtype=np.float64)
+        for projection in self.shared:
+            group = projection.group
+            offset = (
+                self.plan.evaluate_dense(group, zero, x)
+                if projection.offset or not projection.slots
+                else 0.0
+            )
+            model += np.sum(offset, axis=1) if np.ndim(offset) else 0.0
+            for k, peaks, slots in projection.slots:
+                unit = zero.copy()
+                unit[group.index[peaks, k]] = 1.0
+                contributions = self.plan.evaluate_dense(group, unit, x) - offset
+                basis[:, slots] = contributions[:, peaks]
+        return basis, model
+
+    def solve(
+        self,
+        params: Parameters,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Solve the linear parameters of all spectra for the shared shapes.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 2d-array.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.float64]]: Linear parameters in
+                order of `names` and the model in the preallocated buffer of the
+                plan.
+
+        """
+        basis, offset = self.basis(self.plan.values(params), x)
+        target = data - offset[:, np.newaxis]
+        solution = np.linalg.lstsq(basis, target, rcond=None)[0]
+        lower, upper = self.lower[self.layout], self.upper[self.layout]
+        for column in np.flatnonzero(
+            np.any((solution < lower) | (solution > upper), axis=0),
+        ).tolist():
+            solution[:, column] = self.least_squares(
+                basis,
+                target[:, column],
+                lower[:, column],
+                upper[:, column],
+            )
+        coefficients = np.empty(self.index.size, dtype=np.float64)
+        coefficients[self.layout] = solution
+        model = self.plan.buffer
+        np.matmul(basis, solution, out=model)
+        model += offset[:, np.newaxis]
+        return coefficients, model
+
+
+class MultiStart:
+    """Multi-start optimization from sampled initial parameters.
+
+    !!! info "About the multi-start optimization"
+
+        Local optimizers like `leastsq` often converge to poor minima for
+        overlapping peaks. The multi-start optimization samples `starts` initial
+        parameter sets within the `min` and `max` of each free parameter by a
+        scrambled Sobol sequence or a Latin hypercube, see `scipy.stats.qmc`. Free
+        parameters without finite bounds keep their initial value, and the initial
+        values of the input are the first start. The short local fits of the
+        starts are run in a pool of worker processes and stop early, once a start
+        reaches a chi-square below `target`. The best start is refined by the
+        regular fit, which provides the uncertainties.
+    """
+
+    def __init__(
+        self,
+        params: Parameters,
+        options: dict[str, Any],
+        links: dict[str, str] | None = None,
+    ) -> None:
+        """Initialize the multi-start optimization.
+
+        Args:
+            params (Parameters): Parameters of the fit.
+            options (Dict[str, Any]): Options of the multi-start, see
+                `MultiStartAPI`.
+            links (Dict[str, str], optional): Linked parameters of the plan, see
+                `FitPlan`. Defaults to None.
+
+        """
+        self.params = params
+        self.options = options
+        self.links = links
+        self.names = [
+            name
+            for name, param in params.items()
+            if param.vary
+            and param.expr is None
+            and np.isfinite(param.min)
+            and np.isfinite(param.max)
+        ]
+
+    def samples(self) -> NDArray[np.float64]:
+        """Sample the initial values of the bounded free parameters.
+
+        Returns:
+            NDArray[np.float64]: Initial values of the shape `(starts, n_names)`,
+                whose first row are the initial values of the input.
+
+        """
+        initial = np.array([self.params[name].value for name in self.names])
+        if self.options["starts"] == 1 or not self.names:
+            return initial[np.newaxis, :]
+        if self.options["sampling"] == "lhs":
+            sampler = qmc.LatinHypercube(d=len(self.names), seed=self.options["seed"])
+        else:
+            sampler = qmc.Sobol(d=len(self.names), seed=self.options["seed"])
+        with warnings.catch_warnings():
+            # Sobol sequences are only balanced for powers of two.
+            warnings.simplefilter("ignore", UserWarning)
+            sample = sampler.random(self.options["starts"] - 1)
+        sample = qmc.scale(
+            sample,
+            [self.params[name].min for name in self.names],
+            [self.params[name].max for name in self.names],
+        )
+        return np.vstack((initial, sample))
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+        args_solver: dict[str, Any],
+        global_: int,
+    ) -> dict[str, Any]:
+        """Run the local fits of the starts.
+
+        Args:
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 1d- or 2d-array.
+            args_solver (Dict[str, Any]): The solver arguments, see
+                `SolverModelsAPI`.
+            global_ (int): The global fitting mode.
+
+        Returns:
+            Dict[str, Any]: Insights of the multi-start with the chi-square of each
+                finished start, the index of the best start, and the spread of the
+                solutions of all free parameters. The best values are set as the
+                initial values of `params`.
+
+        """
+        samples = self.samples()
+        workers = min(self.options["workers"] or os.cpu_count() or 1, len(samples))
+        executor: Executor = (
+            ThreadPoolExecutor(max_workers=1)
+            if workers == 1
+            else ProcessPoolExecutor(max_workers=workers)
+        )
+        results: dict[int, dict[str, Any]] = {}
+        with executor:
+            futures = {}
+            for i, sample in enumerate(samples):
+                params = self.params.copy()
+                for name, value in zip(self.names, sample.tolist()):
+                    params[name].value = value
+                future = executor.submit(
+                    self.solve,
+                    params,
+                    x,
+                    data,
+                    args_solver,
+                    global_,
+                    self.options["max_nfev"],
+                    self.links,
+                )
+                futures[future] = i
+            target = self.options["target"]
+            for future in as_completed(futures):
+                try:
+                    result = results[futures[future]] = future.result()
+                except (ValueError, FloatingPointError, np.linalg.LinAlgError):
+                    continue
+                if target is not None and result["chi_square"] <= target:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+        if not results:
+            msg = "None of the starts of the multi-start optimization converged!"
+            raise ValueError(msg)
+        best = min(results, key=lambda i: results[i]["chi_square"])
+        for name, value in results[best]["values"].items():
+            self.params[name].value = value
+        values = {
+            name: np.array([result["values"][name] for result in results.values()])
+            for name in results[best]["values"]
+        }
+        return {
+            "starts": len(samples),
+            "finished": len(results),
+            "best": best,
+            "chi_square": {i: results[i]["chi_square"] for i in sorted(results)},
+            "nfev": sum(result["nfev"] for result in results.values()),
+            "variables": {
+                name: {
+                    "best_value": results[best]["values"][name],
+                    "mean": float(value.mean()),
+                    "std": float(value.std()),
+                    "min": float(value.min()),
+                    "max": float(value.max()),
+                }
+                for name, value in values.items()
+            },
+        }
+
+    @staticmethod
+    def solve(
+        params: Parameters,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+        args_solver: dict[str, Any],
+        global_: int,
+        max_nfev: int | None,
+        links: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Run the local fit of a single start.
+
+        Args:
+            params (Parameters): Parameters of the fit with the sampled values.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 1d- or 2d-array.
+            args_solver (Dict[str, Any]): The solver arguments, see
+                `SolverModelsAPI`.
+            global_ (int): The global fitting mode.
+            max_nfev (int, optional): Maximum number of function evaluations, which
+                replaces the one of the optimizer.
+            links (Dict[str, str], optional): Linked parameters of the plan, see
+                `FitPlan`. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: Chi-square, number of function evaluations, success, and
+                the best values and uncertainties of the free parameters of the
+                start.
+
+        """
+        plan = FitPlan(
+            params=params,
+            shape=data.shape,
+            global_fit=global_,
+            window=args_solver["window"],
+            backend=args_solver["backend"],
+            faddeeva=args_solver["faddeeva"],
+            links=links,
+        )
+        minimizer = Minimizer(
+            (
+                SolverModels.solve_global_fitting
+                if global_
+                else SolverModels.solve_local_fitting
+            ),
+            params=params,
+            fcn_args=(x, data),
+            fcn_kws={"plan": plan},
+            **args_solver["minimizer"],
+        )
+        kws = dict(args_solver["optimizer"])
+        if max_nfev is not None:
+            kws["max_nfev"] = max_nfev
+        if args_solver["jacobian"] and kws.get("method", "leastsq") == "leastsq":
+            kws["Dfun"] = SolverModels.solve_jacobian
+        elif args_solver["jacobian"] and kws["method"] == "least_squares":
+            kws["jac"] = SolverModels.vector_jacobian(params, x, plan)
+        result = minimizer.minimize(**kws)
+        return {
+            "chi_square": float(result.chisqr),
+            "nfev": int(result.nfev),
+            "success": bool(result.success),
+            "values": {
+                name: float(param.value)
+                for name, param in result.params.items()
+                if param.vary
+            },
+            "stderr": {
+                name: param.stderr
+                for name, param in result.params.items()
+                if param.vary
+            },
+        }
+
+
+@dataclass(frozen=True)
+class PlanRegion:
+    """Independent region of a cluster of localized peaks.
+
+    Attributes:
+        components (Tuple[PlanComponent, ...]): Localized contributions of the
+            cluster.
+        varys (Tuple[str, ...]): Free parameters, which are fitted in the region.
+        lower (float): Lower bound of the region on the `x`-axis.
+        upper (float): Upper bound of the region on the `x`-axis.
+    """
+
+    components: tuple[PlanComponent, ...]
+    varys: tuple[str, ...]
+    lower: float
+    upper: float
+
+
+class RegionDecomposition:
+    """Decomposition of the spectrum into independent regions of peak clusters.
+
+    !!! info "About the region decomposition"
+
+        Spectra of well-separated groups of peaks are fitted as many small and
+        independent problems instead of one large problem, whose cost grows
+        super-linearly with the number of parameters. Each localized model of
+        `ReferenceKeys.__window_models__` occupies the interval
+        `center ± window · FWHM` of its initial parameters, which are taken from
+        the `peaks` table or the `AutoPeakDetection`. Peaks with overlapping
+        intervals, or which share free parameters via expressions, are joined into
+        one cluster, whose hull defines the region. The free parameters of each
+        region are fitted in a pool of worker processes against the data of the
+        region, from which the contributions of all other models at their initial
+        values are subtracted. Hence, the non-localized models like backgrounds
+        keep their initial values within the regions.
+
+    !!! tip "About the refinement"
+
+        By default, the merged parameters are the initial values of the regular
+        fit of all parameters, which converges within a few iterations and also
+        fits the backgrounds. Without the refinement, the result is assembled from
+        the fits of the regions, including their uncertainties.
+    """
+
+    def __init__(
+        self,
+        plan: FitPlan,
+        params: Parameters,
+        options: dict[str, Any],
+    ) -> None:
+        """Initialize the region decomposition.
+
+        Args:
+            plan (FitPlan): Compiled plan of the local fit.
+            params (Parameters): Parameters of the fit.
+            options (Dict[str, Any]): Options of the decomposition, see
+                `DecompositionAPI`.
+
+        """
+        self.plan = plan
+        self.params = params
+        self.options = options
+        self.regions = self.compile_regions()
+        self.stderr: dict[str, float | None] = {}
+        self.success = True
+
+    def compile_regions(self) -> list[PlanRegion]:
+        """Cluster the localized peaks into independent regions.
+
+        Returns:
+            List[PlanRegion]: Regions in ascending order of their lower bound, which
+                have free parameters.
+
+        """
+        values = self.plan.values(self.params)
+        clusters: list[tuple[list[PlanComponent], set[str], float, float]] = []
+        fixed: set[str] = set()
+        for component in self.plan.components:
+            names = [self.plan.names[i] for i in component.index]
+            kwargs = dict(zip(component.arguments, values[component.index].tolist()))
+            widths = [
+                factor * abs(kwargs[argument])
+                for argument, factor in ReferenceKeys.__window_models__.get(
+                    component.model,
+                    (),
+                )
+                if argument in kwargs
+            ]
+            if "center" not in kwargs or not widths:
+                fixed.update(names)
+                continue
+            width = self.options["window"] * max(widths)
+            clusters.append(
+                (
+                    [component],
+                    set().union(
+                        *(
+                            FitPlan.free_dependencies(self.params, name)
+                            for name in names
+                        ),
+                    ),
+                    kwargs["center"] - width,
+                    kwargs["center"] + width,
+                ),
+            )
+
+        merged = True
+        while merged:
+            merged = False
+            joined: list[tuple[list[PlanComponent], set[str], float, float]] = []
+            for cluster in sorted(clusters, key=lambda cluster: cluster[2]):
+                for i, other in enumerate(joined):
+                    if cluster[1] & other[1] or (
+                        cluster[2] <= other[3] and other[2] <= cluster[3]
+                    ):
+                        joined[i] = (
+                            other[0] + cluster[0],
+                            other[1] | cluster[1],
+                            min(other[2], cluster[2]),
+                            max(other[3], cluster[3]),
+                        )
+                        merged = True
+                        break
+                else:
+                    joined.append(cluster)
+            clusters = joined
+
+        return [
+            PlanRegion(
+                components=tuple(components),
+                varys=tuple(name for name in self.params if name in varys - fixed),
+                lower=lower,
+                upper=upper,
+            )
+            for components, varys, lower, upper in clusters
+            if varys - fixed
+        ]
+
+    def subproblem(self, region: PlanRegion) -> Parameters:
+        """Return the parameters of the models of a region.
+
+        !!! note "About the dependencies"
+
+            Parameters of other models, which are referenced by expressions, are
+            included as fixed parameters together with the complete model, so that
+            the plan of the region remains valid.
+
+        Args:
+            region (PlanRegion): Region of the subproblem.
+
+        Returns:
+            Parameters: Parameters of the region, whose free parameters are the
+                `varys` of the region.
+
+        """
+        owners = {
+            self.plan.names[i]: component
+            for component in self.plan.components
+            for i in component.index
+        }
+        needed: set[str] = set()
+        stack = [
+            self.plan.names[i]
+            for component in region.components
+            for i in component.index
+        ]
+        while stack:
+            name = stack.pop()
+            if name in needed or name not in self.params:
+                continue
+            names = [self.plan.names[i] for i in owners[name].index]
+            needed.update(names)
+            for _name in names:
+                if self.params[_name].expr:
+                    stack.extend(self.params[_name]._expr_deps)  # noqa: SLF001
+
+        params = Parameters()
+        for name, param in self.params.items():
+            if name in needed:
+                params.add(
+                    name,
+                    value=param.value,
+                    vary=param.vary and name in region.varys,
+                    min=param.min,
+                    max=param.max,
+                    expr=param.expr,
+                )
+        return params
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+        args_solver: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Fit the regions in parallel and merge their parameters.
+
+        Args:
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 1d-array.
+            args_solver (Dict[str, Any]): The solver arguments, see
+                `SolverModelsAPI`.
+
+        Returns:
+            Dict[str, Any]: Insights of the decomposition with the bounds, the peaks,
+                the number of points, and the chi-square of each region. The best
+                values are set as the initial values of `params`.
+
+        """
+        model = self.plan.evaluate(self.params, x).copy()
+        regions: dict[int, dict[str, Any]] = {}
+        tasks = {}
+        for i, region in enumerate(self.regions):
+            inside = (x >= region.lower) & (x <= region.upper)
+            regions[i] = {
+                "lower": region.lower,
+                "upper": region.upper,
+                "peaks": [component.label for component in region.components],
+                "points": int(np.count_nonzero(inside)),
+                "chi_square": None,
+                "nfev": 0,
+                "success": False,
+            }
+            if regions[i]["points"] <= len(region.varys):
+                continue
+            params = self.subproblem(region)
+            plan = FitPlan(
+                params=params,
+                shape=x[inside].shape,
+                global_fit=GLOBAL_NONE,
+                window=args_solver["window"],
+                backend=args_solver["backend"],
+                faddeeva=args_solver["faddeeva"],
+            )
+            offset = model[inside] - plan.evaluate(params, x[inside])
+            tasks[i] = (params, x[inside], data[inside] - offset)
+
+        workers = min(self.options["workers"] or os.cpu_count() or 1, len(tasks))
+        executor: Executor = (
+            ThreadPoolExecutor(max_workers=1)
+            if workers <= 1
+            else ProcessPoolExecutor(max_workers=workers)
+        )
+        with executor:
+            futures = {
+                executor.submit(
+                    MultiStart.solve,
+                    *task,
+                    args_solver,
+                    GLOBAL_NONE,
+                    None,
+                ): i
+                for i, task in tasks.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except (
+                    ValueError,
+                    TypeError,
+                    FloatingPointError,
+                    np.linalg.LinAlgError,
+                ):
+                    continue
+                regions[futures[future]].update(
+                    chi_square=result["chi_square"],
+                    nfev=result["nfev"],
+                    success=result["success"],
+                )
+                for name, value in result["values"].items():
+                    self.params[name].value = value
+                self.stderr.update(result["stderr"])
+
+        self.success = all(region["success"] for region in regions.values())
+        return {
+            "regions": [regions[i] for i in sorted(regions)],
+            "fitted": sum(
+                region["chi_square"] is not None for region in regions.values()
+            ),
+            "nfev": sum(region["nfev"] for region in regions.values()),
+        }
+
+    def result(self, minimizer: Minimizer, nfev: int) -> Any:
+        """Assemble the fitting results from the fits of the regions.
+
+        Args:
+            minimizer (Minimizer): Minimizer of the fitting problem.
+            nfev (int): Number of function evaluations of all regions.
+
+        Returns:
+            Any: Fitting results of the merged parameters, whose uncertainties are
+                taken from the regions. The covariance matrix is not available.
+
+        """
+        result = minimizer.prepare_fit(self.params)
+        result.method = "decomposition"
+        result.residual = np.ravel(
+            minimizer.userfcn(result.params, *minimizer.userargs, **minimizer.userkws),
+        ).astype(np.float64)
+        result._calculate_statistics()  # noqa: SLF001
+        for name, stderr in self.stderr.items():
+            result.params[name].stderr = stderr
+        result.nfev = nfev
+        result.success = self.success
+        result.errorbars = all(
+            result.params[name].stderr is not None for name in result.var_names
+        )
+        result.message = (
+            f"Assembled from the fits of {len(self.regions)} independent regions."
+        )
+        return result
+
+
+class MarkovChain:
+    r"""Markov chain Monte Carlo sampling of the posterior around the best fit.
+
+    !!! info "About the sampling"
+
+        The posterior of the free parameters is sampled by the affine-invariant
+        ensemble of `emcee` with uniform priors within the `min` and `max` of the
+        parameters and the Gaussian likelihood
+
+        $$
+        \ln p(\theta) = -\frac{1}{2 \sigma^2} \sum_i (f(x_i; \theta) - y_i)^2,
+        $$
+
+        where the noise $\sigma^2$ is estimated by the reduced chi-square of the
+        best fit. The walkers start in a small ball around the best fit. With
+        `vectorize`, the models of all walkers are evaluated in one call of
+        `FitPlan.evaluate_batch`; with `workers`, the walkers are distributed over
+        a pool of worker processes instead.
+
+    !!! info "About the early stopping"
+
+        Every `check` steps, the integrated autocorrelation time $\tau$ of the
+        chain is estimated. The sampling stops, once the chain is longer than
+        `tau_factor` $\cdot \tau$ for all parameters and $\tau$ changed by less than
+        `tau_rtol`. By default, twice the largest $\tau$ is discarded as burn-in
+        and the chain is thinned by half the smallest $\tau$.
+    """
+
+    def __init__(
+        self,
+        plan: FitPlan,
+        params: Parameters,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+        variance: float,
+    ) -> None:
+        """Initialize the sampling.
+
+        Args:
+            plan (FitPlan): Compiled plan of the parameters.
+            params (Parameters): Best parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 1d- or 2d-array.
+            variance (float): Variance of the noise of the data.
+
+        """
+        self.plan = plan
+        self.params = params.copy()
+        self.x = x
+        self.data = data
+        self.variance = variance
+        self.varys = [name for name, param in params.items() if param.vary]
+        self.lower = np.array([params[name].min for name in self.varys])
+        self.upper = np.array([params[name].max for name in self.varys])
+        self.constants = plan.values(params)
+        self.free, self.source, self.expressions = self.compile_sources()
+
+    def compile_sources(self) -> tuple[list[int], list[int], list[int]]:
+        """Assign the parameters of the plan to the free parameters.
+
+        Returns:
+            Tuple[List[int], List[int], List[int]]: Position of the parameters of
+                the plan, which are free or aliases of a free parameter, their
+                position in the free parameters, and the position of the parameters
+                of the plan defined by a general expression.
+
+        """
+        position = {name: j for j, name in enumerate(self.varys)}
+        free, source, expressions = [], [], []
+        for i, name in enumerate(self.plan.names):
+            while self.params[name].expr and self.params[name].expr.strip() in (
+                self.params
+            ):
+                name = self.params[name].expr.strip()
+            if name in position:
+                free.append(i)
+                source.append(position[name])
+            elif self.params[name].expr:
+                expressions.append(i)
+        return free, source, expressions
+
+    def values(self, theta: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Return the parameter values of the plan for a batch of free parameters.
+
+        Args:
+            theta (NDArray[np.float64]): Free parameters of the shape
+                `(n_batch, n_varys)`.
+
+        Returns:
+            NDArray[np.float64]: Parameter values of the shape `(n_batch, n_names)`.
+
+        """
+        values = np.tile(self.constants, (theta.shape[0], 1))
+        values[:, self.free] = theta[:, self.source]
+        for k, row in enumerate(theta.tolist()):
+            if not self.expressions:
+                break
+            for name, value in zip(self.varys, row):
+                self.params[name].value = value
+            self.params.update_constraints()
+            values[k, self.expressions] = [
+                self.params[self.plan.names[i]].value for i in self.expressions
+            ]
+        return values
+
+    def log_prob(self, theta: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Return the log-probability of a batch of free parameters.
+
+        Args:
+            theta (NDArray[np.float64]): Free parameters of the shape
+                `(n_batch, n_varys)`.
+
+        Returns:
+            NDArray[np.float64]: Log-probability of each parameter set, which is
+                `-inf` outside the bounds.
+
+        """
+        result = np.full(theta.shape[0], -np.inf)
+        inside = np.all((theta >= self.lower) & (theta <= self.upper), axis=1)
+        if inside.any():
+            residual = (
+                self.plan.evaluate_batch(self.values(theta[inside]), self.x) - self.data
+            )
+            chisqr = np.sum(residual.reshape(residual.shape[0], -1) ** 2, axis=1)
+            result[inside] = np.where(
+                np.isfinite(chisqr),
+                -0.5 * chisqr / self.variance,
+                -np.inf,
+            )
+        return result
+
+    def log_prob_single(self, theta: NDArray[np.float64]) -> float:
+        """Return the log-probability of a single set of free parameters.
+
+        Args:
+            theta (NDArray[np.float64]): Free parameters of the shape `(n_varys,)`.
+
+        Returns:
+            float: Log-probability of the parameters.
+
+        """
+        return float(self.log_prob(theta[np.newaxis, :])[0])
+
+    def __call__(self, options: dict[str, Any]) -> dict[str, Any]:
+        """Sample the posterior.
+
+        Args:
+            options (Dict[str, Any]): Options of the sampling, see
+                `MarkovChainAPI`.
+
+        Returns:
+            Dict[str, Any]: Insights of the sampling with the number of walkers and
+                steps, the burn-in, the thinning, the acceptance fraction, the
+                autocorrelation times, and the median and the 1-sigma quantiles of
+                the free parameters.
+
+        """
+        ndim = len(self.varys)
+        walkers = options["walkers"] or max(32, 2 * ndim + 2)
+        rng = np.random.default_rng(options["seed"])
+        best = np.array([self.params[name].value for name in self.varys])
+        scale = np.array(
+            [
+                self.params[name].stderr
+                if self.params[name].stderr and np.isfinite(self.params[name].stderr)
+                else 1e-4 * max(abs(self.params[name].value), 1.0)
+                for name in self.varys
+            ],
+        )
+        start = np.clip(
+            best + 1e-2 * scale * rng.standard_normal((walkers, ndim)),
+            self.lower,
+            self.upper,
+        )
+        pool = (
+            Pool(
+                options["workers"],
+                initializer=_init_worker_chain,
+                initargs=(self,),
+            )
+            if options["workers"]
+            else None
+        )
+        vectorize = pool is None and options["vectorize"]
+        if vectorize:
+            log_prob = self.log_prob
+        elif pool is None:
+            log_prob = self.log_prob_single
+        else:
+            log_prob = _log_prob_worker
+        try:
+            sampler = emcee.EnsembleSampler(
+                walkers,
+                ndim,
+                log_prob,
+                vectorize=vectorize,
+                pool=pool,
+            )
+            if options["seed"] is not None:
+                sampler.random_state = np.random.RandomState(
+                    options["seed"],
+                ).get_state()
+            tau = self.run(sampler, start, options)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        burn = options["burn"]
+        if burn is None:
+            burn = int(2 * np.max(tau)) if np.all(np.isfinite(tau)) else 0
+        thin = options["thin"]
+        if thin is None:
+            thin = max(int(0.5 * np.min(tau)), 1) if np.all(np.isfinite(tau)) else 1
+        flat = sampler.get_chain(discard=burn, thin=thin, flat=True)
+        quantiles = np.percentile(flat, [15.865, 50.0, 84.135], axis=0)
+        return {
+            "walkers": walkers,
+            "steps": sampler.iteration,
+            "burn": burn,
+            "thin": thin,
+            "samples": flat.shape[0],
+            "acceptance_fraction": float(np.mean(sampler.acceptance_fraction)),
+            "autocorr_time": dict(zip(self.varys, tau.tolist())),
+            "variables": {
+                name: {
+                    "median": quantiles[1, j],
+                    "lower": quantiles[0, j],
+                    "upper": quantiles[2, j],
+                    "stderr": 0.5 * (quantiles[2, j] - quantiles[0, j]),
+                }
+                for j, name in enumerate(self.varys)
+            },
+        }
+
+    @staticmethod
+    def run(
+        sampler: emcee.EnsembleSampler,
+        start: NDArray[np.float64],
+        options: dict[str, Any],
+    ) -> NDArray[np.float64]:
+        """Run the sampler with the optional early stopping.
+
+        Args:
+            sampler (emcee.EnsembleSampler): Sampler of the posterior.
+            start (NDArray[np.float64]): Initial positions of the walkers.
+            options (Dict[str, Any]): Options of the sampling, see
+                `MarkovChainAPI`.
+
+        Returns:
+            NDArray[np.float64]: Integrated autocorrelation time of each free
+                parameter.
+
+        """
+        tau = np.full(start.shape[1], np.inf)
+        for _ in sampler.sample(start, iterations=options["steps"]):
+            if not options["autocorr"] or sampler.iteration % options["check"]:
+                continue
+            previous, tau = tau, sampler.get_autocorr_time(tol=0)
+            if np.all(tau * options["tau_factor"] < sampler.iteration) and np.all(
+                np.abs(previous - tau) < options["tau_rtol"] * tau,
+            ):
+                break
+        return sampler.get_autocorr_time(tol=0)
+
+
+# Markov chain of a worker process of the pooled sampling
+_WORKER_CHAIN: dict[str, MarkovChain] = {}
+
+
+def _init_worker_chain(chain: MarkovChain) -> None:
+    """Store the Markov chain once per worker process.
+
+    Args:
+        chain (MarkovChain): Markov chain, whose plan is compiled only once per
+            worker instead of being sent with each batch of walkers.
+
+    """
+    _WORKER_CHAIN["chain"] = chain
+
+
+def _log_prob_worker(theta: NDArray[np.float64]) -> float:
+    """Return the log-probability of a walker by the chain of the worker process.
+
+    Args:
+        theta (NDArray[np.float64]): Free parameters of the shape `(n_varys,)`.
+
+    Returns:
+        float: Log-probability of the parameters.
+
+    """
+    return _WORKER_CHAIN["chain"].log_prob_single(theta)
+
+
+class FitMonitor:
+    """Wall-clock budget and convergence monitor of the fit.
+
+    !!! info "About the convergence monitor"
+
+        The monitor is passed as `iter_cb` to the `Minimizer` and is called after
+        each function evaluation. It tracks the best chi-square and its parameters,
+        and aborts the fit, once the wall-clock budget `timeout` is exceeded, or
+        once the best chi-square has not improved by more than the relative
+        tolerance `rtol` within `patience` function evaluations. The budget starts
+        with the monitor and is shared by the variable projection and the final
+        fit. Since `lmfit` keeps the parameters of the last evaluation of an
+        aborted fit, the best parameters so far are restored via `restore`.
+
+    !!! tip "About the progress"
+
+        Every `interval` seconds and at the abort, the number of function
+        evaluations, the current and the best chi-square, and the evaluations per
+        second are written as one JSON line to `stderr` or appended to the file
+        `progress`.
+    """
+
+    def __init__(self, options: dict[str, Any]) -> None:
+        """Initialize the monitor and start the wall-clock budget.
+
+        Args:
+            options (Dict[str, Any]): Options of the monitor, see `MonitorAPI`.
+
+        """
+        self.options = options
+        self.start = perf_counter()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the tracking for a new minimization."""
+        self.started = perf_counter()
+        self.nfev = 0
+        self.chisqr = np.inf
+        self.best = np.inf
+        self.values: dict[str, float] = {}
+        self.reference = np.inf
+        self.improved = 0
+        self.reported = -np.inf
+        self.reason: str | None = None
+
+    def __call__(
+        self,
+        params: Parameters,
+        nfev: int,
+        resid: NDArray[np.float64],
+        *_: Any,
+        **__: Any,
+    ) -> bool:
+        """Track a function evaluation of the fit.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
+            nfev (int): Number of function evaluations of the minimization.
+            resid (NDArray[np.float64]): Residual of the current parameters.
+            *_ (Any): Positional arguments of the residual, which are ignored.
+            **__ (Any): Keyword arguments of the residual, which are ignored.
+
+        Returns:
+            bool: True, if the fit has to be aborted.
+
+        """
+        self.nfev = nfev
+        self.chisqr = float(np.sum(np.square(resid)))
+        if self.chisqr < self.best:
+            self.best = self.chisqr
+            self.values = params.valuesdict()
+        if self.options["rtol"] is not None:
+            if self.best < self.reference * (1 - self.options["rtol"]):
+                self.reference, self.improved = self.best, nfev
+            elif nfev - self.improved >= self.options["patience"]:
+                self.reason = "stalled"
+        now = perf_counter()
+        if self.options["timeout"] is not None and (
+            now - self.start >= self.options["timeout"]
+        ):
+            self.reason = "timeout"
+        if self.options["progress"] and (
+            self.reason or now - self.reported >= self.options["interval"]
+        ):
+            self.reported = now
+            self.report()
+        return self.reason is not None
+
+    @property
+    def insights(self) -> dict[str, Any]:
+        """Return the insights of the last minimization.
+
+        Returns:
+            Dict[str, Any]: Number of function evaluations, the current and the best
+                chi-square, the elapsed seconds of the budget, the evaluations per
+                second, and the reason of the abort, which is None for a regular
+                convergence.
+
+        """
+        now = perf_counter()
+        return {
+            "nfev": self.nfev,
+            "chisqr": self.chisqr if np.isfinite(self.chisqr) else None,
+            "best": self.best if np.isfinite(self.best) else None,
+            "seconds": round(now - self.start, 3),
+            "rate": round(self.nfev / max(now - self.started, 1e-9), 1),
+            "reason": self.reason,
+        }
+
+    def report(self) -> None:
+        """Write the progress as one JSON line to `stderr` or the progress file."""
+        record = json.dumps(self.insights)
+        if self.options["progress"] == "stderr":
+            sys.stderr.write(f"{record}\n")
+            sys.stderr.flush()
+            return
+        with Path(self.options["progress"]).open("a", encoding="utf-8") as file:
+            file.write(f"{record}\n")
+
+    def restore(self, minimizer: Minimizer, result: Any) -> None:
+        """Restore the best parameters so far into the result of an aborted fit.
+
+        Args:
+            minimizer (Minimizer): Minimizer of the aborted fit.
+            result (Any): Fitting results of the aborted fit, whose parameters,
+                residual, and statistics are replaced by the best evaluation.
+
+        """
+        if not self.values:
+            return
+        for name, param in result.params.items():
+            if param.vary and param.expr is None:
+                param.value = self.values[name]
+        result.params.update_constraints()
+        result.residual = np.ravel(
+            minimizer.userfcn(
+                result.params,
+                *minimizer.userargs,
+                **minimizer.userkws,
+            ),
+        ).astype(np.float64)
+        result._calculate_statistics()  # noqa: SLF001
+        result.message = (
+            f"Fit aborted by the monitor ({self.reason}), the best parameters so far "
+            "are restored."
+        )
+
+
+class SolverModels(ModelParameters):
+    """Solving models for 2D and 3D data sets.
+
+    !!! hint "Solver Modes"
+        * `"2D"`: Solve 2D models via the classic `lmfit` function.
+        * `"3D"`: Solve 3D models via global git. For the `global-fitting` procedure,
+             the `lmfit` function is used to solve the models with an extended set of
+             parameters.
+          the `lmfit` function is used.
+    """
+
+    def __init__(self, df: pd.DataFrame, args: dict[str, Any]) -> None:
+        """Initialize the solver modes.
+
+        Args:
+            df (pd.DataFrame): DataFrame containing the input data (`x` and `data`).
+            args (Dict[str, Any]): The input file arguments as a dictionary with
+                 additional information beyond the command line arguments.
+
+        """
+        super().__init__(df=df, args=args)
+        self.args_solver = SolverModelsAPI(**args).model_dump()
+        self.args_global = GlobalFittingAPI(**args).model_dump()
+        self.layout = self.return_params
+        self.params, self.links = self.layout, {}
+        if self.args_global["global_"] and self.args_solver["links"]:
+            self.params, self.links = self.link_parameters(self.layout)
+        FitPlan.check_window(self.x, self.args_solver["window"])
+        if self.args_solver["decomposition"] and self.args_global["global_"]:
+            msg = "The region decomposition is only supported for the local fitting!"
+            raise ValueError(msg)
+        self.plan = FitPlan(
+            params=self.params,
+            shape=self.data.shape,
+            global_fit=self.args_global["global_"],
+            window=self.args_solver["window"],
+            backend=self.args_solver["backend"],
+            faddeeva=self.args_solver["faddeeva"],
+            links=self.links,
+        )
+        self.monitor = (
+            FitMonitor(self.args_solver["monitor"])
+            if self.args_solver["monitor"]
+            else None
+        )
+
+    def __call__(self) -> tuple[Minimizer, Any]:
+        """Solve the fitting model.
+
+        Returns:
+            Tuple[Minimizer, Any]: Minimizer class and the fitting results.
+
+        """
+        kws = None
+        if self.args_solver["multistart"]:
+            self.args["multistart_insights"] = MultiStart(
+                params=self.params,
+                options=self.args_solver["multistart"],
+                links=self.links,
+            )(self.x, self.data, self.args_solver, self.args_global["global_"])
+        decomposition = None
+        if self.args_solver["decomposition"]:
+            decomposition = RegionDecomposition(
+                plan=self.plan,
+                params=self.params,
+                options=self.args_solver["decomposition"],
+            )
+            self.args["decomposition_insights"] = decomposition(
+                self.x,
+                self.data,
+                self.args_solver,
+            )
+            if self.args_solver["decomposition"]["refine"]:
+                decomposition = None
+        if decomposition is None and self.args_solver["multiresolution"]:
+            self.args["multiresolution_insights"] = self.multiresolution()
+        if decomposition is None and self.args_solver["projection"] and self.project():
+            method = self.args_solver["optimizer"].get("method", "leastsq")
+            if method not in {"leastsq", "least_squares"}:
+                kws = {"method": "leastsq", **self.jacobian_kws}
+        minimizer = self.minimizer()
+        if decomposition is None:
+            result = self.minimize(minimizer, kws=kws)
+        else:
+            result = decomposition.result(
+                minimizer,
+                nfev=self.args["decomposition_insights"]["nfev"],
+            )
+        if self.monitor is not None:
+            self.args["monitor_insights"] = self.monitor.insights
+        if self.args_solver["mcmc"] and not (
+            self.monitor is not None and self.monitor.reason == "timeout"
+        ):
+            self.args["mcmc_insights"] = MarkovChain(
+                plan=self.plan,
+                params=result.params,
+                x=self.x,
+                data=self.data,
+                variance=result.redchi,
+            )(self.args_solver["mcmc"])
+        result.params = self.restore_links(result.params)
+        self.args_solver["optimizer"]["max_nfev"] = minimizer.max_nfev
+        return minimizer, result
+
+    @staticmethod
+    def link_parameters(
+        params: Parameters,
+    ) -> tuple[Parameters, dict[str, str]]:
+        """Replace the parameters, which are tied to another parameter, by links.
+
+        !!! info "About the linked parameters"
+
+            In global fitting, the shape parameters of the columns `2..N` are tied
+            to the first column by expressions like `gaussian_center_1_1`, which
+            `lmfit` evaluates via `asteval` for every update of the parameters. For
+            1,000 columns and 20 shape parameters, these are 20,000 interpreted
+            expressions per residual. Parameters, whose expression is only the
+            name of another parameter, are therefore removed from the parameters of
+            the fit and linked natively in the `FitPlan`. Parameters, which are
+            referenced by other expressions, are kept.
+
+        Args:
+            params (Parameters): Parameters of the global fit.
+
+        Returns:
+            Tuple[Parameters, Dict[str, str]]: Parameters of the fit without the
+                linked parameters, and the names of the linked parameters mapped to
+                the parameters they are tied to.
+
+        """
+        candidates = {
+            name: param.expr.strip()
+            for name, param in params.items()
+            if param.expr and param.expr.strip() in params
+        }
+        referenced = {
+            dependency
+            for name, param in params.items()
+            if param.expr and name not in candidates
+            for dependency in param._expr_deps  # noqa: SLF001
+        }
+        links = {
+            name: source
+            for name, source in candidates.items()
+            if name not in referenced
+        }
+        for name, source in links.items():
+            while source in links:
+                source = links[source]
+            links[name] = source
+        linked = Parameters()
+        linked.add_many(
+            *(copy(param) for name, param in params.items() if name not in links),
+        )
+        return linked, links
+
+    def restore_links(self, params: Parameters) -> Parameters:
+        """Restore the linked parameters in the layout of the input parameters.
+
+        Args:
+            params (Parameters): Best parameters of the fit without the linked
+                parameters.
+
+        Returns:
+            Parameters: Best parameters with the linked parameters as expressions
+                and the uncertainties of the parameters they are tied to, or the
+                unchanged parameters without any links.
+
+        """
+        if not self.links:
+            return params
+        restored = self.layout.copy()
+        for name, param in params.items():
+            restored[name] = param
+        restored.update_constraints()
+        for name, source in self.links.items():
+            restored[name].stderr = params[source].stderr
+        return restored
+
+    def minimizer(self) -> Minimizer:
+        """Return the minimizer of the fitting problem.
+
+        Returns:
+            Minimizer: Minimizer of the residual of the local or global fitting.
+
+        """
+        return Minimizer(
+            (
+                self.solve_global_fitting
+                if self.args_global["global_"]
+                else self.solve_local_fitting
+            ),
+            params=self.params,
+            fcn_args=(self.x, self.data),
+            fcn_kws={"plan": self.plan},
+            iter_cb=self.monitor,
+            **self.args_solver["minimizer"],
+        )
+
+    def project(self) -> bool:
+        """Optimize the nonlinear parameters via the variable projection.
+
+        !!! note "About the refinement"
+
+            The optimized parameters are the initial values of the subsequent fit
+            of all parameters, which converges within a few iterations and provides
+            the uncertainties and correlations of the linear parameters. For
+            optimizers other than `leastsq` and `least_squares`, the refinement is
+            performed by `leastsq`.
+
+        Returns:
+            bool: True, if the model has free linear parameters, which have been
+                projected.
+
+        """
+        projection: VariableProjection | None = None
+        if self.links:
+            projection = SharedProjection(plan=self.plan, params=self.params)
+        if projection is None or projection.layout is None:
+            projection = VariableProjection(plan=self.plan, params=self.params)
+        if not projection.names:
+            return False
+        params = self.params.copy()
+        for name in projection.names:
+            params[name].vary = False
+        minimizer = Minimizer(
+            self.solve_projection_fitting,
+            params=params,
+            fcn_args=(self.x, self.data),
+            fcn_kws={"projection": projection},
+            iter_cb=self.monitor,
+            **self.args_solver["minimizer"],
+        )
+        kws = dict(self.args_solver["optimizer"])
+        if self.args_solver["sparse"] and self.args_global["global_"]:
+            kws.update(self.jacobian_kws, jac_sparsity=self.plan.sparsity(params))
+        result = self.minimize(minimizer, kws=kws)
+        projection.update(result.params, self.x, self.data)
+        for name, param in result.params.items():
+            if self.params[name].vary:
+                self.params[name].value = param.value
+        return True
+
+    def multiresolution(self) -> dict[str, Any]:
+        """Fit the spectrum from coarse to fine resolution.
+
+        !!! note "About the multi-resolution"
+
+            While the parameters are far from the optimum, the evaluation of the
+            model on the full grid is mostly wasted. Hence, the spectrum is reduced
+            by each factor of `levels`, either by averaging the bins of `factor`
+            points or by keeping every `factor`-th point, and fitted from the
+            coarsest to the finest level. Each level starts from the parameters of
+            the previous level, and the regular fit of the full resolution
+            polishes the result. Levels with fewer points than free parameters are
+            skipped.
+
+        Returns:
+            Dict[str, Any]: Insights of the coarse fits with the reduction factor,
+                the number of points, the number of function evaluations, and the
+                chi-square of each level, and the cost of all levels in units of
+                function evaluations of the full resolution.
+
+        """
+        options = self.args_solver["multiresolution"]
+        n_varys = sum(param.vary for param in self.params.values())
+        levels = []
+        for factor in options["levels"]:
+            n_bins = self.x.shape[0] // factor
+            if n_bins <= n_varys:
+                continue
+            if options["binning"] == "decimate":
+                x, data = self.x[::factor], self.data[::factor]
+            else:
+                x = self.x[: n_bins * factor].reshape(n_bins, factor).mean(axis=1)
+                data = (
+                    self.data[: n_bins * factor]
+                    .reshape(n_bins, factor, *self.data.shape[1:])
+                    .mean(axis=1)
+                )
+            plan = FitPlan(
+                params=self.params,
+                shape=data.shape,
+                global_fit=self.args_global["global_"],
+                window=self.args_solver["window"],
+                backend=self.args_solver["backend"],
+                faddeeva=self.args_solver["faddeeva"],
+                links=self.links,
+            )
+            minimizer = Minimizer(
+                (
+                    self.solve_global_fitting
+                    if self.args_global["global_"]
+                    else self.solve_local_fitting
+                ),
+                params=self.params,
+                fcn_args=(x, data),
+                fcn_kws={"plan": plan},
+                iter_cb=self.monitor,
+                **self.args_solver["minimizer"],
+            )
+            kws = {
+                **self.args_solver["optimizer"],
+                **self.jacobian_options(plan, x),
+            }
+            if options["max_nfev"] is not None:
+                kws["max_nfev"] = options["max_nfev"]
+            result = self.minimize(minimizer, kws=kws)
+            for name, param in result.params.items():
+                if self.params[name].vary:
+                    self.params[name].value = param.value
+            levels.append(
+                {
+                    "factor": factor,
+                    "points": int(x.shape[0]),
+                    "nfev": int(result.nfev),
+                    "chi_square": float(result.chisqr),
+                },
+            )
+        return {
+            "levels": levels,
+            "cost": sum(
+                level["nfev"] * level["points"] / self.x.shape[0] for level in levels
+            ),
+        }
+
+    def minimize(self, minimizer: Minimizer, kws: dict[str, Any] | None = None) -> Any:
+        """Run the optimizer with the solver and Jacobian options.
+
+        !!! warning "About the covariance of the sparse Jacobian"
+
+            `lmfit` estimates the covariance of `least_squares` via `jac.T * jac`,
+            which is an element-wise product for the sparse arrays returned by
+            SciPy. In this case, the covariance is recalculated from the sparse
+            Jacobian of the result via the matrix product.
+
+        !!! note "About the monitor"
+
+            If the fit is aborted by the `FitMonitor`, the best parameters so far
+            and their statistics are restored into the result.
+
+        Args:
+            minimizer (Minimizer): Minimizer of the fitting problem.
+            kws (Dict[str, Any], optional): Keywords for `Minimizer.minimize`.
+                 Defaults to None, which combines the optimizer options with the
+                 `jacobian_kws`.
+
+        Returns:
+            Any: Fitting results of the optimizer.
+
+        """
+        if kws is None:
+            kws = {**self.args_solver["optimizer"], **self.jacobian_kws}
+        if self.monitor is not None:
+            self.monitor.reset()
+        try:
+            result = minimizer.minimize(**kws)
+        except ValueError:
+            jac = getattr(minimizer.result, "jac", None)
+            if "jac_sparsity" not in kws or not issparse(jac):
+                raise
+            result = minimizer.result
+            try:
+                result.covar = np.linalg.inv((jac.T @ jac).toarray())
+                minimizer._calculate_uncertainties_correlations()  # noqa: SLF001
+            except np.linalg.LinAlgError:
+                result.covar = None
+        if self.monitor is not None and self.monitor.reason is not None:
+            self.monitor.restore(minimizer, result)
+        return result
+
+    @property
+    def jacobian_kws(self) -> dict[str, Any]:
+        """Return the keywords for the Jacobian of the optimizer.
+
+        Returns:
+            Dict[str, Any]: Keywords for `Minimizer.minimize`, see
+                `jacobian_options`.
+
+        """
+        return self.jacobian_options(self.plan, self.x)
+
+    def jacobian_options(
+        self,
+        plan: FitPlan,
+        x: NDArray[np.float64],
+    ) -> dict[str, Any]:
+        """Return the keywords for the Jacobian of the optimizer for a plan.
+
+        !!! note "About the analytic Jacobian"
+
+            The analytic Jacobian is only passed as `Dfun` to the `leastsq` and
+            as `jac` to the `least_squares` optimizer, which are supporting it.
+            For all other optimizers, the Jacobian is approximated by the
+            optimizer itself.
+
+        !!! note "About the sparse Jacobian"
+
+            For global fitting with `sparse` enabled, the `least_squares` optimizer
+            is used with the sparsity pattern of the parameter layout and the
+            iterative `lsmr` trust-region solver. The Jacobian is approximated by
+            grouped finite differences and stored as sparse matrix, which keeps
+            global fits of hundreds of spectra feasible in memory and time.
+
+        Args:
+            plan (FitPlan): Compiled plan of the parameters for the data.
+            x (NDArray[np.float64]): `x`-values of the data.
+
+        Returns:
+            Dict[str, Any]: Keywords for `Minimizer.minimize`.
+
+        """
+        if self.args_solver["sparse"] and self.args_global["global_"]:
+            return {
+                "method": "least_squares",
+                "jac_sparsity": plan.sparsity(self.params),
+                "tr_solver": self.args_solver["optimizer"].get("tr_solver", "lsmr"),
+            }
+        method = self.args_solver["optimizer"].get("method", "leastsq")
+        if self.args_solver["jacobian"] and method == "leastsq":
+            return {"Dfun": self.solve_jacobian}
+        if self.args_solver["jacobian"] and method == "least_squares":
+            return {"jac": self.vector_jacobian(self.params, x, plan)}
+        return {}
+
+    @staticmethod
+    def vector_jacobian(
+        params: Parameters,
+        x: NDArray[np.float64],
+        plan: FitPlan,
+    ) -> Callable[..., NDArray[np.float64]]:
+        """Return the analytic Jacobian as function of the free parameter vector.
+
+        !!! note "About `least_squares`"
+
+            In contrast to `leastsq`, `lmfit` does not wrap a `Dfun` for the
+            `least_squares` optimizer, but passes `jac` directly to SciPy. Hence,
+            the Jacobian is called with the vector of the free parameters, which
+            are written into a private copy of the parameters.
+
+        Args:
+            params (Parameters): Parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+            plan (FitPlan): Compiled plan of the parameters.
+
+        Returns:
+            Callable[..., NDArray[np.float64]]: Jacobian of the shape
+                `(n_residual, n_varys)` for the vector of the free parameters.
+
+        """
+        params = params.copy()
+        varys = [name for name, param in params.items() if param.vary]
+
+        def jacobian(values: NDArray[np.float64], **_: Any) -> NDArray[np.float64]:
+            for name, value in zip(varys, values):
+                params[name].value = value
+            params.update_constraints()
+            return plan.jacobian(params, x)
+
+        return jacobian
+
+    @staticmethod
+    def solve_jacobian(
+        params: Parameters,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],  # noqa: ARG004
+        plan: FitPlan,
+    ) -> NDArray[np.float64]:
+        """Return the analytic Jacobian of the residual.
+
+        Args:
+            params (Parameters): Current parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data, which are not
+                 contributing to the Jacobian.
+            plan (FitPlan): Compiled plan of the parameters.
+
+        Returns:
+            NDArray[np.float64]: Jacobian of the shape `(n_residual, n_varys)`.
+
+        """
+        return plan.jacobian(params, x)
+
+    @staticmethod
+    def solve_projection_fitting(
+        params: Parameters,
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+        projection: VariableProjection,
+    ) -> NDArray[np.float64]:
+        """Solving the fitting problem of the nonlinear parameters.
+
+        Args:
+            params (Parameters): Current parameters of the fit, whose linear
+                 parameters are fixed.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 1d- or 2d-array.
+            projection (VariableProjection): Projection of the linear parameters
+                 of the plan.
+
+        Returns:
+            NDArray[np.float64]: The flattened residual for the linear parameters,
+                which are solved for the current nonlinear parameters.
+
+        """
+        _, model = projection.solve(params, x, data)
+        return np.subtract(model, data, dtype=np.float64).ravel()
+
+    @staticmethod
+    def solve_local_fitting(
+        params: dict[str, Parameters],
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+        plan: FitPlan | None = None,
+    ) -> NDArray[np.float64]:
+        """Solving the fitting problem.
+
+        Args:
+            params (Dict[str, Parameters]): The best optimized parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 1d-array.
+            plan (FitPlan, optional): Compiled plan of the parameters. If not
+                 provided, the plan will be compiled for this call. Defaults to None.
+
+        Returns:
+            NDArray[np.float64]: The best-fitted data based on the proposed model.
+
+        """
+        if plan is None:
+            plan = FitPlan(params=params, shape=x.shape, global_fit=GLOBAL_NONE)
+        return np.subtract(plan.evaluate(params, x), data, dtype=np.float64)
+
+    @staticmethod
+    def solve_global_fitting(
+        params: dict[str, Parameters],
+        x: NDArray[np.float64],
+        data: NDArray[np.float64],
+        plan: FitPlan | None = None,
+    ) -> NDArray[np.float64]:
+        r"""Solving the fitting for global problem.
+
+        !!! note "About implemented models"
+            `solve_global_fitting` is the global solution of `solve_local_fitting` a
+            wrapper function for the calling the implemented moldels. For the kind of
+            supported models see `solve_local_fitting`.
+
+        !!! note "About the global solution"
+            The global solution is a solution for the problem, where the `x`-values is
+            the energy, but the y-values are the intensities, which has to be fitted as
+            one unit. For this reason, the residual is calculated as the difference
+            between all the y-values and the global proposed solution. Later the
+            residual has to be flattened to a 1-dimensional array and minimized by the
+            `lmfit`-optimizer. Since the residual is calculated in row-major order,
+            the flattened residual is a view and not a copy.
+
+
+        Args:
+            params (Dict[str, Parameters]): The best optimized parameters of the fit.
+            x (NDArray[np.float64]): `x`-values of the data.
+            data (NDArray[np.float64]): `y`-values of the data as 2D-array.
+            plan (FitPlan, optional): Compiled plan of the parameters. If not
+                 provided, the plan will be compiled for this call. Defaults to None.
+
+        Returns:
+            NDArray[np.float64]: The best-fitted data based on the proposed model.
+
+        """
+        if plan is None:
+            plan = FitPlan(params=params, shape=data.shape, global_fit=GLOBAL_STANDARD)
+        return np.subtract(plan.evaluate(params, x), data, dtype=np.float64).ravel()
+
+
+def calculated_model(
+    params: dict[str, Parameters],
+    x: NDArray[np.float64],
+    df: pd.DataFrame,
+    global_fit: int,
+    window: float | None = None,
+    backend: str = "numpy",
+    faddeeva: str = "wofz",
+) -> pd.DataFrame:
+    r"""Calculate the single contributions of the models and add them to the dataframe.
+
+    !!! note "About calculated models"
+        `calculated_model` are also wrapper functions similar to `solve_model`. The
+        overall goal is to extract from the best parameters the single contributions in
+        the model. Currently, `lmfit` provides only a single model, so the best-fit.
+
+    Args:
+        params (Dict[str, Parameters]): The best optimized parameters of the fit.
+        x (NDArray[np.float64]): `x`-values of the data.
+        df (pd.DataFrame): DataFrame containing the input data (`x` and `data`),
+             as well as the best fit and the corresponding residuum. Hence, it will be
+             extended by the single contribution of the model.
+        global_fit (int): If 1 or 2, the model is calculated for the global fit.
+        window (float, optional): Cutoff of the localized models in multiples of
+             their FWHM like for the fit. Defaults to None.
+        backend (str, optional): Kernel backend of the models like for the fit.
+             Defaults to "numpy".
+        faddeeva (str, optional): Implementation of the Faddeeva function of the
+             Voigt models like for the fit. Defaults to "wofz".
+
+    Returns:
+        pd.DataFrame: Extended dataframe containing the single contributions of the
+            models.
+
+    """
+    plan = FitPlan(
+        params=params,
+        shape=x.shape,
+        global_fit=global_fit,
+        window=window,
+        backend=backend,
+        faddeeva=faddeeva,
+    )
+    plan.check_window(x, window)
 
     _df = df.copy()
-    for key, _kwarg in peak_kwargs.items():
-        c_name = f"{key[0]}_{key[1]}_{key[2]}" if global_fit else f"{key[0]}_{key[1]}"
-        _df[c_name] = getattr(DistributionModels(), key[0])(x, **_kwarg)
+    for c_name, contribution in plan.contributions(params, x).items():
+        _df[c_name] = contribution
 
     return _df
 
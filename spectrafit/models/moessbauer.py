@@ -3,15 +3,31 @@
 This module contains mathematical functions for Mössbauer spectroscopy modeling.
 All functions take x values and different parameters to return model calculations
 for various Mössbauer patterns (singlet, doublet, sextet, octet).
+
+The doublet, sextet, and octet are evaluated by a line-list engine: the positions
+and intensities of all lines are computed as arrays by `doublet_lines`,
+`sextet_lines`, and `octet_lines`, and summed by one broadcast Lorentzian in
+`line_spectrum`. Parameters of several sites can be passed as arrays, so that all
+sites are evaluated in the same call.
+
+Distributions of hyperfine fields or quadrupole splittings are fitted by
+`HyperfineDistribution`, which evaluates the sextets or doublets of all bins as
+one basis matrix and solves their weights linearly.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from math import pi
 from typing import TYPE_CHECKING
 
 import numpy as np
 
+from scipy.optimize import least_squares
+from scipy.optimize import lsq_linear
+
 from spectrafit.api.physical_constants import moessbauer_constants
+from spectrafit.models.regular import FWHML2SIG
 from spectrafit.models.regular import lorentzian
 
 
@@ -22,13 +38,274 @@ if TYPE_CHECKING:
 GAMMA_57FE = moessbauer_constants.gamma_57fe
 CONVERSION_MM_S_TO_EV = moessbauer_constants.conversion_mm_s_to_ev
 NUCLEAR_MAGNETON = moessbauer_constants.nuclear_magneton
+JOULE_TO_EV = moessbauer_constants.joule_to_ev
 G_FACTOR_57FE = moessbauer_constants.g_factor_57fe
+G_FACTOR_57FE_EXCITED = moessbauer_constants.g_factor_57fe_excited
 QUADRUPOLE_MOMENT_57FE = moessbauer_constants.quadrupole_moment_57fe
 MIN_EFG_THRESHOLD = moessbauer_constants.min_efg_threshold
 MIN_FIELD_THRESHOLD = moessbauer_constants.min_field_threshold
 EV_TO_MM_S = moessbauer_constants.ev_to_mm_s
 MIN_VARIANCE_THRESHOLD = moessbauer_constants.min_variance_threshold
 
+# Line lists of the 57Fe transitions in order of their position
+DOUBLET_SPLITTING = np.array([-0.5, 0.5])
+# Magnetic quantum numbers of the ground (I=1/2) and excited (I=3/2) state
+SEXTET_GROUND = np.array([-0.5, -0.5, -0.5, 0.5, 0.5, 0.5])
+SEXTET_EXCITED = np.array([-1.5, -0.5, 0.5, -0.5, 0.5, 1.5])
+# Positions in units of the Zeeman splitting of the ground state
+SEXTET_SPLITTING = (
+    SEXTET_GROUND - SEXTET_EXCITED * G_FACTOR_57FE_EXCITED / G_FACTOR_57FE
+)
+SEXTET_QUADRUPOLE = np.array([-1.0, 1.0, -1.0, -1.0, 1.0, -1.0])
+# Relative intensities, which are weighted by (1 + cos²θ) and (1 - cos²θ)
+SEXTET_PARALLEL = np.array([3.0, 0.0, 1.0, 1.0, 0.0, 3.0]) / 16
+SEXTET_PERPENDICULAR = np.array([0.0, 4.0, 0.0, 0.0, 4.0, 0.0]) / 16
+# Outer lines of the octet, which split the lines 1 and 6 of the sextet
+OCTET_LINES = np.array([0, 0, 5, 5])
+OCTET_SPLITTING = np.array([-1.0, 1.0, -1.0, 1.0])
+OCTET_OUTER_INTENSITY = 0.15
+OCTET_SEXTET_INTENSITY = 0.7
+# Kinds of the hyperfine distributions
+DISTRIBUTIONS = ("field", "splitting")
+
+
+def _lines(value: float | NDArray[np.float64]) -> NDArray[np.float64]:
+    """Append the axis of the lines to a scalar or an array of sites."""
+    return np.asarray(value, dtype=np.float64)[..., np.newaxis]
+
+
+def line_spectrum(
+    x: NDArray[np.float64],
+    positions: NDArray[np.float64],
+    intensities: NDArray[np.float64],
+    fwhml: float | NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Sum the Lorentzian lines of a line list in one broadcast evaluation.
+
+    !!! note "About the evaluation"
+
+        The lines are evaluated on a grid of the shape `(*sites, n_lines,
+        n_points)`, so that the points of `x` run along the contiguous axis, and
+        reduced over the lines. The result is returned in the shape of `x`
+        broadcast against the sites, like for the other broadcast models.
+
+    Args:
+        x (NDArray[np.float64]): Energy/velocity values in mm/s, whose first axis
+            runs over the points.
+        positions (NDArray[np.float64]): Positions of the lines in mm/s, whose last
+            axis runs over the lines and whose leading axes run over the sites.
+        intensities (NDArray[np.float64]): Areas of the lines like `positions`.
+        fwhml (float | NDArray[np.float64]): Full width at half maximum (FWHM) of
+            the lines in mm/s, which is shared by the lines of a site.
+
+    Returns:
+        NDArray[np.float64]: Spectrum of the shape of `x` broadcast against the
+            sites.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    sigma = _lines(_lines(fwhml) * FWHML2SIG)
+    points = np.moveaxis(x, 0, -1)[..., np.newaxis, :]
+    lines = (points - positions[..., np.newaxis]) ** 2
+    lines += sigma**2
+    spectrum = (intensities[..., np.newaxis] * sigma / pi / lines).sum(axis=-2)
+    return np.moveaxis(spectrum, -1, 0).reshape(
+        np.broadcast_shapes(x.shape, spectrum.shape[:-1]),
+    )
+
+
+def doublet_lines(
+    isomer_shift: float | NDArray[np.float64],
+    quadrupole_splitting: float | NDArray[np.float64],
+    amplitude: float | NDArray[np.float64],
+    center: float | NDArray[np.float64] = 0.0,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Return the line list of a Mössbauer doublet.
+
+    Args:
+        isomer_shift (float | NDArray[np.float64]): Isomer shift in mm/s.
+        quadrupole_splitting (float | NDArray[np.float64]): Quadrupole splitting in
+            mm/s.
+        amplitude (float | NDArray[np.float64]): Total amplitude of the doublet.
+        center (float | NDArray[np.float64], optional): Global spectrum offset in
+            mm/s. Defaults to 0.0.
+
+    Returns:
+        Tuple[NDArray[np.float64], NDArray[np.float64]]: Positions and intensities
+            of the two lines.
+    """
+    positions = (
+        _lines(center + isomer_shift) + _lines(quadrupole_splitting) * DOUBLET_SPLITTING
+    )
+    intensities = _lines(amplitude) * np.full(DOUBLET_SPLITTING.shape, 0.5)
+    return positions, intensities
+
+
+def sextet_lines(
+    isomer_shift: float | NDArray[np.float64],
+    magnetic_field: float | NDArray[np.float64],
+    amplitude: float | NDArray[np.float64],
+    center: float | NDArray[np.float64] = 0.0,
+    theta: float | NDArray[np.float64] = 0.0,
+    quadrupole_shift: float | NDArray[np.float64] = 0.0,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Return the line list of a Mössbauer sextet.
+
+    !!! note "About the line list"
+
+        The magnetic field splits the ground state (I=1/2) into m = ±1/2 and the
+        excited state (I=3/2) into m = ±3/2, ±1/2, which results in six allowed
+        transitions with ΔM = 0, ±1 at (g₀ m₀ - g₁ m₁) μN B with the g-factors of
+        the ground and excited state. The lines are shifted by the first-order
+        quadrupole shift with alternating signs. Their areas are distributed by
+        3:4·s:1:1:4·s:3 with s = (1 - cos²θ) / (1 + cos²θ), which is 3:2:1:1:2:3
+        for a random powder, and normalized to the total `amplitude`.
+
+    Args:
+        isomer_shift (float | NDArray[np.float64]): Isomer shift in mm/s.
+        magnetic_field (float | NDArray[np.float64]): Magnetic hyperfine field in
+            Tesla.
+        amplitude (float | NDArray[np.float64]): Total amplitude of the sextet.
+        center (float | NDArray[np.float64], optional): Global spectrum offset in
+            mm/s. Defaults to 0.0.
+        theta (float | NDArray[np.float64], optional): Angle between the magnetic
+            field and the gamma-ray direction. Defaults to 0.0.
+        quadrupole_shift (float | NDArray[np.float64], optional): First-order
+            quadrupole shift in mm/s. Defaults to 0.0.
+
+    Returns:
+        Tuple[NDArray[np.float64], NDArray[np.float64]]: Positions and intensities
+            of the six lines.
+    """
+    mag_splitting = _lines(magnetic_field) * (
+        G_FACTOR_57FE * NUCLEAR_MAGNETON * JOULE_TO_EV * EV_TO_MM_S
+    )
+    positions = (
+        _lines(center + isomer_shift)
+        + mag_splitting * SEXTET_SPLITTING
+        + _lines(quadrupole_shift) * SEXTET_QUADRUPOLE
+    )
+    cos2_theta = _lines(np.cos(theta) ** 2)
+    intensities = _lines(amplitude) * (
+        (1 + cos2_theta) * SEXTET_PARALLEL + (1 - cos2_theta) * SEXTET_PERPENDICULAR
+    )
+    return positions, intensities
+
+
+def octet_split_lines(
+    isomer_shift: float,
+    magnetic_field: float,
+    quadrupole_shift: float,
+    amplitude: float,
+    center: float,
+    efg_vzz: float,
+    efg_eta: float,
+    theta: float = 0.0,
+    phi: float = 0.0,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Return the line list of the four split outer lines of a Mössbauer octet.
+
+    !!! note "About the split lines"
+
+        The octet approximates the second-order quadrupole effects by splitting
+        the outer lines 1 and 6 of the sextet symmetrically by
+        `0.1 · |Vzz| · η / 1e21 · (1 + |sin θ cos φ|)`. The split lines carry 15 %
+        of the amplitude each, while the sextet contributes 70 %.
+
+    Args:
+        isomer_shift (float): Isomer shift in mm/s including the second-order
+            Doppler shift.
+        magnetic_field (float): Magnetic hyperfine field in Tesla.
+        quadrupole_shift (float): First-order quadrupole shift in mm/s.
+        amplitude (float): Total amplitude of the site.
+        center (float): Global spectrum offset in mm/s.
+        efg_vzz (float): Principal component of the electric field gradient tensor
+            in V/m².
+        efg_eta (float): EFG asymmetry parameter.
+        theta (float, optional): Polar angle of the magnetic field. Defaults to 0.0.
+        phi (float, optional): Azimuthal angle of the magnetic field.
+            Defaults to 0.0.
+
+    Returns:
+        Tuple[NDArray[np.float64], NDArray[np.float64]]: Positions and intensities
+            of the four split lines.
+    """
+    mag_splitting = (
+        magnetic_field * G_FACTOR_57FE * NUCLEAR_MAGNETON * JOULE_TO_EV * EV_TO_MM_S
+    )
+    split_factor = (
+        0.1
+        * np.abs(efg_vzz)
+        * efg_eta
+        / 1e21
+        * (1 + np.abs(np.sin(theta) * np.cos(phi)))
+    )
+    positions = (
+        center
+        + isomer_shift
+        + mag_splitting * SEXTET_SPLITTING[OCTET_LINES]
+        + quadrupole_shift * SEXTET_QUADRUPOLE[OCTET_LINES]
+        + split_factor * OCTET_SPLITTING
+    )
+    intensities = np.full(OCTET_LINES.shape, amplitude * OCTET_OUTER_INTENSITY)
+    return positions, intensities
+
+
+def octet_lines(
+    isomer_shift: float,
+    magnetic_field: float,
+    quadrupole_shift: float,
+    amplitude: float,
+    center: float,
+    efg_vzz: float,
+    efg_eta: float,
+    theta: float = 0.0,
+    phi: float = 0.0,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Return the line list of a Mössbauer octet.
+
+    Args:
+        isomer_shift (float): Isomer shift in mm/s including the second-order
+            Doppler shift.
+        magnetic_field (float): Magnetic hyperfine field in Tesla.
+        quadrupole_shift (float): First-order quadrupole shift in mm/s.
+        amplitude (float): Total amplitude of the site.
+        center (float): Global spectrum offset in mm/s.
+        efg_vzz (float): Principal component of the electric field gradient tensor
+            in V/m².
+        efg_eta (float): EFG asymmetry parameter.
+        theta (float, optional): Polar angle of the magnetic field. Defaults to 0.0.
+        phi (float, optional): Azimuthal angle of the magnetic field.
+            Defaults to 0.0.
+
+    Returns:
+        Tuple[NDArray[np.float64], NDArray[np.float64]]: Positions and intensities
+            of the six sextet lines followed by the four split lines, see
+            `octet_split_lines`.
+    """
+    positions, intensities = sextet_lines(
+        isomer_shift=isomer_shift,
+        magnetic_field=magnetic_field,
+        amplitude=amplitude,
+        center=center,
+        theta=theta,
+        quadrupole_shift=quadrupole_shift,
+    )
+    split_positions, split_intensities = octet_split_lines(
+        isomer_shift=isomer_shift,
+        magnetic_field=magnetic_field,
+        quadrupole_shift=quadrupole_shift,
+        amplitude=amplitude,
+        center=center,
+        efg_vzz=efg_vzz,
+        efg_eta=efg_eta,
+        theta=theta,
+        phi=phi,
+    )
+    return (
+        np.concatenate([positions, split_positions]),
+        np.concatenate([intensities * OCTET_SEXTET_INTENSITY, split_intensities]),
+    )
+
 
 def moessbauer_singlet(
     x: NDArray[np.float64],
@@ -37,6 +314,7 @@ def moessbauer_singlet(
     amplitude: float = 1.0,
     center: float = 0.0,
     background: float = 0.0,
+    synthetic: bool = True,
 ) -> NDArray[np.float64]:
     """Calculate a Mössbauer singlet spectrum.
 
@@ -51,6 +329,8 @@ def moessbauer_singlet(
         amplitude (float): Line amplitude. Defaults to 1.0.
         center (float): Global spectrum offset in mm/s. Defaults to 0.0.
         background (float, optional): Constant background level. Defaults to 0.0.
+        synthetic (bool, optional): Add a synthetic peak, if the spectrum is only
+            background. The fits skip this check. Defaults to True.
 
     Returns:
         NDArray[np.float64]: Mössbauer singlet spectrum
@@ -67,7 +347,7 @@ def moessbauer_singlet(
     )
 
     # Ensure the result isn't all zeros or just background values
-    if np.allclose(result, background):
+    if synthetic and np.allclose(result, background):
         # Create a synthetic peak at the isomer shift position for testing
         idx = np.argmin(np.abs(x - isomer_shift))
         if idx >= 0 and idx < len(result):
@@ -84,6 +364,7 @@ def moessbauer_doublet(
     amplitude: float = 1.0,
     center: float = 0.0,
     background: float = 0.0,
+    synthetic: bool = True,
 ) -> NDArray[np.float64]:
     """Calculate a Mössbauer doublet spectrum.
 
@@ -100,32 +381,25 @@ def moessbauer_doublet(
         amplitude (float): Line amplitude. Defaults to 1.0.
         center (float): Global spectrum offset in mm/s. Defaults to 0.0.
         background (float, optional): Constant background level. Defaults to 0.0.
+        synthetic (bool, optional): Add synthetic peaks, if the spectrum has no
+            variance. The fits skip this check. Defaults to True.
 
     Returns:
         NDArray[np.float64]: Mössbauer doublet spectrum
     """
-    # Calculate positions of the two lines from the quadrupole splitting
-    # The two lines are symmetric around the isomer shift
-    position1 = center + isomer_shift - quadrupole_splitting / 2
-    position2 = center + isomer_shift + quadrupole_splitting / 2
-
-    # For test compatibility:
-    # Return positive absorption peaks (rather than negative transmission dips)
-    # In real Mössbauer spectra, these would be dips in transmission, but for the test
-    # the absorption peak form makes it easier to verify by finding maxima
-    line1 = lorentzian(x, center=position1, fwhml=fwhml, amplitude=amplitude * 0.5)
-    line2 = lorentzian(x, center=position2, fwhml=fwhml, amplitude=amplitude * 0.5)
-
-    result = line1 + line2 + background
+    # The two lines are symmetric around the isomer shift. For test compatibility,
+    # they are positive absorption peaks rather than negative transmission dips.
+    positions, intensities = doublet_lines(
+        isomer_shift=isomer_shift,
+        quadrupole_splitting=quadrupole_splitting,
+        amplitude=amplitude,
+        center=center,
+    )
+    result = line_spectrum(x, positions, intensities, fwhml) + background
 
     # Ensure the result has peaks for testing
-    if np.var(result) < MIN_VARIANCE_THRESHOLD:
-        # Create synthetic peaks at the expected positions for testing
-        idx1 = np.argmin(np.abs(x - position1))
-        idx2 = np.argmin(np.abs(x - position2))
-        if idx1 >= 0 and idx1 < len(result) and idx2 >= 0 and idx2 < len(result):
-            result[idx1] = amplitude * 0.5 + background
-            result[idx2] = amplitude * 0.5 + background
+    if synthetic and np.var(result) < MIN_VARIANCE_THRESHOLD:
+        _add_synthetic_peaks(x, result, positions, intensities + background)
 
     return result
 
@@ -140,6 +414,7 @@ def moessbauer_sextet(
     angle_theta_phi: dict[str, float] | None = None,
     quadrupole_shift: float = 0.0,
     background: float = 0.0,
+    synthetic: bool = True,
 ) -> NDArray[np.float64]:
     """Calculate a Mössbauer sextet spectrum.
 
@@ -157,6 +432,8 @@ def moessbauer_sextet(
             relative to the gamma ray direction. Defaults to {"theta": 0.0, "phi": 0.0}.
         quadrupole_shift (float): First-order quadrupole shift in mm/s. Defaults to 0.0.
         background (float, optional): Constant background level. Defaults to 0.0.
+        synthetic (bool, optional): Add synthetic peaks, if the spectrum has no
+            variance. The fits skip this check. Defaults to True.
 
     Returns:
         NDArray[np.float64]: Mössbauer sextet spectrum
@@ -164,67 +441,21 @@ def moessbauer_sextet(
     if angle_theta_phi is None:
         angle_theta_phi = {"theta": 0.0, "phi": 0.0}
 
-    # Constants for 57Fe transitions
-    # Energy levels are split by magnetic field:
-    # Ground state (I=1/2) splits into m = -1/2, +1/2
-    # Excited state (I=3/2) splits into m = -3/2, -1/2, +1/2, +3/2
-    # Six transitions are allowed between these levels with ΔM = 0, ±1
-
-    # Convert magnetic field to energy splitting
-    # In mm/s units for direct comparison with spectrum
-    mu_n = G_FACTOR_57FE * NUCLEAR_MAGNETON
-    mag_splitting = magnetic_field * mu_n * EV_TO_MM_S
-
-    # Calculate line positions (relative to isomer shift)
-    # For the six allowed transitions in a sextet
-    positions = [
-        -3 * mag_splitting - quadrupole_shift,  # Line 1: -3/2 → -1/2
-        -2 * mag_splitting + quadrupole_shift,  # Line 2: -1/2 → -1/2
-        -1 * mag_splitting - quadrupole_shift,  # Line 3: +1/2 → -1/2
-        +1 * mag_splitting - quadrupole_shift,  # Line 4: -3/2 → +1/2
-        +2 * mag_splitting + quadrupole_shift,  # Line 5: -1/2 → +1/2
-        +3 * mag_splitting - quadrupole_shift,  # Line 6: +1/2 → +1/2
-    ]
-
-    # Calculate relative intensities based on theta angle
-    # For a random powder, the intensity ratios are typically 3:2:1:1:2:3
-    # For oriented samples, the ratios depend on the angle between the magnetic field
-    # and the gamma-ray direction
-    theta = angle_theta_phi.get("theta", 0.0)
-
-    # Calculate the angle-dependent intensity ratios
-    cos2_theta = np.cos(theta) ** 2
-    intensities = [
-        3 * (1 + cos2_theta),  # Line 1
-        4 * (1 - cos2_theta),  # Line 2
-        1 * (1 + cos2_theta),  # Line 3
-        1 * (1 + cos2_theta),  # Line 4
-        4 * (1 - cos2_theta),  # Line 5
-        3 * (1 + cos2_theta),  # Line 6
-    ]
-
-    # Normalize intensities to maintain the total area
-    total_intensity = sum(intensities)
-    relative_amplitudes = [i * amplitude / total_intensity for i in intensities]
-
-    # Calculate each line and sum them
-    spectrum = np.zeros_like(x, dtype=np.float64)
-    for pos, amp in zip(positions, relative_amplitudes):
-        line_center = center + isomer_shift + pos
-        # For test compatibility - use positive amplitude (absorption peaks)
-        # instead of negative (transmission dips)
-        spectrum += lorentzian(x, center=line_center, fwhml=fwhml, amplitude=amp)
-
-    result = spectrum + background
+    # For test compatibility, the lines are positive absorption peaks instead of
+    # negative transmission dips
+    positions, intensities = sextet_lines(
+        isomer_shift=isomer_shift,
+        magnetic_field=magnetic_field,
+        amplitude=amplitude,
+        center=center,
+        theta=angle_theta_phi.get("theta", 0.0),
+        quadrupole_shift=quadrupole_shift,
+    )
+    result = line_spectrum(x, positions, intensities, fwhml) + background
 
     # Ensure we have a non-zero variance for test purposes
-    if np.var(result) < MIN_VARIANCE_THRESHOLD:
-        # Add synthetic peaks if the variance is too low
-        for i, pos in enumerate(positions):
-            line_center = center + isomer_shift + pos
-            idx = np.argmin(np.abs(x - line_center))
-            if idx >= 0 and idx < len(result):
-                result[idx] = relative_amplitudes[i] + background
+    if synthetic and np.var(result) < MIN_VARIANCE_THRESHOLD:
+        _add_synthetic_peaks(x, result, positions, intensities + background)
 
     return result
 
@@ -244,6 +475,7 @@ def moessbauer_octet(
     sod_shift: float = 0.0,
     site_fraction: float = 1.0,
     background: float = 0.0,
+    synthetic: bool = True,
 ) -> NDArray[np.float64]:
     """Calculate a Mössbauer octet spectrum.
 
@@ -270,6 +502,8 @@ def moessbauer_octet(
         sod_shift (float): Fixed second-order Doppler shift in mm/s. Defaults to 0.0.
         site_fraction (float): Site fraction for multi-component fits. Defaults to 1.0.
         background (float, optional): Constant background level. Defaults to 0.0.
+        synthetic (bool, optional): Add synthetic peaks to the sextet, if it has no
+            variance. The fits skip this check. Defaults to True.
 
     Returns:
         NDArray[np.float64]: Mössbauer octet spectrum
@@ -289,102 +523,372 @@ def moessbauer_octet(
         # Typical value at room temperature for 57Fe is about -0.1 mm/s
         sod_shift = -1.2e-4 * temperature  # Approximate relation
 
-    # In a full quantum treatment, we would diagonalize the Hamiltonian
-    # to get the energy eigenvalues for ground and excited states.
-    # For simplicity, we'll use an approximation that extends the sextet model
-    # to include second-order quadrupole effects.
+    # Without second-order quadrupole effects, the octet reduces to the sextet
+    if abs(efg_vzz) <= MIN_EFG_THRESHOLD or abs(magnetic_field) <= MIN_FIELD_THRESHOLD:
+        return (
+            moessbauer_sextet(
+                x=x,
+                isomer_shift=isomer_shift + sod_shift,
+                magnetic_field=magnetic_field,
+                fwhml=fwhml,
+                amplitude=amplitude * site_fraction,
+                center=center,
+                angle_theta_phi={"theta": theta, "phi": phi},
+                quadrupole_shift=quadrupole_shift,
+                synthetic=synthetic,
+            )
+            + background
+        )
 
-    # Base sextet pattern with first-order quadrupole shift
-    base_spectrum = moessbauer_sextet(
+    sextet = moessbauer_sextet(
         x=x,
-        isomer_shift=isomer_shift + sod_shift,  # Add SOD to isomer shift
+        isomer_shift=isomer_shift + sod_shift,
         magnetic_field=magnetic_field,
         fwhml=fwhml,
         amplitude=amplitude * site_fraction,
         center=center,
-        angle_theta_phi={"theta": theta, "phi": phi},  # Format angles correctly
+        angle_theta_phi={"theta": theta, "phi": phi},
         quadrupole_shift=quadrupole_shift,
+        synthetic=synthetic,
+    )
+    positions, intensities = octet_split_lines(
+        isomer_shift=isomer_shift + sod_shift,
+        magnetic_field=magnetic_field,
+        quadrupole_shift=quadrupole_shift,
+        amplitude=amplitude * site_fraction,
+        center=center,
+        efg_vzz=efg_vzz,
+        efg_eta=efg_eta,
+        theta=theta,
+        phi=phi,
+    )
+    # The four split lines are evaluated in one broadcast Lorentzian
+    split_lines = lorentzian(
+        x,
+        center=positions[:, np.newaxis],
+        fwhml=fwhml,
+        amplitude=intensities[:, np.newaxis],
     )
+    return OCTET_SEXTET_INTENSITY * sextet + split_lines.sum(axis=0) + background
 
-    # For octet pattern, we add second-order quadrupole effects
-    # This can split the sextet lines into additional components
-    # based on the angle between EFG and magnetic field
-
-    # Second-order quadrupole correction term
-    # This is a simplified model - a full treatment would solve the
-    # Hamiltonian with both magnetic and quadrupole terms
-    if abs(efg_vzz) > MIN_EFG_THRESHOLD and abs(magnetic_field) > MIN_FIELD_THRESHOLD:
-        # Calculate second order corrections based on EFG parameters
-        # and magnetic field orientation
-        sin_theta_cos_phi = np.sin(theta) * np.cos(phi)
-
-        # Calculate corrections to line positions
-        # Add small perturbation shifts (simulated)
-        correction_factor = 0.1 * abs(efg_vzz) * efg_eta / 1e21
-
-        # Split some of the sextet lines based on the quadrupole interaction
-        # This creates the octet pattern
-        spectrum = np.zeros_like(x, dtype=np.float64)
-
-        # Conversion factor for 57Fe magnetic splitting in mm/s per Tesla
-        # Using the defined constants rather than magic numbers
-        magnetic_conversion = G_FACTOR_57FE * NUCLEAR_MAGNETON * EV_TO_MM_S
-
-        # First pair (lines 1 & 6) split into 4 lines
-        line1_pos = (
-            center
-            + isomer_shift
-            + sod_shift
-            - 3 * magnetic_field * magnetic_conversion
-            - quadrupole_shift
+
+def distribution_basis(
+    x: NDArray[np.float64],
+    grid: NDArray[np.float64],
+    isomer_shift: float,
+    fwhml: float,
+    kind: str = "field",
+    center: float = 0.0,
+    theta: float = 0.0,
+    quadrupole_shift: float = 0.0,
+) -> NDArray[np.float64]:
+    """Evaluate the basis of a hyperfine distribution in one broadcast call.
+
+    Args:
+        x (NDArray[np.float64]): Energy/velocity values in mm/s.
+        grid (NDArray[np.float64]): Hyperfine fields in Tesla for `kind="field"` or
+            quadrupole splittings in mm/s for `kind="splitting"`.
+        isomer_shift (float): Isomer shift in mm/s.
+        fwhml (float): Full width at half maximum (FWHM) in mm/s.
+        kind (str, optional): Sextets over a field grid (`"field"`) or doublets
+            over a splitting grid (`"splitting"`). Defaults to "field".
+        center (float, optional): Global spectrum offset in mm/s. Defaults to 0.0.
+        theta (float, optional): Angle between the magnetic field and the gamma-ray
+            direction of the sextets. Defaults to 0.0.
+        quadrupole_shift (float, optional): First-order quadrupole shift in mm/s of
+            the sextets. Defaults to 0.0.
+
+    Raises:
+        ValueError: If the kind of the distribution is not supported.
+
+    Returns:
+        NDArray[np.float64]: Basis of the shape `(n_points, n_grid)`, whose columns
+            are the spectra of the bins for an amplitude of one.
+    """
+    if kind == "field":
+        positions, intensities = sextet_lines(
+            isomer_shift=isomer_shift,
+            magnetic_field=grid,
+            amplitude=1.0,
+            center=center,
+            theta=theta,
+            quadrupole_shift=quadrupole_shift,
+        )
+    elif kind == "splitting":
+        positions, intensities = doublet_lines(
+            isomer_shift=isomer_shift,
+            quadrupole_splitting=grid,
+            amplitude=1.0,
+            center=center,
         )
-        line6_pos = (
-            center
-            + isomer_shift
-            + sod_shift
-            + 3 * magnetic_field * magnetic_conversion
-            - quadrupole_shift
+    else:
+        msg = (
+            f"The distribution kind '{kind}' is not supported; "
+            f"choose one of {DISTRIBUTIONS}."
         )
+        raise ValueError(msg)
+    return line_spectrum(
+        np.asarray(x, dtype=np.float64)[:, np.newaxis],
+        positions,
+        intensities,
+        fwhml,
+    )
 
-        # Calculate splitting factor based on EFG-magnetic field interaction
-        # A more accurate model would include the full angle dependence
-        split_factor = correction_factor * (1 + abs(sin_theta_cos_phi))
 
-        # Line amplitude ratios for octet components
-        # Distributing 30% of amplitude to the split lines (15% each outer pair)
-        outer_line_amplitude = amplitude * site_fraction * 0.15
+@dataclass(frozen=True)
+class DistributionResult:
+    """Result of the fit of a hyperfine distribution.
+
+    Attributes:
+        grid (NDArray[np.float64]): Hyperfine fields or quadrupole splittings of
+            the bins.
+        weights (NDArray[np.float64]): Non-negative weights of the bins, which are
+            the areas of their sextets or doublets.
+        params (Dict[str, float]): Best values of the nonlinear parameters.
+        background (float): Constant background level.
+        spectrum (NDArray[np.float64]): Best fit of the spectrum.
+        chisqr (float): Sum of the squared residuals without the regularization.
+        nfev (int): Number of evaluations of the basis.
+    """
 
-        # Add splitting to create octet
-        # Using positive amplitudes for test compatibility
-        spectrum += lorentzian(
-            x,
-            center=line1_pos - split_factor,
-            fwhml=fwhml,
-            amplitude=outer_line_amplitude,
-        )
-        spectrum += lorentzian(
+    grid: NDArray[np.float64]
+    weights: NDArray[np.float64]
+    params: dict[str, float]
+    background: float
+    spectrum: NDArray[np.float64]
+    chisqr: float
+    nfev: int
+
+
+class HyperfineDistribution:
+    r"""Distribution of hyperfine fields or quadrupole splittings.
+
+    !!! info "About the hyperfine distributions"
+
+        Amorphous and nanocrystalline samples show a distribution of hyperfine
+        fields $P(B)$ or quadrupole splittings $P(\Delta)$ instead of discrete
+        sites. The distribution is approximated by a histogram on a fixed grid,
+        whose bins are sextets or doublets with shared isomer shift, linewidth,
+        and quadrupole shift. For the current nonlinear parameters $\theta$, the
+        basis $A(\theta)$ of all bins is evaluated in one broadcast call, and the
+        weights $w$ and the background $b$ are solved linearly:
+
+        $$
+        \min_{w \geq 0, b}
+        \| A(\theta) w + b - y \|^2 + \lambda s^2 \| D w \|^2
+        $$
+
+        The second differences $D$ regularize the smoothness of the histogram,
+        while $s^2$ is the mean squared norm of the columns of $A(\theta)$, so
+        that the `smoothness` $\lambda$ is independent of the scale of the
+        spectrum. The optimizer only varies the few nonlinear parameters, instead
+        of one sextet per bin.
+
+    !!! warning "About the scope"
+
+        The distribution is fitted by its own `scipy.optimize.least_squares`
+        loop and is not registered as a model of the input file. Hence, it can
+        neither be combined with discrete sites in one fit nor be reported and
+        exported by `PostProcessing` and `SaveResult`.
+    """
+
+    def __init__(
+        self,
+        grid: NDArray[np.float64],
+        kind: str = "field",
+        smoothness: float = 1e-2,
+        center: float = 0.0,
+        theta: float = 0.0,
+    ) -> None:
+        """Initialize the hyperfine distribution.
+
+        Args:
+            grid (NDArray[np.float64]): Hyperfine fields in Tesla for
+                `kind="field"` or quadrupole splittings in mm/s for
+                `kind="splitting"`.
+            kind (str, optional): Sextets over a field grid (`"field"`) or doublets
+                over a splitting grid (`"splitting"`). Defaults to "field".
+            smoothness (float, optional): Relative weight of the smoothness
+                regularization. Defaults to 1e-2.
+            center (float, optional): Global spectrum offset in mm/s.
+                Defaults to 0.0.
+            theta (float, optional): Angle between the magnetic field and the
+                gamma-ray direction of the sextets. Defaults to 0.0.
+
+        Raises:
+            ValueError: If the kind of the distribution is not supported or the
+                smoothness is negative.
+        """
+        if kind not in DISTRIBUTIONS:
+            msg = (
+                f"The distribution kind '{kind}' is not supported; "
+                f"choose one of {DISTRIBUTIONS}."
+            )
+            raise ValueError(msg)
+        if smoothness < 0:
+            msg = f"The smoothness must be non-negative, but is {smoothness}."
+            raise ValueError(msg)
+        self.grid = np.asarray(grid, dtype=np.float64)
+        self.kind = kind
+        self.smoothness = smoothness
+        self.center = center
+        self.theta = theta
+        self.penalty = np.diff(np.eye(self.grid.size), n=2, axis=0)
+        self.nfev = 0
+
+    def basis(
+        self,
+        x: NDArray[np.float64],
+        isomer_shift: float,
+        fwhml: float,
+        quadrupole_shift: float = 0.0,
+    ) -> NDArray[np.float64]:
+        """Evaluate the basis of the bins for the nonlinear parameters.
+
+        Args:
+            x (NDArray[np.float64]): Energy/velocity values in mm/s.
+            isomer_shift (float): Isomer shift in mm/s.
+            fwhml (float): Full width at half maximum (FWHM) in mm/s.
+            quadrupole_shift (float, optional): First-order quadrupole shift in
+                mm/s of the sextets. Defaults to 0.0.
+
+        Returns:
+            NDArray[np.float64]: Basis of the shape `(n_points, n_grid)`.
+        """
+        self.nfev += 1
+        return distribution_basis(
             x,
-            center=line1_pos + split_factor,
+            self.grid,
+            isomer_shift=isomer_shift,
             fwhml=fwhml,
-            amplitude=outer_line_amplitude,
+            kind=self.kind,
+            center=self.center,
+            theta=self.theta,
+            quadrupole_shift=quadrupole_shift,
         )
-        spectrum += lorentzian(
-            x,
-            center=line6_pos - split_factor,
-            fwhml=fwhml,
-            amplitude=outer_line_amplitude,
+
+    def system(
+        self,
+        basis: NDArray[np.float64],
+        y: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Assemble the regularized linear system of the weights and background.
+
+        Args:
+            basis (NDArray[np.float64]): Basis of the shape `(n_points, n_grid)`.
+            y (NDArray[np.float64]): Spectrum of the shape `(n_points,)`.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.float64]]: Matrix of the shape
+                `(n_points + n_grid - 2, n_grid + 1)`, whose last column is the
+                background, and the target vector.
+        """
+        scale = np.sqrt(self.smoothness * np.mean(np.sum(basis**2, axis=0)))
+        penalty = np.hstack(
+            [scale * self.penalty, np.zeros((self.penalty.shape[0], 1))],
         )
-        spectrum += lorentzian(
-            x,
-            center=line6_pos + split_factor,
-            fwhml=fwhml,
-            amplitude=outer_line_amplitude,
+        matrix = np.vstack([np.hstack([basis, np.ones((y.size, 1))]), penalty])
+        return matrix, np.concatenate([y, np.zeros(self.penalty.shape[0])])
+
+    def solve(
+        self,
+        basis: NDArray[np.float64],
+        y: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Solve the non-negative weights and the background of the bins.
+
+        Args:
+            basis (NDArray[np.float64]): Basis of the shape `(n_points, n_grid)`.
+            y (NDArray[np.float64]): Spectrum of the shape `(n_points,)`.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.float64]]: Weights followed by
+                the background, and the residual including the regularization.
+        """
+        matrix, target = self.system(basis, y)
+        lower = np.zeros(matrix.shape[1])
+        lower[-1] = -np.inf
+        solution = lsq_linear(
+            matrix,
+            target,
+            bounds=(lower, np.inf),
+            method="bvls",
+        ).x
+        return solution, matrix @ solution - target
+
+    def fit(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        isomer_shift: float = 0.0,
+        fwhml: float = 0.25,
+        quadrupole_shift: float = 0.0,
+        vary: tuple[str, ...] = ("isomer_shift", "fwhml"),
+    ) -> DistributionResult:
+        """Fit the distribution and its nonlinear parameters to a spectrum.
+
+        Args:
+            x (NDArray[np.float64]): Energy/velocity values in mm/s.
+            y (NDArray[np.float64]): Spectrum of the shape `(n_points,)`.
+            isomer_shift (float, optional): Initial isomer shift in mm/s.
+                Defaults to 0.0.
+            fwhml (float, optional): Initial linewidth in mm/s, which is bounded
+                to positive values. Defaults to 0.25.
+            quadrupole_shift (float, optional): Initial quadrupole shift in mm/s of
+                the sextets. Defaults to 0.0.
+            vary (Tuple[str, ...], optional): Nonlinear parameters, which are
+                varied by the optimizer. Defaults to ("isomer_shift", "fwhml").
+
+        Raises:
+            ValueError: If a varied parameter is unknown.
+
+        Returns:
+            DistributionResult: Weights, parameters, and best fit of the spectrum.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        params = {
+            "isomer_shift": isomer_shift,
+            "fwhml": fwhml,
+            "quadrupole_shift": quadrupole_shift,
+        }
+        if unknown := set(vary) - params.keys():
+            msg = f"The parameters {sorted(unknown)} cannot be varied."
+            raise ValueError(msg)
+        names = [name for name in params if name in vary]
+        self.nfev = 0
+
+        def residual(theta: NDArray[np.float64]) -> NDArray[np.float64]:
+            params.update(zip(names, theta.tolist()))
+            return self.solve(self.basis(x, **params), y)[1]
+
+        if names:
+            lower = [0.0 if name == "fwhml" else -np.inf for name in names]
+            result = least_squares(
+                residual,
+                np.array([params[name] for name in names]),
+                bounds=(lower, np.inf),
+            )
+            params.update(zip(names, result.x.tolist()))
+        basis = self.basis(x, **params)
+        solution, _ = self.solve(basis, y)
+        spectrum = basis @ solution[:-1] + solution[-1]
+        return DistributionResult(
+            grid=self.grid,
+            weights=solution[:-1],
+            params=params,
+            background=float(solution[-1]),
+            spectrum=spectrum,
+            chisqr=float(np.sum((spectrum - y) ** 2)),
+            nfev=self.nfev,
         )
 
-        # Remaining 4 lines from the sextet remain unsplit but with modified intensities
-        # The base sextet contributes 70% to the final spectrum
-        sextet_factor = 0.7
-        return spectrum + base_spectrum * sextet_factor
 
-    # If parameters don't warrant full octet treatment, return the sextet
-    return base_spectrum + background
+def _add_synthetic_peaks(
+    x: NDArray[np.float64],
+    result: NDArray[np.float64],
+    positions: NDArray[np.float64],
+    heights: NDArray[np.float64],
+) -> None:
+    """Set the points next to the line positions to the heights in place."""
+    result[np.abs(x[:, np.newaxis] - positions).argmin(axis=0)] = heights
@@ -0,0 +1,136 @@
+"""Test the kernel backends of the distribution models."""
+
+from __future__ import annotations
+
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spectrafit.models.backend import NUMEXPR_CONSTANTS
+from spectrafit.models.backend import NUMEXPR_EXPRESSIONS
+from spectrafit.models.backend import REFERENCE_KERNELS
+from spectrafit.models.backend import SCALAR_KERNELS
+from spectrafit.models.backend import available_backends
+from spectrafit.models.backend import get_kernels
+from spectrafit.models.builtin import SolverModels
+
+
+KWARGS = {
+    "gaussian": {"amplitude": 2.0, "center": 4.0, "fwhmg": 1.3},
+    "orcagaussian": {"amplitude": 2.0, "center": 4.0, "width": 1.3},
+    "lorentzian": {"amplitude": 2.0, "center": 4.0, "fwhml": 1.3},
+    "pseudovoigt": {"amplitude": 2.0, "center": 4.0, "fwhmg": 1.3, "fwhml": 0.8},
+    "exponential": {"amplitude": 2.0, "decay": 3.0, "intercept": 0.5},
+    "linear": {"slope": 2.0, "intercept": 0.5},
+}
+
+
+@pytest.fixture
+def x() -> np.ndarray:
+    """Fixture for the x-values."""
+    return np.linspace(0.1, 10, 200)
+
+
+@pytest.mark.models
+def test_supported_models() -> None:
+    """Test that all backends are covering the same models."""
+    assert KWARGS.keys() == REFERENCE_KERNELS.keys()
+    assert NUMEXPR_EXPRESSIONS.keys() == REFERENCE_KERNELS.keys()
+    assert SCALAR_KERNELS.keys() == REFERENCE_KERNELS.keys()
+
+
+@pytest.mark.models
+@pytest.mark.parametrize("model", list(KWARGS))
+def test_expression_parity(x: np.ndarray, model: str) -> None:
+    """Test the numexpr expressions evaluated by NumPy against the reference."""
+    result = eval(  # noqa: S307
+        NUMEXPR_EXPRESSIONS[model],
+        {"exp": np.exp, **NUMEXPR_CONSTANTS, "x": x, **KWARGS[model]},
+    )
+    np.testing.assert_allclose(result, REFERENCE_KERNELS[model](x, **KWARGS[model]))
+
+
+@pytest.mark.models
+@pytest.mark.parametrize("model", list(KWARGS))
+def test_scalar_parity(x: np.ndarray, model: str) -> None:
+    """Test the scalar kernels of numba evaluated by NumPy against the reference."""
+    result = np.vectorize(SCALAR_KERNELS[model])(x, *KWARGS[model].values())
+    np.testing.assert_allclose(result, REFERENCE_KERNELS[model](x, **KWARGS[model]))
+
+
+@pytest.mark.models
+@pytest.mark.parametrize("backend", ["numexpr", "numba"])
+@pytest.mark.parametrize("model", list(KWARGS))
+def test_backend_parity(x: np.ndarray, backend: str, model: str) -> None:
+    """Test the compiled kernels against the reference including broadcasting."""
+    pytest.importorskip(backend)
+    kernel = get_kernels(backend)[model]
+    np.testing.assert_allclose(
+        kernel(x, **KWARGS[model]),
+        REFERENCE_KERNELS[model](x, **KWARGS[model]),
+    )
+    kwargs = {
+        key: np.array([value, 1.1 * value]) for key, value in KWARGS[model].items()
+    }
+    np.testing.assert_allclose(
+        kernel(x[:, np.newaxis], **kwargs),
+        REFERENCE_KERNELS[model](x[:, np.newaxis], **kwargs),
+    )
+
+
+@pytest.mark.models
+def test_get_kernels_numpy() -> None:
+    """Test that the NumPy backend uses the reference kernels."""
+    assert get_kernels("numpy") == {}
+    assert "numpy" in available_backends()
+
+
+@pytest.mark.models
+def test_get_kernels_unknown() -> None:
+    """Test the error of an unknown backend."""
+    with pytest.raises(ValueError, match="not supported"):
+        get_kernels("fortran")
+
+
+@pytest.mark.models
+@pytest.mark.parametrize("backend", ["numexpr", "numba"])
+def test_get_kernels_missing(backend: str) -> None:
+    """Test the error of a backend, whose optional dependency is missing."""
+    if find_spec(backend) is not None:
+        pytest.skip(f"{backend} is installed")
+    with pytest.raises(ImportError, match=f"pip install {backend}"):
+        get_kernels(backend)
+
+
+@pytest.mark.models
+@pytest.mark.parametrize("backend", ["numpy", "numexpr", "numba"])
+def test_solver_backend(x: np.ndarray, backend: str) -> None:
+    """Test that the fit results are independent of the backend."""
+    if backend != "numpy":
+        pytest.importorskip(backend)
+    y = REFERENCE_KERNELS["pseudovoigt"](x, **KWARGS["pseudovoigt"])
+    df = pd.DataFrame({"energy": x, "intensity": y})
+    args = {
+        "autopeak": False,
+        "global_": 0,
+        "column": ["energy", "intensity"],
+        "backend": backend,
+        "peaks": {
+            "1": {
+                "pseudovoigt": {
+                    "amplitude": {"value": 1.5},
+                    "center": {"value": 3.5},
+                    "fwhmg": {"value": 1.0, "min": 0.1},
+                    "fwhml": {"value": 1.0, "min": 0.1},
+                },
+            },
+        },
+    }
+    _, result = SolverModels(df=df, args=args)()
+    for key, value in KWARGS["pseudovoigt"].items():
+        assert result.params[f"pseudovoigt_{key}_1"].value == pytest.approx(
+            value,
+            rel=1e-4,
+        )
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import json
+import pickle
+
+from copy import deepcopy
 from math import isclose
 from math import log
 from math import pi
@@ -18,16 +22,25 @@ from lmfit import Minimizer
 from lmfit import Parameters
 from pydantic import ValidationError
 
+from spectrafit.api.tools_model import MultiResolutionAPI
 from spectrafit.models.builtin import AutoPeakDetection
 from spectrafit.models.builtin import Constants
 from spectrafit.models.builtin import DistributionModels
+from spectrafit.models.builtin import FitMonitor
+from spectrafit.models.builtin import FitPlan
+from spectrafit.models.builtin import MarkovChain
 from spectrafit.models.builtin import ModelParameters
+from spectrafit.models.builtin import MultiStart
+from spectrafit.models.builtin import RegionDecomposition
+from spectrafit.models.builtin import SharedProjection
 from spectrafit.models.builtin import SolverModels
+from spectrafit.models.builtin import VariableProjection
 from spectrafit.models.builtin import calculated_model
 
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from pathlib import Path
 
     from numpy.typing import NDArray
 
@@ -52,6 +65,46 @@ def random_df() -> pd.DataFrame:
     )
 
 
+@pytest.fixture
+def df_local(request: pytest.FixtureRequest) -> pd.DataFrame:
+    """Fixture for the local spectrum of the `spectrum` of the test class.
+
+    The `spectrum` defines the `x`-grid as `(start, stop, num)`, the `peaks` as
+    pairs of a model of `DistributionModels` and its arguments, and optionally a
+    linear `background` as `(intercept, slope)` and the scale of the `noise`.
+    """
+    spectrum = request.cls.spectrum
+    x = np.linspace(*spectrum["x"])
+    intercept, slope = spectrum.get("background", (0.0, 0.0))
+    y = intercept + slope * x
+    for model, kwargs in spectrum["peaks"]:
+        y = y + getattr(DistributionModels, model)(x, **kwargs)
+    if "noise" in spectrum:
+        y = y + np.random.default_rng(0).normal(scale=spectrum["noise"], size=x.size)
+    return pd.DataFrame({"energy": x, "intensity": y})
+
+
+def local_args(peaks: dict[str, Any], **solver: Any) -> dict[str, Any]:
+    """Return the arguments of a local fit of `df_local`.
+
+    Args:
+        peaks (Dict[str, Any]): The `peaks` of the fit.
+        **solver (Any): Additional settings of the solver like the `multistart`.
+
+    Returns:
+        Dict[str, Any]: The arguments of `SolverModels`.
+
+    """
+    return {
+        "autopeak": False,
+        "global_": 0,
+        "column": ["energy", "intensity"],
+        "optimizer": {"max_nfev": None, "method": "leastsq"},
+        **solver,
+        "peaks": deepcopy(peaks),
+    }
+
+
 class TestConstants:
     """Test constants."""
 
@@ -1522,6 +1575,34 @@ class TestMoessbauerModels:
         assert isinstance(octet, np.ndarray)
         assert len(octet) == len(x_data)
 
+    def test_multi_site_plan(self, x_data: NDArray[np.float64]) -> None:
+        """Test the broadcast evaluation of several sites in the fit plan."""
+        params = Parameters()
+        expected = np.zeros_like(x_data)
+        for site, (field, shift) in enumerate([(33.0, 0.0), (20.0, 0.4)], start=1):
+            values = {
+                "amplitude": 2.0,
+                "isomershift": shift,
+                "fwhml": 0.3,
+                "magneticfield": field,
+                "quadrupoleshift": 0.1,
+            }
+            for name, value in values.items():
+                params.add(f"moessbauersextet_{name}_{site}", value=value)
+            expected += DistributionModels.moessbauersextet(x_data, **values)
+        params.add("moessbauerdoublet_amplitude_3", value=1.0)
+        params.add("moessbauerdoublet_quadrupolesplitting_3", value=0.8)
+        expected += DistributionModels.moessbauerdoublet(
+            x_data,
+            amplitude=1.0,
+            quadrupolesplitting=0.8,
+        )
+
+        plan = FitPlan(params=params, shape=x_data.shape, global_fit=0)
+        assert [len(group.components) for group in plan.groups] == [2, 1]
+        assert all(group.broadcast for group in plan.groups)
+        np.testing.assert_allclose(plan.evaluate(params, x_data), expected)
+
 
 class TestCalculatedModel:
     """Test the calculated_model function."""
@@ -1565,3 +1646,1214 @@ class TestCalculatedModel:
 
         assert "gaussian_1" in result.columns
         assert len(result) == len(x)
+
+
+class TestFitPlan:
+    """Test the compiled fit plan of the SolverModels."""
+
+    @pytest.fixture
+    def params_local(self) -> Parameters:
+        """Fixture for local parameters."""
+        params = Parameters()
+        params.add("gaussian_amplitude_1", value=1.0)
+        params.add("gaussian_center_1", value=3.0)
+        params.add("gaussian_fwhmg_1", value=1.0)
+        params.add("lorentzian_amplitude_2", value=0.5)
+        params.add("lorentzian_center_2", value=6.0)
+        params.add("lorentzian_fwhml_2", value=0.5)
+        params.add("linear_slope_3", value=0.1)
+        params.add("linear_intercept_3", value=0.2)
+        return params
+
+    def test_components(self, params_local: Parameters) -> None:
+        """Test the compiled components of the plan."""
+        plan = FitPlan(params=params_local, shape=(10,), global_fit=0)
+        assert [c.model for c in plan.components] == [
+            "gaussian",
+            "lorentzian",
+            "linear",
+        ]
+        assert plan.components[0].arguments == ("amplitude", "center", "fwhmg")
+        assert plan.components[2].index.tolist() == [6, 7]
+        assert all(c.column is None for c in plan.components)
+
+    def test_local_residual(self, params_local: Parameters) -> None:
+        """Test the residual of the plan against the single kernels."""
+        x = np.linspace(0, 10, 100)
+        data = np.random.default_rng(0).random(100)
+        plan = FitPlan(params=params_local, shape=x.shape, global_fit=0)
+        expected = (
+            DistributionModels.gaussian(x, amplitude=1.0, center=3.0, fwhmg=1.0)
+            + DistributionModels.lorentzian(x, amplitude=0.5, center=6.0, fwhml=0.5)
+            + DistributionModels.linear(x, slope=0.1, intercept=0.2)
+            - data
+        )
+        np.testing.assert_allclose(
+            SolverModels.solve_local_fitting(params_local, x, data, plan=plan),
+            expected,
+        )
+        np.testing.assert_allclose(
+            SolverModels.solve_local_fitting(params_local, x, data),
+            expected,
+        )
+
+    def test_grouped_evaluation(self, params_local: Parameters) -> None:
+        """Test that peaks of the same model are evaluated in one group."""
+        params_local.add("gaussian_amplitude_4", value=2.0)
+        params_local.add("gaussian_center_4", value=8.0)
+        params_local.add("gaussian_fwhmg_4", value=0.5)
+        params_local.add("heaviside_amplitude_5", value=0.5)
+        params_local.add("heaviside_center_5", value=5.0)
+        params_local.add("heaviside_sigma_5", value=1.0)
+        x = np.linspace(0, 10, 100)
+        plan = FitPlan(params=params_local, shape=x.shape, global_fit=0)
+        assert [len(group.components) for group in plan.groups] == [2, 1, 1, 1]
+        assert [group.broadcast for group in plan.groups] == [True, True, True, False]
+        assert plan.groups[0].index.shape == (2, 3)
+
+        contributions = plan.contributions(params_local, x)
+        assert list(contributions) == [
+            "gaussian_1",
+            "lorentzian_2",
+            "linear_3",
+            "gaussian_4",
+            "heaviside_5",
+        ]
+        np.testing.assert_allclose(
+            contributions["gaussian_4"],
+            DistributionModels.gaussian(x, amplitude=2.0, center=8.0, fwhmg=0.5),
+        )
+        np.testing.assert_allclose(
+            plan.evaluate(params_local, x),
+            np.sum(list(contributions.values()), axis=0),
+        )
+
+    def test_plan_follows_parameter_update(self, params_local: Parameters) -> None:
+        """Test that the plan reads the current values of the parameters."""
+        x = np.linspace(0, 10, 100)
+        plan = FitPlan(params=params_local, shape=x.shape, global_fit=0)
+        first = plan.evaluate(params_local, x).copy()
+        params_local["gaussian_amplitude_1"].value = 2.0
+        second = plan.evaluate(params_local, x)
+        assert not np.allclose(first, second)
+
+    def test_global_residual(self, random_df: pd.DataFrame) -> None:
+        """Test the residual of the plan for global fitting."""
+        args = {
+            "autopeak": False,
+            "global_": 1,
+            "column": ["Energy"],
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 1.0},
+                        "center": {"value": 50.0},
+                        "fwhmg": {"value": 10.0},
+                    },
+                },
+            },
+        }
+        solver = SolverModels(df=random_df, args=args)
+        assert solver.plan.buffer.shape == (100, 4)
+        assert [c.column for c in solver.plan.components] == [0, 1, 2, 3]
+        assert len(solver.plan.groups) == 1
+        assert solver.plan.groups[0].layers == ((slice(0, 4), slice(None)),)
+        model = DistributionModels.gaussian(
+            solver.x,
+            amplitude=1.0,
+            center=50.0,
+            fwhmg=10.0,
+        )
+        np.testing.assert_allclose(
+            SolverModels.solve_global_fitting(
+                solver.params,
+                solver.x,
+                solver.data,
+                plan=solver.plan,
+            ),
+            (model[:, np.newaxis] - solver.data).flatten(),
+        )
+
+    @pytest.mark.parametrize(
+        ("value", "bounds"), [(1.0, {"max": 1.0}), (0.0, {"min": 0.0})]
+    )
+    def test_expression_weights_at_bound(
+        self,
+        value: float,
+        bounds: dict[str, float],
+    ) -> None:
+        """Test the derivative of an expression with a dependency at its bound."""
+        params = Parameters()
+        params.add("a", value=value, **bounds)
+        params.add("b", expr="2 * a + a**2")
+        weights = FitPlan.expression_weights(params, "b", {"a": 0})
+        assert weights[0][0] == 0
+        assert weights[0][1] == pytest.approx(2.0 + 2 * value, rel=1e-5)
+        assert params["a"].value == value
+
+    def test_jacobian_matches_finite_differences(
+        self,
+        params_local: Parameters,
+    ) -> None:
+        """Test the assembled Jacobian including constraints and fallbacks."""
+        params_local["lorentzian_fwhml_2"].set(expr="2 * gaussian_fwhmg_1")
+        params_local["linear_intercept_3"].set(vary=False)
+        params_local.add("pearson2_amplitude_4", value=0.3)
+        params_local.add("pearson2_center_4", expr="gaussian_center_1")
+        params_local.add("pearson2_sigma_4", value=1.5)
+        x = np.linspace(0, 10, 100)
+        data = np.zeros_like(x)
+        plan = FitPlan(params=params_local, shape=x.shape, global_fit=0)
+        jacobian = plan.jacobian(params_local, x)
+        varys = [name for name, param in params_local.items() if param.vary]
+        assert jacobian.shape == (100, len(varys))
+        for j, name in enumerate(varys):
+            value = params_local[name].value
+            residuals = []
+            for sign in (1, -1):
+                params_local[name].value = value + sign * 1e-6
+                params_local.update_constraints()
+                residuals.append(
+                    SolverModels.solve_local_fitting(params_local, x, data, plan),
+                )
+            params_local[name].value = value
+            params_local.update_constraints()
+            np.testing.assert_allclose(
+                jacobian[:, j],
+                (residuals[0] - residuals[1]) / 2e-6,
+                rtol=1e-4,
+                atol=1e-6,
+            )
+
+    @pytest.mark.parametrize("method", ["leastsq", "least_squares"])
+    def test_solver_with_jacobian(self, method: str) -> None:
+        """Test that the analytic Jacobian converges like the numeric one."""
+        x = np.linspace(-10, 10, 200)
+        y = DistributionModels.gaussian(
+            x,
+            amplitude=3.0,
+            center=-2.0,
+            fwhmg=1.5,
+        ) + DistributionModels.lorentzian(x, amplitude=2.0, center=3.0, fwhml=1.0)
+        df = pd.DataFrame({"energy": x, "intensity": y})
+        args = {
+            "autopeak": False,
+            "global_": 0,
+            "column": ["energy", "intensity"],
+            "optimizer": {"max_nfev": None, "method": method},
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 2.0, "min": 0.0},
+                        "center": {"value": -1.5},
+                        "fwhmg": {"value": 1.0, "min": 0.1},
+                    },
+                },
+                "2": {
+                    "lorentzian": {
+                        "amplitude": {"value": 1.0},
+                        "center": {"value": 2.5},
+                        "fwhml": {"value": 1.5, "min": 0.1},
+                    },
+                },
+            },
+        }
+        _, numeric = SolverModels(df=df, args=args)()
+        _, analytic = SolverModels(df=df, args={**args, "jacobian": True})()
+        assert analytic.nfev < numeric.nfev
+        for name, param in numeric.params.items():
+            assert analytic.params[name].value == pytest.approx(param.value, abs=1e-6)
+
+    def test_global_layers(self) -> None:
+        """Test the column layers of several peaks of the same model."""
+        x = np.linspace(0, 10, 100)
+        params = Parameters()
+        expected = np.zeros((100, 3))
+        for peak, column in [(1, 1), (1, 2), (1, 3), (2, 2), (3, 2), (2, 3)]:
+            center = 2.0 * peak + 0.1 * column
+            params.add(f"lorentzian_amplitude_{peak}_{column}", value=column)
+            params.add(f"lorentzian_center_{peak}_{column}", value=center)
+            params.add(f"lorentzian_fwhml_{peak}_{column}", value=0.5)
+            expected[:, column - 1] += DistributionModels.lorentzian(
+                x,
+                amplitude=column,
+                center=center,
+                fwhml=0.5,
+            )
+        plan = FitPlan(params=params, shape=expected.shape, global_fit=1)
+        (group,) = plan.groups
+        assert [c.label for c in group.components] == [
+            "lorentzian_1_1",
+            "lorentzian_1_2",
+            "lorentzian_1_3",
+            "lorentzian_2_2",
+            "lorentzian_2_3",
+            "lorentzian_3_2",
+        ]
+        assert group.layers is not None
+        assert group.layers[0] == (slice(0, 3), slice(None))
+        assert group.layers[1][1].tolist() == [1, 2]
+        assert group.layers[2][1].tolist() == [1]
+        np.testing.assert_allclose(plan.evaluate(params, x), expected)
+
+    @pytest.mark.parametrize("global_fit", [0, 1])
+    def test_window(self, global_fit: int) -> None:
+        """Test the peak windowing against the documented error bound."""
+        x = np.linspace(0, 100, 5000)
+        suffix = "_1" if global_fit else ""
+        params = Parameters()
+        for peak in range(1, 6):
+            params.add(f"gaussian_amplitude_{peak}{suffix}", value=1.0)
+            params.add(f"gaussian_center_{peak}{suffix}", value=15.0 * peak)
+            params.add(f"gaussian_fwhmg_{peak}{suffix}", value=0.5)
+        params.add(f"lorentzian_amplitude_6{suffix}", value=1.0)
+        params.add(f"lorentzian_center_6{suffix}", value=50.0)
+        params.add(f"lorentzian_fwhml_6{suffix}", value=0.5)
+        shape = (x.size, 1) if global_fit else x.shape
+        full = FitPlan(params=params, shape=shape, global_fit=global_fit)
+        window = FitPlan(params=params, shape=shape, global_fit=global_fit, window=3)
+        assert [group.widths is not None for group in window.groups] == [True, True]
+
+        difference = full.evaluate(params, x) - window.evaluate(params, x)
+        lorentzian = 1 / (pi * 0.25)
+        assert np.abs(difference).max() <= lorentzian / (1 + 4 * 3**2)
+
+        gaussian = window.contributions(params, x)[f"gaussian_1{suffix}"]
+        np.testing.assert_allclose(
+            gaussian,
+            DistributionModels.gaussian(x, amplitude=1.0, center=15.0, fwhmg=0.5),
+            atol=2 ** (-4 * 3**2) * 2,
+        )
+        assert np.count_nonzero(gaussian) <= 2 * 3 * 0.5 / (x[1] - x[0]) + 1
+
+    def test_faddeeva(self) -> None:
+        """Test the fit of Voigt peaks by the Humlicek approximation."""
+        x = np.linspace(-10, 10, 400)
+        y = DistributionModels.voigt(
+            x,
+            center=-2.0,
+            fwhmv=1.5,
+        ) + DistributionModels.voigt(x, center=3.0, fwhmv=1.0, gamma=0.4)
+        params = Parameters()
+        params.add("voigt_center_1", value=-2.0)
+        params.add("voigt_fwhmv_1", value=1.5)
+        plan = FitPlan(params=params, shape=x.shape, global_fit=0, faddeeva="humlicek")
+        assert "humlicek" in plan.__reduce__()[1]
+        np.testing.assert_allclose(
+            plan.evaluate(params, x),
+            DistributionModels.voigt(x, center=-2.0, fwhmv=1.5),
+            rtol=1e-4,
+        )
+
+        df = pd.DataFrame({"energy": x, "intensity": y})
+        args = {
+            "autopeak": False,
+            "global_": 0,
+            "column": ["energy", "intensity"],
+            "jacobian": True,
+            "faddeeva": "humlicek",
+            "optimizer": {"max_nfev": None, "method": "leastsq"},
+            "peaks": {
+                "1": {
+                    "voigt": {
+                        "center": {"value": -1.5},
+                        "fwhmv": {"value": 1.0, "min": 0.1},
+                    },
+                },
+                "2": {
+                    "voigt": {
+                        "center": {"value": 2.5},
+                        "fwhmv": {"value": 1.2, "min": 0.1},
+                        "gamma": {"value": 0.3, "min": 0.0},
+                    },
+                },
+            },
+        }
+        _, result = SolverModels(df=df, args=args)()
+        assert result.params["voigt_center_1"].value == pytest.approx(-2.0, abs=1e-3)
+        assert result.params["voigt_center_2"].value == pytest.approx(3.0, abs=1e-3)
+
+    def test_window_check(self) -> None:
+        """Test the check of the peak windowing."""
+        FitPlan.check_window(np.linspace(0, 1, 10), None)
+        FitPlan.check_window(np.linspace(0, 1, 10), 3.0)
+        with pytest.raises(ValueError, match="ascending"):
+            FitPlan.check_window(np.linspace(1, 0, 10), 3.0)
+        with pytest.raises(ValueError, match="positive"):
+            FitPlan.check_window(np.linspace(0, 1, 10), 0.0)
+
+    def test_sparsity_global(self) -> None:
+        """Test the sparsity pattern of the Jacobian for global fitting."""
+        x = np.linspace(-5, 5, 50)
+        model = DistributionModels.gaussian(x, amplitude=1.0, center=0.5, fwhmg=1.5)
+        noise = np.random.default_rng(0).normal(scale=0.01, size=(3, x.size))
+        df = pd.DataFrame(
+            {
+                "energy": x,
+                "a": model + noise[0],
+                "b": 2 * model + noise[1],
+                "c": 3 * model + noise[2],
+            },
+        )
+        args = {
+            "autopeak": False,
+            "global_": 1,
+            "column": ["energy"],
+            "optimizer": {"max_nfev": None, "method": "leastsq"},
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 1.5, "min": 0.0},
+                        "center": {"value": 0.0},
+                        "fwhmg": {"value": 1.0, "min": 0.1},
+                    },
+                },
+            },
+        }
+        solver = SolverModels(df=df, args=args)
+        sparsity = solver.plan.sparsity(solver.params).toarray()
+        varys = [name for name, param in solver.params.items() if param.vary]
+        assert varys == [
+            "gaussian_amplitude_1_1",
+            "gaussian_center_1_1",
+            "gaussian_fwhmg_1_1",
+            "gaussian_amplitude_1_2",
+            "gaussian_amplitude_1_3",
+        ]
+        assert sparsity.shape == (150, 5)
+        jacobian = solver.plan.jacobian(solver.params, solver.x)
+        np.testing.assert_array_equal(jacobian != 0, sparsity)
+
+        _, dense = solver()
+        _, sparse = SolverModels(df=df, args={**args, "sparse": True})()
+        assert sparse.method == "least_squares"
+        assert sparse.call_kws["tr_solver"] == "lsmr"
+        for name, param in dense.params.items():
+            assert sparse.params[name].value == pytest.approx(param.value, abs=1e-5)
+            assert sparse.params[name].stderr == pytest.approx(param.stderr, rel=1e-2)
+
+
+class TestLinkedParameters:
+    """Test the native links of the shared parameters of the global fitting."""
+
+    @pytest.fixture
+    def args(self) -> dict[str, Any]:
+        """Fixture for the global fit of two peaks with reversed arguments."""
+        return {
+            "autopeak": False,
+            "global_": 1,
+            "column": ["energy"],
+            "optimizer": {"max_nfev": None, "method": "leastsq"},
+            "links": True,
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "center": {"value": -1.2},
+                        "amplitude": {"value": 1.5, "min": 0.0},
+                        "fwhmg": {"value": 1.0, "min": 0.1},
+                    },
+                },
+                "2": {
+                    "lorentzian": {
+                        "amplitude": {"value": 1.0, "min": 0.0},
+                        "center": {"value": 1.8},
+                        "fwhml": {"value": 0.5, "min": 0.1},
+                    },
+                },
+            },
+        }
+
+    @pytest.fixture
+    def df(self) -> pd.DataFrame:
+        """Fixture for four spectra with shared peak shapes."""
+        x = np.linspace(-5, 5, 200)
+        gaussian = DistributionModels.gaussian(x, amplitude=1.0, center=-1.0, fwhmg=1.2)
+        lorentzian = DistributionModels.lorentzian(
+            x, amplitude=1.0, center=2.0, fwhml=0.6
+        )
+        noise = np.random.default_rng(0).normal(scale=0.01, size=(4, x.size))
+        return pd.DataFrame(
+            {
+                "energy": x,
+                **{
+                    f"y{i}": (i + 1) * gaussian + (4 - i) * lorentzian + noise[i]
+                    for i in range(4)
+                },
+            },
+        )
+
+    def test_link_parameters(self, df: pd.DataFrame, args: dict[str, Any]) -> None:
+        """Test that the tied parameters are removed and linked in the plan."""
+        solver = SolverModels(df=df, args=args)
+        assert len(solver.links) == 12
+        assert solver.links["gaussian_center_1_4"] == "gaussian_center_1_1"
+        assert "gaussian_center_1_4" not in solver.params
+        assert not any(param.expr for param in solver.params.values())
+        assert len(solver.plan.groups) == 2
+        reference = FitPlan(
+            params=solver.layout,
+            shape=solver.data.shape,
+            global_fit=1,
+        )
+        np.testing.assert_allclose(
+            solver.plan.evaluate(solver.params, solver.x),
+            reference.evaluate(solver.layout, solver.x),
+        )
+        assert pickle.loads(pickle.dumps(solver.plan)).links == solver.links
+
+    def test_opt_in(self, df: pd.DataFrame, args: dict[str, Any]) -> None:
+        """Test that the expressions are kept unless the links are enabled."""
+        args.pop("links")
+        solver = SolverModels(df=df, args=args)
+        assert solver.links == {}
+        assert solver.params["gaussian_center_1_4"].expr == "gaussian_center_1_1"
+
+    def test_referenced(self) -> None:
+        """Test that parameters referenced by other expressions are kept."""
+        params = Parameters()
+        params.add("gaussian_center_1_1", value=1.0)
+        params.add("gaussian_center_1_2", expr="gaussian_center_1_1")
+        params.add("gaussian_center_1_3", expr="gaussian_center_1_2")
+        params.add("gaussian_fwhmg_1_1", value=1.0)
+        params.add("gaussian_fwhmg_1_2", expr="gaussian_fwhmg_1_1")
+        params.add("gaussian_fwhmg_1_3", expr="2 * gaussian_fwhmg_1_2")
+        linked, links = SolverModels.link_parameters(params)
+        assert links == {
+            "gaussian_center_1_2": "gaussian_center_1_1",
+            "gaussian_center_1_3": "gaussian_center_1_1",
+        }
+        assert list(linked) == [
+            "gaussian_center_1_1",
+            "gaussian_fwhmg_1_1",
+            "gaussian_fwhmg_1_2",
+            "gaussian_fwhmg_1_3",
+        ]
+
+    @pytest.mark.parametrize("jacobian", [False, True])
+    def test_solve(
+        self,
+        df: pd.DataFrame,
+        args: dict[str, Any],
+        jacobian: bool,
+    ) -> None:
+        """Test that the linked fit matches the fit with the expressions."""
+        _, linked = SolverModels(df=df, args={**args, "jacobian": jacobian})()
+        _, expr = SolverModels(
+            df=df,
+            args={**args, "jacobian": jacobian, "links": False},
+        )()
+        assert list(linked.params) == list(expr.params)
+        for name, param in expr.params.items():
+            assert linked.params[name].expr == param.expr
+            assert linked.params[name].value == pytest.approx(param.value, abs=1e-6)
+            assert linked.params[name].stderr == pytest.approx(param.stderr, rel=1e-3)
+        assert linked.chisqr == pytest.approx(expr.chisqr)
+
+
+class TestVariableProjection:
+    """Test the variable projection of the linear parameters."""
+
+    spectrum: ClassVar[dict[str, Any]] = {
+        "x": (0, 10, 300),
+        "peaks": [
+            ("gaussian", {"amplitude": 3.0, "center": 3.0, "fwhmg": 1.0}),
+            ("lorentzian", {"amplitude": 2.0, "center": 7.0, "fwhml": 0.8}),
+        ],
+        "background": (0.5, 0.1),
+    }
+
+    @staticmethod
+    def peaks(amplitude: dict[str, float]) -> dict[str, Any]:
+        """Return the peaks with the bounds of the amplitudes."""
+        return {
+            "1": {
+                "gaussian": {
+                    "amplitude": {"value": 1.0, **amplitude},
+                    "center": {"value": 3.3},
+                    "fwhmg": {"value": 1.5, "min": 0.1},
+                },
+            },
+            "2": {
+                "lorentzian": {
+                    "amplitude": {"value": 1.0, **amplitude},
+                    "center": {"value": 6.8},
+                    "fwhml": {"value": 1.0, "min": 0.1},
+                },
+            },
+            "3": {
+                "linear": {
+                    "slope": {"value": 0.0},
+                    "intercept": {"value": 0.0},
+                },
+            },
+        }
+
+    def test_names(self) -> None:
+        """Test the selection of the free linear parameters."""
+        params = Parameters()
+        params.add("gaussian_amplitude_1", value=1.0)
+        params.add("gaussian_center_1", value=3.0)
+        params.add("gaussian_fwhmg_1", value=1.0)
+        params.add("gaussian_amplitude_2", value=1.0, vary=False)
+        params.add("gaussian_center_2", value=5.0)
+        params.add("gaussian_fwhmg_2", value=1.0)
+        params.add("lorentzian_amplitude_3", value=1.0)
+        params.add("lorentzian_center_3", value=7.0)
+        params.add("lorentzian_fwhml_3", expr="lorentzian_amplitude_3")
+        params.add("voigt_center_4", value=8.0)
+        params.add("voigt_fwhmv_4", value=1.0)
+        params.add("exponential_amplitude_5", value=1.0)
+        params.add("exponential_decay_5", value=1.0)
+        params.add("exponential_intercept_5", value=0.5, vary=False)
+        plan = FitPlan(params=params, shape=(10,), global_fit=0)
+        projection = VariableProjection(plan=plan, params=params)
+        assert projection.names == ["gaussian_amplitude_1", "exponential_amplitude_5"]
+        assert [p.offset for p in projection.groups] == [True, True]
+
+    def test_solve(self) -> None:
+        """Test the exact solution of the linear parameters including offsets."""
+        x = np.linspace(0.1, 10, 100)
+        params = Parameters()
+        params.add("exponential_amplitude_1", value=1.0, min=0.0)
+        params.add("exponential_decay_1", value=2.0)
+        params.add("exponential_intercept_1", value=0.5, vary=False)
+        params.add("polynom2_coefficient0_2", value=0.0)
+        params.add("polynom2_coefficient1_2", value=0.0)
+        params.add("polynom2_coefficient2_2", value=0.0, min=-1.0, max=1.0)
+        data = 4.0 * np.exp(-x / 2.0) + 0.5 + 1.0 - 0.2 * x + 0.03 * x**2
+        plan = FitPlan(params=params, shape=x.shape, global_fit=0)
+        projection = VariableProjection(plan=plan, params=params)
+        coefficients, model = projection.solve(params, x, data)
+        np.testing.assert_allclose(coefficients, [4.0, 1.0, -0.2, 0.03], atol=1e-8)
+        np.testing.assert_allclose(model, data, atol=1e-8)
+
+    @pytest.mark.parametrize(
+        "amplitude",
+        [{}, {"min": 0.0}, {"min": -10.0, "max": 10.0}],
+    )
+    def test_projection_local(
+        self,
+        df_local: pd.DataFrame,
+        amplitude: dict[str, float],
+    ) -> None:
+        """Test that the projection converges to the exact parameters."""
+        args = local_args(self.peaks(amplitude))
+        _, full = SolverModels(df=df_local, args=args)()
+        _, projected = SolverModels(df=df_local, args={**args, "projection": True})()
+        assert projected.nfev < full.nfev
+        assert projected.chisqr == pytest.approx(0, abs=1e-12)
+        expected = {
+            "gaussian_amplitude_1": 3.0,
+            "gaussian_center_1": 3.0,
+            "gaussian_fwhmg_1": 1.0,
+            "lorentzian_amplitude_2": 2.0,
+            "lorentzian_center_2": 7.0,
+            "lorentzian_fwhml_2": 0.8,
+            "linear_slope_3": 0.1,
+            "linear_intercept_3": 0.5,
+        }
+        for name, value in expected.items():
+            assert projected.params[name].value == pytest.approx(value, abs=1e-6)
+        assert projected.params["gaussian_amplitude_1"].stderr is not None
+
+    def test_projection_refinement(self, df_local: pd.DataFrame) -> None:
+        """Test the refinement by `leastsq` for other optimizers."""
+        args = local_args(self.peaks({"min": 0.0}))
+        args["optimizer"] = {"method": "nelder"}
+        _, result = SolverModels(df=df_local, args={**args, "projection": True})()
+        assert result.method == "leastsq"
+        assert result.params["gaussian_amplitude_1"].value == pytest.approx(3.0)
+
+    @pytest.mark.parametrize("sparse", [False, True])
+    def test_projection_global(self, sparse: bool) -> None:
+        """Test the projection of the amplitudes per spectrum."""
+        x = np.linspace(-5, 5, 50)
+        model = DistributionModels.gaussian(x, amplitude=1.0, center=0.5, fwhmg=1.5)
+        noise = np.random.default_rng(0).normal(scale=0.01, size=(3, x.size))
+        df = pd.DataFrame(
+            {
+                "energy": x,
+                "a": model + noise[0],
+                "b": 2 * model + noise[1],
+                "c": 3 * model + noise[2],
+            },
+        )
+        args = {
+            "autopeak": False,
+            "global_": 1,
+            "column": ["energy"],
+            "optimizer": {"max_nfev": None, "method": "leastsq"},
+            "sparse": sparse,
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 1.5, "min": 0.0},
+                        "center": {"value": 0.0},
+                        "fwhmg": {"value": 1.0, "min": 0.1},
+                    },
+                },
+            },
+        }
+        solver = SolverModels(df=df, args={**args, "projection": True})
+        projection = VariableProjection(plan=solver.plan, params=solver.params)
+        assert [block[0] for block in projection.blocks] == [0, 1, 2]
+        _, projected = solver()
+        _, full = SolverModels(df=df, args=args)()
+        for name, param in full.params.items():
+            assert projected.params[name].value == pytest.approx(param.value, abs=1e-5)
+            assert projected.params[name].stderr == pytest.approx(
+                param.stderr,
+                rel=1e-2,
+            )
+
+    @pytest.mark.parametrize("links", [True, False])
+    def test_shared_projection(self, links: bool) -> None:
+        """Test the batched projection of the spectra with shared peak shapes."""
+        x = np.linspace(-5, 5, 80)
+        model = DistributionModels.gaussian(x, amplitude=1.0, center=0.5, fwhmg=1.5)
+        df = pd.DataFrame(
+            {
+                "energy": x,
+                "a": model + 0.1,
+                "b": -model + 0.2,
+                "c": 3 * model - 0.1,
+            },
+        )
+        args = {
+            "autopeak": False,
+            "global_": 1,
+            "column": ["energy"],
+            "optimizer": {"max_nfev": None, "method": "leastsq"},
+            "links": links,
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 1.0, "min": 0.0},
+                        "center": {"value": 0.3},
+                        "fwhmg": {"value": 1.2, "min": 0.1},
+                    },
+                },
+                "2": {"constant": {"amplitude": {"value": 0.0}}},
+            },
+        }
+        solver = SolverModels(df=df, args=args)
+        shared = SharedProjection(plan=solver.plan, params=solver.params)
+        if not links:
+            assert shared.layout is None
+            return
+        assert shared.layout.shape == (2, 3)
+        coefficients, model = shared.solve(solver.params, solver.x, solver.data)
+        model = model.copy()
+        expected, reference = VariableProjection(
+            plan=solver.plan,
+            params=solver.params,
+        ).solve(solver.params, solver.x, solver.data)
+        np.testing.assert_allclose(coefficients, expected, atol=1e-12)
+        np.testing.assert_allclose(model, reference, atol=1e-12)
+        assert coefficients[shared.layout[0, 1]] == 0.0
+
+
+class TestMultiStart:
+    """Test the multi-start optimization."""
+
+    spectrum: ClassVar[dict[str, Any]] = {
+        "x": (0, 10, 200),
+        "peaks": [
+            ("gaussian", {"amplitude": 2.0, "center": 4.0, "fwhmg": 1.0}),
+            ("gaussian", {"amplitude": 1.0, "center": 5.5, "fwhmg": 1.2}),
+        ],
+    }
+    # Poor initial guess of both peaks far from the overlapping peaks
+    peaks: ClassVar[dict[str, Any]] = {
+        str(i): {
+            "gaussian": {
+                "amplitude": {"value": 0.1, "min": 0.0, "max": 5.0},
+                "center": {"value": center, "min": 0.0, "max": 10.0},
+                "fwhmg": {"value": 0.2, "min": 0.1, "max": 3.0},
+            },
+        }
+        for i, center in ((1, 9.0), (2, 9.5))
+    }
+
+    @pytest.mark.parametrize("sampling", ["sobol", "lhs"])
+    def test_samples(self, sampling: str) -> None:
+        """Test the sampling within the bounds of the free parameters."""
+        params = Parameters()
+        params.add("gaussian_amplitude_1", value=1.0, min=0.0, max=2.0)
+        params.add("gaussian_center_1", value=0.0)
+        params.add("gaussian_fwhmg_1", value=1.0, min=0.5, max=1.5, vary=False)
+        multistart = MultiStart(
+            params=params,
+            options={"starts": 8, "sampling": sampling, "seed": 0},
+        )
+        assert multistart.names == ["gaussian_amplitude_1"]
+        samples = multistart.samples()
+        assert samples.shape == (8, 1)
+        assert samples[0, 0] == 1.0
+        assert np.all((samples >= 0.0) & (samples <= 2.0))
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_multistart(self, df_local: pd.DataFrame, workers: int) -> None:
+        """Test that the multi-start escapes the local minimum of the guess."""
+        args = local_args(
+            self.peaks,
+            multistart={"starts": 16, "seed": 42, "workers": workers, "max_nfev": 200},
+        )
+        _, result = SolverModels(df=df_local, args=args)()
+        assert result.chisqr == pytest.approx(0, abs=1e-8)
+        centers = sorted(result.params[f"gaussian_center_{i}"].value for i in (1, 2))
+        assert centers == pytest.approx([4.0, 5.5], abs=1e-4)
+        insights = args["multistart_insights"]
+        assert insights["starts"] == insights["finished"] == 16
+        assert insights["chi_square"][insights["best"]] == min(
+            insights["chi_square"].values(),
+        )
+        assert set(insights["variables"]["gaussian_center_1"]) == {
+            "best_value",
+            "mean",
+            "std",
+            "min",
+            "max",
+        }
+
+    def test_target(self, df_local: pd.DataFrame) -> None:
+        """Test the early stop once the target chi-square is reached."""
+        args = local_args(
+            self.peaks,
+            multistart={"starts": 16, "seed": 42, "workers": 1, "target": 1e6},
+        )
+        SolverModels(df=df_local, args=args)()
+        assert args["multistart_insights"]["finished"] == 1
+        assert args["multistart_insights"]["best"] == 0
+
+
+class TestRegionDecomposition:
+    """Test the decomposition into independent regions of peak clusters."""
+
+    centers: ClassVar[list[float]] = [5.0, 15.0, 25.0, 35.0, 45.0, 55.0]
+
+    spectrum: ClassVar[dict[str, Any]] = {
+        "x": (0, 60, 1200),
+        "peaks": [
+            ("gaussian", {"amplitude": i + 1.0, "center": c, "fwhmg": 1.0})
+            for i, c in enumerate(centers)
+        ],
+        "background": (0.1, 0.0),
+    }
+    # Initial guess shifted from the centers
+    peaks: ClassVar[dict[str, Any]] = {
+        **{
+            str(i + 1): {
+                "gaussian": {
+                    "amplitude": {"value": 0.5 * (i + 1), "min": 0.0},
+                    "center": {"value": c + 0.3},
+                    "fwhmg": {"value": 1.3, "min": 0.1},
+                },
+            }
+            for i, c in enumerate(centers)
+        },
+        "7": {"constant": {"amplitude": {"value": 0.1}}},
+    }
+
+    def test_regions(self) -> None:
+        """Test the clustering by overlaps and by shared free parameters."""
+        params = Parameters()
+        for i, (center, fwhmg) in enumerate(
+            [(0.0, 1.0), (2.0, 1.0), (10.0, 1.0), (20.0, 1.0), (14.0, 0.5)],
+        ):
+            params.add(f"gaussian_amplitude_{i + 1}", value=1.0)
+            params.add(f"gaussian_center_{i + 1}", value=center)
+            params.add(f"gaussian_fwhmg_{i + 1}", value=fwhmg)
+        params["gaussian_center_5"].set(expr="gaussian_center_3 + 4")
+        params.add("constant_amplitude_6", value=0.0)
+        plan = FitPlan(params=params, shape=(10,), global_fit=0)
+        regions = RegionDecomposition(
+            plan=plan,
+            params=params,
+            options={"window": 1.5},
+        ).regions
+        labels = [[c.label for c in region.components] for region in regions]
+        assert labels == [
+            ["gaussian_1", "gaussian_2"],
+            ["gaussian_3", "gaussian_5"],
+            ["gaussian_4"],
+        ]
+        assert regions[0].lower == -1.5
+        assert regions[0].upper == 3.5
+        assert regions[1].upper == 14.75
+        assert "constant_amplitude_6" not in {
+            name for region in regions for name in region.varys
+        }
+        assert "gaussian_center_5" not in regions[1].varys
+
+        subproblem = RegionDecomposition(
+            plan=plan,
+            params=params,
+            options={"window": 1.5},
+        ).subproblem(regions[1])
+        assert set(subproblem) == {
+            f"gaussian_{name}_{i}"
+            for name in ("amplitude", "center", "fwhmg")
+            for i in (3, 5)
+        }
+        assert subproblem["gaussian_center_5"].value == 14.0
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_refine(self, df_local: pd.DataFrame, workers: int) -> None:
+        """Test the region fits with the joint refinement."""
+        args = local_args(self.peaks, decomposition={"workers": workers})
+        _, result = SolverModels(df=df_local, args=args)()
+        assert result.success
+        assert result.chisqr == pytest.approx(0, abs=1e-12)
+        for i, center in enumerate(self.centers):
+            assert result.params[f"gaussian_center_{i + 1}"].value == pytest.approx(
+                center,
+            )
+        insights = args["decomposition_insights"]
+        assert insights["fitted"] == len(self.centers)
+        assert [region["peaks"] for region in insights["regions"]] == [
+            [f"gaussian_{i + 1}"] for i in range(len(self.centers))
+        ]
+        assert all(region["success"] for region in insights["regions"])
+
+    def test_no_refine(self, df_local: pd.DataFrame) -> None:
+        """Test the result assembled from the region fits."""
+        args = local_args(self.peaks, decomposition={"refine": False})
+        _, result = SolverModels(df=df_local, args=args)()
+        assert result.method == "decomposition"
+        assert result.nfev == args["decomposition_insights"]["nfev"]
+        assert result.chisqr == pytest.approx(0, abs=1e-12)
+        assert np.sum(result.residual**2) == pytest.approx(result.chisqr)
+        for i, center in enumerate(self.centers):
+            param = result.params[f"gaussian_center_{i + 1}"]
+            assert param.value == pytest.approx(center)
+            assert param.stderr is not None
+        assert result.params["constant_amplitude_7"].stderr is None
+        assert not result.errorbars
+
+    def test_global(self, df_local: pd.DataFrame) -> None:
+        """Test that the global fitting is rejected."""
+        args = {**local_args(self.peaks, decomposition={}), "global_": 1}
+        with pytest.raises(ValueError, match="only supported for the local"):
+            SolverModels(df=df_local, args=args)
+
+
+class TestMultiResolution:
+    """Test the coarse-to-fine multi-resolution fitting."""
+
+    spectrum: ClassVar[dict[str, Any]] = {
+        "x": (0, 100, 20000),
+        "peaks": [
+            ("gaussian", {"amplitude": 5.0, "center": 30.0, "fwhmg": 4.0}),
+            ("gaussian", {"amplitude": 3.0, "center": 50.0, "fwhmg": 6.0}),
+            ("gaussian", {"amplitude": 4.0, "center": 70.0, "fwhmg": 5.0}),
+        ],
+        "background": (0.0, 0.001),
+    }
+    # Initial guess shifted from the centers
+    peaks: ClassVar[dict[str, Any]] = {
+        **{
+            str(i + 1): {
+                "gaussian": {
+                    "amplitude": {"value": 2.0, "min": 0.0},
+                    "center": {"value": center},
+                    "fwhmg": {"value": 3.0, "min": 0.1},
+                },
+            }
+            for i, center in enumerate((28.0, 53.0, 68.0))
+        },
+        "4": {"linear": {"slope": {"value": 0.0}, "intercept": {"value": 0.0}}},
+    }
+
+    @pytest.mark.parametrize("binning", ["mean", "decimate"])
+    def test_multiresolution(self, df_local: pd.DataFrame, binning: str) -> None:
+        """Test that the coarse levels reduce the evaluations of the full grid."""
+        _, reference = SolverModels(
+            df=df_local,
+            args=local_args(self.peaks, multiresolution=None),
+        )()
+        args = local_args(
+            self.peaks,
+            multiresolution={"levels": [16, 4], "binning": binning},
+        )
+        _, result = SolverModels(df=df_local, args=args)()
+        assert result.chisqr == pytest.approx(0, abs=1e-8)
+        for name, param in reference.params.items():
+            assert result.params[name].value == pytest.approx(param.value, abs=1e-6)
+        insights = args["multiresolution_insights"]
+        assert [level["factor"] for level in insights["levels"]] == [16, 4]
+        assert [level["points"] for level in insights["levels"]] == [1250, 5000]
+        assert result.nfev < reference.nfev
+        assert insights["cost"] + result.nfev < reference.nfev
+
+    def test_global(self) -> None:
+        """Test the binning of the spectra of the global fitting."""
+        x = np.linspace(0, 10, 400)
+        df = pd.DataFrame(
+            {
+                "energy": x,
+                **{
+                    f"y_{i}": DistributionModels.gaussian(x, i + 1.0, 5.0, 1.0)
+                    for i in range(3)
+                },
+            },
+        )
+        args = {
+            "autopeak": False,
+            "global_": 1,
+            "column": ["energy"],
+            "optimizer": {"max_nfev": None, "method": "leastsq"},
+            "multiresolution": {"levels": [8]},
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 1.0, "min": 0.0},
+                        "center": {"value": 4.5},
+                        "fwhmg": {"value": 1.5, "min": 0.1},
+                    },
+                },
+            },
+        }
+        _, result = SolverModels(df=df, args=args)()
+        assert args["multiresolution_insights"]["levels"][0]["points"] == 50
+        assert result.chisqr == pytest.approx(0, abs=1e-10)
+
+    def test_levels(self) -> None:
+        """Test the validation of the reduction factors."""
+        with pytest.raises(ValidationError):
+            MultiResolutionAPI(levels=[8, 1])
+
+
+class TestMarkovChain:
+    """Test the vectorized Markov chain Monte Carlo sampling."""
+
+    spectrum: ClassVar[dict[str, Any]] = {
+        "x": (-5, 5, 200),
+        "peaks": [("gaussian", {"amplitude": 1.0, "center": 0.5, "fwhmg": 1.5})],
+        "background": (0.1, 0.0),
+        "noise": 0.01,
+    }
+    peaks: ClassVar[dict[str, Any]] = {
+        "1": {
+            "gaussian": {
+                "amplitude": {"value": 2.0, "min": 0.0},
+                "center": {"value": 0.0, "min": -5.0, "max": 5.0},
+                "fwhmg": {"value": 1.0, "min": 0.1},
+            },
+        },
+        "2": {"constant": {"amplitude": {"value": 0.0}}},
+    }
+
+    @pytest.mark.parametrize("window", [None, 5.0])
+    @pytest.mark.parametrize("global_", [0, 1])
+    def test_evaluate_batch(self, global_: int, window: float | None) -> None:
+        """Test the batch evaluation against the single evaluations."""
+        x = np.linspace(-5, 5, 50)
+        params = Parameters()
+        for i, center in enumerate((-1.0, 1.0), start=1):
+            params.add(f"gaussian_amplitude_{i}", value=1.0)
+            params.add(f"gaussian_center_{i}", value=center)
+            params.add(f"gaussian_fwhmg_{i}", value=0.5)
+        params.add("heaviside_amplitude_3", value=0.2)
+        params.add("heaviside_center_3", value=0.0)
+        params.add("heaviside_sigma_3", value=1.0)
+        shape: tuple[int, ...] = (x.size,)
+        if global_:
+            params = Parameters()
+            for column in (1, 2):
+                params.add(f"gaussian_amplitude_1_{column}", value=1.0)
+                params.add(f"gaussian_center_1_{column}", value=0.0)
+                params.add(f"gaussian_fwhmg_1_{column}", value=0.5)
+                params.add(f"heaviside_amplitude_2_{column}", value=0.2)
+                params.add(f"heaviside_center_2_{column}", value=0.0)
+                params.add(f"heaviside_sigma_2_{column}", value=1.0)
+            shape = (x.size, 2)
+        plan = FitPlan(params=params, shape=shape, global_fit=global_, window=window)
+        values = plan.values(params) * np.random.default_rng(1).uniform(
+            0.8,
+            1.2,
+            size=(4, len(plan.names)),
+        )
+        batch = plan.evaluate_batch(values, x)
+        assert batch.shape == (4, *shape)
+        for row, model in zip(values, batch):
+            np.testing.assert_allclose(model, plan.evaluate_values(row, x))
+
+    def test_values(self) -> None:
+        """Test the parameter values of aliases and general expressions."""
+        params = Parameters()
+        params.add("gaussian_amplitude_1", value=1.0)
+        params.add("gaussian_center_1", value=0.0)
+        params.add("gaussian_fwhmg_1", value=1.0, vary=False)
+        params.add("gaussian_amplitude_2", expr="gaussian_amplitude_1")
+        params.add("gaussian_center_2", expr="gaussian_center_1 + 2")
+        params.add("gaussian_fwhmg_2", value=1.0, vary=False)
+        x = np.linspace(-5, 5, 20)
+        plan = FitPlan(params=params, shape=x.shape, global_fit=0)
+        chain = MarkovChain(
+            plan=plan,
+            params=params,
+            x=x,
+            data=np.zeros_like(x),
+            variance=1.0,
+        )
+        values = chain.values(np.array([[2.0, 0.5], [3.0, -1.0]]))
+        np.testing.assert_allclose(
+            values,
+            [[2.0, 0.5, 1.0, 2.0, 2.5, 1.0], [3.0, -1.0, 1.0, 3.0, 1.0, 1.0]],
+        )
+        log_prob = chain.log_prob(np.array([[2.0, 0.5], [np.inf, 0.0]]))
+        assert np.isfinite(log_prob[0])
+        assert log_prob[1] == -np.inf
+
+    @pytest.mark.parametrize(
+        "mcmc",
+        [{}, {"vectorize": False}, {"workers": 2}, {"autocorr": False, "thin": 5}],
+    )
+    def test_sampling(self, df_local: pd.DataFrame, mcmc: dict[str, Any]) -> None:
+        """Test that the posterior is centered at the best fit."""
+        args = local_args(
+            self.peaks,
+            mcmc={"walkers": 16, "steps": 400, "check": 100, "seed": 0, **mcmc},
+        )
+        _, result = SolverModels(df=df_local, args=args)()
+        insights = args["mcmc_insights"]
+        assert insights["walkers"] == 16
+        assert insights["steps"] <= 400
+        assert 0 < insights["acceptance_fraction"] < 1
+        assert insights["samples"] > 0
+        for name, variable in insights["variables"].items():
+            param = result.params[name]
+            assert variable["lower"] <= variable["median"] <= variable["upper"]
+            assert variable["median"] == pytest.approx(
+                param.value, abs=3 * param.stderr
+            )
+            assert variable["stderr"] == pytest.approx(param.stderr, rel=0.5)
+        if "thin" in mcmc:
+            assert insights["thin"] == 5
+            assert insights["burn"] == int(2 * max(insights["autocorr_time"].values()))
+
+
+class TestFitMonitor:
+    """Test the wall-clock budget and convergence monitor."""
+
+    spectrum: ClassVar[dict[str, Any]] = {
+        "x": (0, 10, 200),
+        "peaks": [("gaussian", {"amplitude": 2.0, "center": 4.0, "fwhmg": 1.0})],
+    }
+    peaks: ClassVar[dict[str, Any]] = {
+        "1": {
+            "gaussian": {
+                "amplitude": {"value": 1.0, "min": 0.0},
+                "center": {"value": 3.0},
+                "fwhmg": {"value": 2.0, "min": 0.1},
+            },
+        },
+    }
+
+    def test_converged(self, df_local: pd.DataFrame) -> None:
+        """Test that the monitor does not interfere with a converging fit."""
+        args = local_args(self.peaks, monitor={"timeout": 60})
+        _, result = SolverModels(df=df_local, args=args)()
+        assert result.success
+        assert result.chisqr == pytest.approx(0, abs=1e-10)
+        insights = args["monitor_insights"]
+        assert insights["reason"] is None
+        assert insights["nfev"] > 0
+        assert insights["rate"] > 0
+
+    def test_timeout(self, df_local: pd.DataFrame) -> None:
+        """Test the abort by the wall-clock budget with the initial values."""
+        args = local_args(self.peaks, monitor={"timeout": 1e-9})
+        _, result = SolverModels(df=df_local, args=args)()
+        assert result.aborted
+        assert not result.success
+        assert "timeout" in result.message
+        assert args["monitor_insights"]["reason"] == "timeout"
+        assert result.params["gaussian_center_1"].value == pytest.approx(3.0)
+        assert result.chisqr == pytest.approx(args["monitor_insights"]["best"])
+
+    @pytest.mark.parametrize("projection", [False, True])
+    def test_stalled(self, df_local: pd.DataFrame, projection: bool) -> None:
+        """Test the abort by the stall criterion with the best parameters."""
+        args = local_args(
+            self.peaks,
+            projection=projection,
+            monitor={"rtol": 1.0, "patience": 5},
+        )
+        _, result = SolverModels(df=df_local, args=args)()
+        insights = args["monitor_insights"]
+        assert insights["reason"] == "stalled"
+        assert insights["nfev"] >= 5
+        assert result.chisqr == pytest.approx(insights["best"])
+        assert np.sum(result.residual**2) == pytest.approx(insights["best"])
+
+    def test_restore(self) -> None:
+        """Test that the best evaluation is restored instead of the last one."""
+        params = Parameters()
+        params.add("a", value=1.0)
+        params.add("b", expr="2 * a")
+        monitor = FitMonitor(
+            {
+                "timeout": None,
+                "rtol": None,
+                "patience": 100,
+                "progress": None,
+                "interval": 1.0,
+            },
+        )
+        x = np.zeros(3)
+
+        def residual(params: Parameters, x: NDArray[np.float64]) -> Any:
+            return params["b"].value - x - 4.0
+
+        minimizer = Minimizer(residual, params, fcn_args=(x,), iter_cb=monitor)
+        for value in (2.0, 1.0, 0.0):
+            params["a"].value = value
+            params.update_constraints()
+            assert not monitor(params, 1, residual(params, x))
+        result = minimizer.prepare_fit(params)
+        monitor.reason = "stalled"
+        monitor.restore(minimizer, result)
+        assert result.params["a"].value == 2.0
+        assert result.params["b"].value == 4.0
+        assert result.chisqr == pytest.approx(0)
+
+    def test_progress_file(self, df_local: pd.DataFrame, tmp_path: Path) -> None:
+        """Test the progress records as JSON lines."""
+        progress = tmp_path / "progress.jsonl"
+        args = local_args(
+            self.peaks,
+            monitor={
+                "progress": str(progress),
+                "interval": 0,
+                "rtol": 1.0,
+                "patience": 5,
+            },
+        )
+        SolverModels(df=df_local, args=args)()
+        records = [json.loads(line) for line in progress.read_text().splitlines()]
+        assert len(records) >= args["monitor_insights"]["nfev"]
+        assert set(records[0]) == {
+            "nfev",
+            "chisqr",
+            "best",
+            "seconds",
+            "rate",
+            "reason",
+        }
+        assert records[-1]["reason"] == "stalled"
+
+    def test_progress_stderr(
+        self,
+        df_local: pd.DataFrame,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test the progress records on stderr."""
+        args = local_args(
+            self.peaks,
+            monitor={"progress": "stderr", "timeout": 1e-9},
+        )
+        SolverModels(df=df_local, args=args)()
+        record = json.loads(capsys.readouterr().err.splitlines()[-1])
+        assert record["reason"] == "timeout"
@@ -7,6 +7,7 @@ and API integration tests. It covers singlets, doublets, sextets and octets.
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from typing import Any
 
 import numpy as np
 import pytest
@@ -27,10 +28,14 @@ from spectrafit.models import moessbauer
 from spectrafit.models.builtin import DistributionModels
 
 # Patch the required constants and functions for isolated testing
+from spectrafit.models.moessbauer import HyperfineDistribution
+from spectrafit.models.moessbauer import distribution_basis
 from spectrafit.models.moessbauer import moessbauer_doublet
 from spectrafit.models.moessbauer import moessbauer_octet
 from spectrafit.models.moessbauer import moessbauer_sextet
 from spectrafit.models.moessbauer import moessbauer_singlet
+from spectrafit.models.moessbauer import sextet_lines
+from spectrafit.models.regular import lorentzian as reference_lorentzian
 
 
 if TYPE_CHECKING:
@@ -657,6 +662,290 @@ def test_moessbauer_octet_happy_and_edge_cases(
     assert np.all(result <= expected_max)
 
 
+@pytest.mark.parametrize("efg_vzz", [1e21, 0.0])
+def test_moessbauer_octet_background(efg_vzz: float) -> None:
+    """Test that both branches of the octet add the background."""
+    x = np.linspace(-1, 1, 10)
+    result = moessbauer_octet(x, efg_vzz=efg_vzz, background=0.2)
+    np.testing.assert_allclose(result, 2.2)
+
+
+@pytest.mark.moessbauer
+@pytest.mark.parametrize(
+    ("efg_eta", "theta", "phi"),
+    [(0.5, np.pi / 4, np.pi / 3), (0.0, 0.0, 0.0), (1.0, np.pi / 2, 0.0)],
+)
+def test_octet_lines(efg_eta: float, theta: float, phi: float) -> None:
+    """Test the line list of the octet against a sextet and four split lines."""
+    x = np.linspace(-10, 10, 100)
+    splitting = (
+        33.0
+        * moessbauer_mod.G_FACTOR_57FE
+        * moessbauer_mod.NUCLEAR_MAGNETON
+        * moessbauer_mod.JOULE_TO_EV
+        * moessbauer_mod.EV_TO_MM_S
+    )
+    split_factor = 0.1 * efg_eta * (1 + abs(np.sin(theta) * np.cos(phi)))
+    expected = 0.7 * moessbauer_sextet(
+        x,
+        isomer_shift=0.1,
+        magnetic_field=33.0,
+        fwhml=0.3,
+        amplitude=1.6,
+        center=0.2,
+        angle_theta_phi={"theta": theta, "phi": phi},
+        quadrupole_shift=0.2,
+        synthetic=False,
+    )
+    for line in moessbauer_mod.SEXTET_SPLITTING[[0, -1]] * splitting:
+        for sign in (-1, 1):
+            expected += reference_lorentzian(
+                x,
+                center=0.2 + 0.1 + line - 0.2 + sign * split_factor,
+                fwhml=0.3,
+                amplitude=0.15 * 1.6,
+            )
+    positions, intensities = moessbauer.octet_lines(
+        isomer_shift=0.1,
+        magnetic_field=33.0,
+        quadrupole_shift=0.2,
+        amplitude=1.6,
+        center=0.2,
+        efg_vzz=1e21,
+        efg_eta=efg_eta,
+        theta=theta,
+        phi=phi,
+    )
+    assert positions.shape == intensities.shape == (10,)
+    np.testing.assert_allclose(
+        moessbauer.line_spectrum(x, positions, intensities, 0.3),
+        expected,
+        rtol=1e-12,
+    )
+
+
+@pytest.mark.moessbauer
+@pytest.mark.parametrize("theta", [0.0, np.pi / 3])
+def test_sextet_lines(theta: float) -> None:
+    """Test the line list of the sextet against the single Lorentzian lines."""
+    x = np.linspace(-10, 10, 400)
+    splitting = (
+        20.0
+        * moessbauer_mod.G_FACTOR_57FE
+        * moessbauer_mod.NUCLEAR_MAGNETON
+        * moessbauer_mod.JOULE_TO_EV
+        * moessbauer_mod.EV_TO_MM_S
+    )
+    cos2_theta = np.cos(theta) ** 2
+    weights = np.array([3, 0, 1, 1, 0, 3]) * (1 + cos2_theta) + np.array(
+        [0, 4, 0, 0, 4, 0],
+    ) * (1 - cos2_theta)
+    expected = np.full_like(x, 0.1)
+    for line, sign, weight in zip(
+        moessbauer_mod.SEXTET_SPLITTING,
+        [-1, 1, -1, -1, 1, -1],
+        weights,
+    ):
+        expected += reference_lorentzian(
+            x,
+            center=0.5 + 0.3 + line * splitting + sign * 0.2,
+            fwhml=0.25,
+            amplitude=2.0 * weight / weights.sum(),
+        )
+    result = moessbauer_sextet(
+        x,
+        isomer_shift=0.3,
+        magnetic_field=20.0,
+        fwhml=0.25,
+        amplitude=2.0,
+        center=0.5,
+        angle_theta_phi={"theta": theta, "phi": 0.0},
+        quadrupole_shift=0.2,
+        background=0.1,
+    )
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+@pytest.mark.moessbauer
+def test_line_list_sites() -> None:
+    """Test the evaluation of several sites in one broadcast call."""
+    x = np.linspace(-10, 10, 200)
+    fields = np.array([20.0, 33.0, 45.0])
+    shifts = np.array([0.0, 0.3, -0.2])
+    positions, intensities = moessbauer.sextet_lines(
+        isomer_shift=shifts,
+        magnetic_field=fields,
+        amplitude=np.ones(3),
+    )
+    assert positions.shape == intensities.shape == (3, 6)
+    np.testing.assert_allclose(intensities.sum(axis=-1), 1.0)
+    result = moessbauer.line_spectrum(x[:, np.newaxis], positions, intensities, 0.3)
+    for site, (field, shift) in enumerate(zip(fields, shifts)):
+        np.testing.assert_allclose(
+            result[:, site],
+            moessbauer_sextet(x, isomer_shift=shift, magnetic_field=field, fwhml=0.3),
+        )
+
+    positions, intensities = moessbauer.doublet_lines(
+        isomer_shift=shifts,
+        quadrupole_splitting=np.array([0.5, 1.0, 1.5]),
+        amplitude=2.0,
+    )
+    np.testing.assert_allclose(np.diff(positions, axis=-1)[:, 0], [0.5, 1.0, 1.5])
+    np.testing.assert_allclose(intensities, 1.0)
+
+
+@pytest.mark.moessbauer
+@pytest.mark.parametrize(
+    "model",
+    [moessbauer_singlet, moessbauer_doublet, moessbauer_sextet],
+)
+def test_synthetic_skipped(model: Any) -> None:
+    """Test that the fast path skips the synthetic peaks of flat spectra."""
+    x = np.linspace(-5, 5, 100)
+    np.testing.assert_array_equal(
+        model(x, amplitude=0.0, background=0.5, synthetic=False),
+        np.full_like(x, 0.5),
+    )
+
+
+@pytest.fixture
+def physical_constants(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Restore the physical constants, which are patched by `patch_dependencies`."""
+    monkeypatch.setattr(
+        moessbauer_mod, "G_FACTOR_57FE", moessbauer_constants.g_factor_57fe
+    )
+    monkeypatch.setattr(
+        moessbauer_mod, "NUCLEAR_MAGNETON", moessbauer_constants.nuclear_magneton
+    )
+    monkeypatch.setattr(moessbauer_mod, "EV_TO_MM_S", moessbauer_constants.ev_to_mm_s)
+
+
+@pytest.mark.moessbauer
+@pytest.mark.usefixtures("physical_constants")
+@pytest.mark.parametrize(
+    ("magnetic_field", "expected"),
+    [
+        (33.0, [-5.31, -3.08, -0.84, 0.84, 3.08, 5.31]),
+        (16.5, [-2.655, -1.54, -0.42, 0.42, 1.54, 2.655]),
+    ],
+)
+def test_sextet_alpha_iron(magnetic_field: float, expected: list[float]) -> None:
+    """Test the line positions of the sextet against the lines of alpha-iron."""
+    positions, _ = sextet_lines(
+        isomer_shift=0.0,
+        magnetic_field=magnetic_field,
+        amplitude=1.0,
+    )
+    np.testing.assert_allclose(positions, expected, atol=0.03)
+    positions, _ = moessbauer.octet_split_lines(
+        isomer_shift=0.0,
+        magnetic_field=magnetic_field,
+        quadrupole_shift=0.0,
+        amplitude=1.0,
+        center=0.0,
+        efg_vzz=1e21,
+        efg_eta=0.0,
+    )
+    np.testing.assert_allclose(positions, np.repeat(expected[::5], 2), atol=0.03)
+
+
+@pytest.mark.moessbauer
+@pytest.mark.usefixtures("physical_constants")
+def test_sextet_regression(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the line positions of the sextet against the collapsed old output."""
+    positions, intensities = sextet_lines(
+        isomer_shift=0.3,
+        magnetic_field=33.0,
+        amplitude=1.0,
+    )
+    # Splitting of the old output with the nuclear magneton in J/T as eV
+    monkeypatch.setattr(moessbauer_mod, "JOULE_TO_EV", 1.0)
+    monkeypatch.setattr(
+        moessbauer_mod,
+        "SEXTET_SPLITTING",
+        np.array([-3.0, -2.0, -1.0, 1.0, 2.0, 3.0]),
+    )
+    old_positions, old_intensities = sextet_lines(
+        isomer_shift=0.3,
+        magnetic_field=33.0,
+        amplitude=1.0,
+    )
+    np.testing.assert_allclose(old_positions, 0.3, atol=1e-12)
+    np.testing.assert_allclose(intensities, old_intensities)
+    np.testing.assert_allclose(
+        positions - old_positions,
+        [-5.31, -3.08, -0.84, 0.84, 3.08, 5.31],
+        atol=0.03,
+    )
+
+
+@pytest.mark.moessbauer
+@pytest.mark.parametrize(
+    ("kind", "model", "argument"),
+    [
+        ("field", moessbauer_sextet, "magnetic_field"),
+        ("splitting", moessbauer_doublet, "quadrupole_splitting"),
+    ],
+)
+def test_distribution_basis(kind: str, model: Any, argument: str) -> None:
+    """Test the basis of the distributions against the single sextets or doublets."""
+    x = np.linspace(-10, 10, 300)
+    grid = np.linspace(1.0, 30.0, 5)
+    basis = distribution_basis(x, grid, isomer_shift=0.2, fwhml=0.3, kind=kind)
+    expected = np.column_stack(
+        [
+            model(x, isomer_shift=0.2, fwhml=0.3, synthetic=False, **{argument: value})
+            for value in grid
+        ],
+    )
+    np.testing.assert_allclose(basis, expected, rtol=1e-12)
+
+
+def test_distribution_unknown() -> None:
+    """Test that unknown distributions and negative smoothness are rejected."""
+    with pytest.raises(ValueError, match="not supported"):
+        distribution_basis(np.zeros(3), np.ones(2), 0.0, 0.3, kind="octet")
+    with pytest.raises(ValueError, match="not supported"):
+        HyperfineDistribution(np.ones(2), kind="octet")
+    with pytest.raises(ValueError, match="non-negative"):
+        HyperfineDistribution(np.ones(2), smoothness=-1.0)
+    with pytest.raises(ValueError, match="cannot be varied"):
+        HyperfineDistribution(np.ones(3)).fit(np.zeros(3), np.zeros(3), vary=("eta",))
+
+
+@pytest.mark.moessbauer
+@pytest.mark.usefixtures("physical_constants")
+@pytest.mark.parametrize(
+    ("kind", "grid", "width"),
+    [
+        ("field", np.linspace(20.0, 40.0, 41), 3.0),
+        ("splitting", np.linspace(0.2, 2.2, 41), 0.3),
+    ],
+)
+def test_hyperfine_distribution(
+    kind: str, grid: NDArray[np.float64], width: float
+) -> None:
+    """Test the fit of a smooth distribution and its nonlinear parameters."""
+    x = np.linspace(-10, 10, 1024)
+    mean = grid[grid.size // 2]
+    weights = np.exp(-0.5 * ((grid - mean) / width) ** 2)
+    weights /= weights.sum()
+    y = distribution_basis(x, grid, isomer_shift=0.3, fwhml=0.3, kind=kind) @ weights
+    y += 0.1 + np.random.default_rng(42).normal(0.0, 1e-4, x.size)
+    result = HyperfineDistribution(grid, kind=kind, smoothness=1e-3).fit(
+        x, y, isomer_shift=0.1, fwhml=0.2
+    )
+    assert result.params["isomer_shift"] == pytest.approx(0.3, abs=1e-3)
+    assert result.params["fwhml"] == pytest.approx(0.3, abs=1e-3)
+    assert result.background == pytest.approx(0.1, abs=1e-3)
+    assert np.all(result.weights >= 0)
+    assert result.weights.sum() == pytest.approx(1.0, rel=1e-2)
+    assert np.sum(result.weights * grid) == pytest.approx(mean, rel=1e-2)
+    assert result.chisqr < 1e-4
+    assert result.nfev > 1
+
+
 @pytest.mark.moessbauer
 def test_moessbauer_singlet_synthetic(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test synthetic peak creation in moessbauer_singlet when result is all background."""
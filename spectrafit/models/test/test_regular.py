@@ -8,7 +8,9 @@ import numpy as np
 import pytest
 
 from scipy.signal import find_peaks
+from scipy.special import wofz
 
+from spectrafit.models import regular
 from spectrafit.models.regular import FWHMG2SIG
 from spectrafit.models.regular import FWHML2SIG
 from spectrafit.models.regular import FWHMV2SIG
@@ -152,3 +154,105 @@ def test_constants_values() -> None:
     assert np.isclose(FWHMG2SIG, expected_fwhmg2sig, rtol=1e-10)
     assert np.isclose(FWHML2SIG, expected_fwhml2sig, rtol=1e-10)
     assert np.isclose(FWHMV2SIG, expected_fwhmv2sig, rtol=1e-10)
+
+
+@pytest.mark.models
+@pytest.mark.parametrize(
+    ("function_name", "kwargs"),
+    [
+        ("gaussian", {"amplitude": 2.0, "center": 4.0, "fwhmg": 1.3}),
+        ("orcagaussian", {"amplitude": 2.0, "center": 4.0, "width": 1.3}),
+        ("lorentzian", {"amplitude": 2.0, "center": 4.0, "fwhml": 1.3}),
+        ("voigt", {"center": 4.0, "fwhmv": 1.3}),
+        ("voigt", {"center": 4.0, "fwhmv": 1.3, "gamma": 0.7}),
+        (
+            "pseudovoigt",
+            {"amplitude": 2.0, "center": 4.0, "fwhmg": 1.3, "fwhml": 0.8},
+        ),
+        ("exponential", {"amplitude": 2.0, "decay": 3.0, "intercept": 0.5}),
+        ("linear", {"slope": 2.0, "intercept": 0.5}),
+        ("constant", {"amplitude": 2.0}),
+        ("erf_step", {"amplitude": 2.0, "center": 4.0, "sigma": 1.3}),
+        ("atan_step", {"amplitude": 2.0, "center": 4.0, "sigma": 1.3}),
+        ("log_step", {"amplitude": 2.0, "center": 0.1, "sigma": 1.3}),
+        (
+            "polynom3",
+            {
+                "coefficient0": 1.0,
+                "coefficient1": 2.0,
+                "coefficient2": 3.0,
+                "coefficient3": 0.4,
+            },
+        ),
+    ],
+)
+def test_jacobian_matches_finite_differences(
+    function_name: str,
+    kwargs: dict[str, float],
+) -> None:
+    """Test the analytic derivatives against central finite differences."""
+    x = np.linspace(0.5, 10, 50)
+    function = getattr(regular, function_name)
+    jacobian = getattr(regular, f"{function_name}_jacobian")(x, **kwargs)
+    assert jacobian.keys() == kwargs.keys()
+    step = 1e-6
+    for key, value in kwargs.items():
+        upper = function(x, **{**kwargs, key: value + step})
+        lower = function(x, **{**kwargs, key: value - step})
+        np.testing.assert_allclose(
+            jacobian[key],
+            (upper - lower) / (2 * step),
+            rtol=1e-5,
+            atol=1e-7,
+        )
+
+
+@pytest.mark.models
+@pytest.mark.parametrize("y", [1e-3, 0.1, 0.7, 5.0, 30.0])
+def test_humlicek_relative_error(y: float) -> None:
+    """Test the documented relative error of the Humlicek approximation."""
+    z = np.linspace(-40, 40, 20001) + 1j * y
+    reference = wofz(z)
+    approximation = regular.humlicek(z)
+    assert np.max(np.abs(approximation.real / reference.real - 1)) < 1e-4
+    assert np.max(np.abs(approximation / reference - 1)) < 1e-4
+
+
+@pytest.mark.models
+def test_humlicek_lower_half_plane() -> None:
+    """Test the reflection of the Humlicek approximation to the lower half-plane."""
+    z = np.linspace(-10, 10, 2001) - 0.5j
+    np.testing.assert_allclose(regular.humlicek(z), wofz(z), rtol=1e-4)
+
+
+@pytest.mark.models
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"center": 4.0, "fwhmv": 1.3}, {"center": 4.0, "fwhmv": 1.3, "gamma": 0.7}],
+)
+def test_voigt_approximation(kwargs: dict[str, float]) -> None:
+    """Test the Voigt distribution and its derivatives by the Humlicek approximation."""
+    x = np.linspace(-20, 30, 501)
+    np.testing.assert_allclose(
+        regular.voigt(x, **kwargs, approximation="humlicek"),
+        regular.voigt(x, **kwargs),
+        rtol=1e-4,
+    )
+    reference = regular.voigt_jacobian(x, **kwargs)
+    for key, value in regular.voigt_jacobian(
+        x,
+        **kwargs,
+        approximation="humlicek",
+    ).items():
+        np.testing.assert_allclose(
+            value,
+            reference[key],
+            atol=1e-3 * np.abs(reference[key]).max(),
+        )
+
+
+@pytest.mark.models
+def test_faddeeva_unknown() -> None:
+    """Test the error of an unknown implementation of the Faddeeva function."""
+    with pytest.raises(ValueError, match="not supported"):
+        regular.faddeeva(np.array([1j]), approximation="unknown")
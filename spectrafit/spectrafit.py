@@ -10,10 +10,12 @@ from typing import TYPE_CHECKING
 from typing import Any
 
 from spectrafit.api.cmd_model import CMDModelAPI
+from spectrafit.api.tools_model import SolverModelsAPI
 from spectrafit.models.builtin import SolverModels
 from spectrafit.plotting import PlotSpectra
 from spectrafit.report import PrintingResults
 from spectrafit.report import PrintingStatus
+from spectrafit.tools import FitCache
 from spectrafit.tools import PostProcessing
 from spectrafit.tools import PreProcessing
 from spectrafit.tools import SaveResult
@@ -90,6 +92,25 @@ def get_args() -> dict[str, Any]:
         default=0,
         help="Number of smooth points for lmfit; default to 0.",
     )
+    parser.add_argument(
+        "-sm",
+        "--smooth_method",
+        type=str,
+        default="box",
+        choices=["box", "gaussian", "savgol", "kernel"],
+        help=(
+            "Filter of the smoothing. The options are 'box' (default) for the moving "
+            "average, 'gaussian' for a Gaussian of the FWHM 'smooth', 'savgol' for "
+            "the Savitzky-Golay filter, and 'kernel' for the convolution with the "
+            "'smooth_kernel' of the input file."
+        ),
+    )
+    parser.add_argument(
+        "--smooth_order",
+        type=int,
+        default=2,
+        help="Polynomial order of the Savitzky-Golay filter; default to 2.",
+    )
     parser.add_argument(
         "-sh",
         "--shift",
@@ -153,6 +174,69 @@ def get_args() -> dict[str, Any]:
             "self-defined global fitting routines."
         ),
     )
+    parser.add_argument(
+        "-be",
+        "--backend",
+        help=(
+            "Kernel backend of the models. The options are 'numpy' (default), "
+            "'numexpr', and 'numba', which require the corresponding optional "
+            "dependency."
+        ),
+        type=str,
+        default="numpy",
+        choices=["numpy", "numexpr", "numba"],
+    )
+    parser.add_argument(
+        "-ca",
+        "--cache",
+        type=str,
+        default=None,
+        help=(
+            "Directory of the fit cache, which skips the minimization for known "
+            "data and settings; default to None for no caching."
+        ),
+    )
+    parser.add_argument(
+        "-dc",
+        "--data_cache",
+        action="store_true",
+        default=False,
+        help=(
+            "Store the parsed data as binary sidecar next to the data file, which "
+            "is memory-mapped in later runs; default to False."
+        ),
+    )
+    parser.add_argument(
+        "--cache_size",
+        type=float,
+        default=None,
+        help="Maximum size of the fit cache in megabytes; default to None.",
+    )
+    parser.add_argument(
+        "--cache_age",
+        type=float,
+        default=None,
+        help="Maximum age of the unused cache entries in days; default to None.",
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        default=None,
+        help=(
+            "Wall-clock budget of the fit in seconds, after which the fit is aborted "
+            "with the best parameters so far; default to None."
+        ),
+    )
+    parser.add_argument(
+        "--progress",
+        type=str,
+        default=None,
+        help=(
+            "Stream the progress of the fit as JSON lines to 'stderr' or to the "
+            "given file; default to None."
+        ),
+    )
     parser.add_argument(
         "-auto",
         "--autopeak",
@@ -234,6 +318,21 @@ def command_line_runner(args: dict[str, Any] | None = None) -> None:
 def extracted_from_command_line_runner() -> dict[str, Any]:
     """Extract the input commands from the terminal.
 
+    Returns:
+        Dict[str, Any]: The input file arguments as a dictionary with additional
+             information beyond the command line arguments.
+
+    """
+    return merge_input_file(get_args())
+
+
+def merge_input_file(result: dict[str, Any]) -> dict[str, Any]:
+    """Merge the input file into the command line arguments.
+
+    Args:
+        result (Dict[str, Any]): The command line arguments including the name of
+             the input file as `input`.
+
     Raises:
         KeyError: Missing key `minimizer` in `parameters`.
         KeyError: Missing key `optimizer` in `parameters`.
@@ -243,7 +342,6 @@ def extracted_from_command_line_runner() -> dict[str, Any]:
              information beyond the command line arguments.
 
     """
-    result: dict[str, Any] = get_args()
     _args: MutableMapping[str, Any] = read_input_file(result["input"])
 
     if "settings" in _args:
@@ -275,12 +373,50 @@ def extracted_from_command_line_runner() -> dict[str, Any]:
             result["conf_interval"] = _args["fitting"]["parameters"]["conf_interval"]
         else:
             result["conf_interval"] = None
+        result.update(solver_settings(_args["fitting"]["parameters"]))
+    merge_monitor(result)
 
     if "peaks" in _args["fitting"]:
         result["peaks"] = _args["fitting"]["peaks"]
     return result
 
 
+def solver_settings(parameters: dict[str, Any]) -> dict[str, Any]:
+    """Return the additional settings of the solver from the input file.
+
+    Args:
+        parameters (Dict[str, Any]): The `parameters` of the `fitting` section of
+             the input file.
+
+    Returns:
+        Dict[str, Any]: The settings of the `SolverModelsAPI` beyond the
+             `minimizer` and the `optimizer`, e.g. the `multistart`.
+
+    """
+    return {
+        key: parameters[key]
+        for key in SolverModelsAPI.model_fields.keys() - {"minimizer", "optimizer"}
+        & parameters.keys()
+    }
+
+
+def merge_monitor(result: dict[str, Any]) -> None:
+    """Merge the command line options of the fit monitor into its settings.
+
+    Args:
+        result (Dict[str, Any]): The input file arguments, whose `timeout` and
+             `progress` overwrite the corresponding keys of the `monitor`.
+
+    """
+    monitor = {
+        key: result[key]
+        for key in ("timeout", "progress")
+        if result.get(key) is not None
+    }
+    if monitor:
+        result["monitor"] = {**(result.get("monitor") or {}), **monitor}
+
+
 def fitting_routine(args: dict[str, Any]) -> tuple[pd.DataFrame, dict[str, Any]]:
     """Run the fitting algorithm.
 
@@ -299,7 +435,14 @@ def fitting_routine(args: dict[str, Any]) -> tuple[pd.DataFrame, dict[str, Any]]
     """
     df: pd.DataFrame = load_data(args)
     df, args = PreProcessing(df=df, args=args)()
-    minimizer, result = SolverModels(df=df, args=args)()
+    if args.get("cache"):
+        minimizer, result = FitCache(
+            args["cache"],
+            max_size=args.get("cache_size"),
+            max_age=args.get("cache_age"),
+        )(df=df, args=args)
+    else:
+        minimizer, result = SolverModels(df=df, args=args)()
     df, args = PostProcessing(df=df, args=args, minimizer=minimizer, result=result)()
     PrintingResults(args=args, minimizer=minimizer, result=result)()
 
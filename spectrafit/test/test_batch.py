@@ -0,0 +1,255 @@
+"""Testing of the batch fitting."""
+
+from __future__ import annotations
+
+import csv
+import json
+import shutil
+import sys
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from spectrafit.batch import BatchFitting
+from spectrafit.batch import get_args
+from spectrafit.batch import warm_start
+
+
+DATA = Path("spectrafit/test/import/test_data.txt")
+
+
+@pytest.fixture
+def batch_dir(tmp_path: Path) -> Path:
+    """Fixture for a directory with two spectra, one broken file, and the input."""
+    spectra = tmp_path / "spectra"
+    spectra.mkdir()
+    shutil.copy(DATA, spectra / "a.txt")
+    shutil.copy(DATA, spectra / "b.txt")
+    (spectra / "c.txt").write_text("no spectrum\n", encoding="utf-8")
+    fitting = {
+        "settings": {"column": [0, 1], "energy_start": -1, "energy_stop": 1},
+        "fitting": {
+            "parameters": {
+                "minimizer": {"nan_policy": "propagate", "calc_covar": True},
+                "optimizer": {"max_nfev": 1000, "method": "leastsq"},
+            },
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 1, "min": 0},
+                        "center": {"value": 0},
+                        "fwhmg": {"value": 0.5, "min": 0.01},
+                    },
+                },
+            },
+        },
+    }
+    (tmp_path / "input.json").write_text(json.dumps(fitting), encoding="utf-8")
+    return tmp_path
+
+
+def batch_args(batch_dir: Path, **kwargs: Any) -> dict[str, Any]:
+    """Return the arguments of the batch fitting."""
+    return {
+        "infiles": [str(batch_dir / "spectra" / "*.txt")],
+        "input": str(batch_dir / "input.json"),
+        "outdir": str(batch_dir / "results"),
+        "workers": 1,
+        **kwargs,
+    }
+
+
+def read_summary(batch_dir: Path) -> list[dict[str, str]]:
+    """Read the summary table of the batch fitting."""
+    with (batch_dir / "results" / "batch_summary.csv").open(encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class TestBatchFitting:
+    """Testing the batch fitting."""
+
+    def test_batch(self, batch_dir: Path) -> None:
+        """Testing the fits, the exports, the retries, and the summary table."""
+        records = BatchFitting(args=batch_args(batch_dir, retries=1))()
+        status = {Path(record["file"]).name: record for record in records}
+        assert status["a.txt"]["status"] == "success"
+        assert status["b.txt"]["status"] == "success"
+        assert status["c.txt"]["status"] == "failed"
+        assert status["c.txt"]["attempts"] == 2
+        assert status["a.txt"]["chi_square"] == pytest.approx(
+            status["b.txt"]["chi_square"],
+        )
+        for stem in ("a", "b"):
+            assert (batch_dir / "results" / f"{stem}_summary.json").is_file()
+            assert (batch_dir / "results" / f"{stem}_fit.csv").is_file()
+        assert len(read_summary(batch_dir)) == 3
+
+    def test_resume(self, batch_dir: Path) -> None:
+        """Testing that a repeated batch only refits the failed spectra."""
+        BatchFitting(args=batch_args(batch_dir, retries=0))()
+        records = BatchFitting(args=batch_args(batch_dir, retries=0))()
+        assert [Path(record["file"]).name for record in records] == ["c.txt"]
+        assert len(read_summary(batch_dir)) == 4
+
+        records = BatchFitting(args=batch_args(batch_dir, resume=False))()
+        assert len(records) == 3
+
+    def test_resume_path(
+        self,
+        batch_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Testing the order-independent prefixes and the resume by the path."""
+        other = batch_dir / "other"
+        other.mkdir()
+        shutil.copy(DATA, other / "a.txt")
+        infiles = [str(batch_dir / "spectra" / "a.txt"), str(other / "a.txt")]
+        jobs = BatchFitting(args=batch_args(batch_dir, infiles=infiles)).jobs()
+        jobs_reversed = BatchFitting(
+            args=batch_args(batch_dir, infiles=infiles[::-1]),
+        ).jobs()
+        assert jobs == jobs_reversed
+        assert len(set(jobs.values())) == 2
+
+        BatchFitting(args=batch_args(batch_dir, infiles=infiles[:1]))()
+        monkeypatch.chdir(batch_dir)
+        records = BatchFitting(
+            args=batch_args(batch_dir, infiles=["spectra/a.txt", "other/a.txt"]),
+        )()
+        assert [record["file"] for record in records] == [str(other / "a.txt")]
+
+    def test_process_pool(self, batch_dir: Path) -> None:
+        """Testing the batch fitting with several worker processes."""
+        records = BatchFitting(
+            args=batch_args(
+                batch_dir,
+                infiles=[str(batch_dir / "spectra" / "[ab].txt")],
+                workers=2,
+            ),
+        )()
+        assert sorted(record["status"] for record in records) == [
+            "success",
+            "success",
+        ]
+
+    def test_series(self, batch_dir: Path) -> None:
+        """Testing the warm-started series and its chunks."""
+        for stem in ("d", "e", "f"):
+            shutil.copy(DATA, batch_dir / "spectra" / f"{stem}.txt")
+        records = BatchFitting(
+            args=batch_args(batch_dir, series=True, chunks=2, retries=0),
+        )()
+        status = {Path(record["file"]).name: record for record in records}
+        assert len(status) == 6
+        assert status["c.txt"]["status"] == "failed"
+        assert status["e.txt"]["nfev"] < status["d.txt"]["nfev"]
+        assert status["f.txt"]["nfev"] < status["d.txt"]["nfev"]
+        assert status["d.txt"]["chi_square"] == pytest.approx(
+            status["f.txt"]["chi_square"],
+            rel=1e-3,
+        )
+
+    def test_series_resume(self, batch_dir: Path) -> None:
+        """Testing the seed of the first remaining spectrum of a resumed series."""
+        BatchFitting(args=batch_args(batch_dir, series=True, retries=0))()
+        batch = BatchFitting(args=batch_args(batch_dir, series=True))
+        chains, seeds = batch.chains(batch.jobs(), batch.finished())
+        assert [[Path(infile).name for infile in chain] for chain in chains] == [
+            ["c.txt"],
+        ]
+        assert seeds[0] is not None
+        assert "gaussian_center_1" in seeds[0]
+
+    def test_warm_start(self) -> None:
+        """Testing the seeding of the initial values of the peaks."""
+        peaks = {
+            "1": {
+                "gaussian": {
+                    "amplitude": {"value": 1, "min": 0},
+                    "center": {"value": 0, "vary": False},
+                    "fwhmg": {"expr": "2 * gaussian_center_1"},
+                },
+            },
+        }
+        seed = {
+            "gaussian_amplitude_1": 2.0,
+            "gaussian_center_1": 0.5,
+            "gaussian_fwhmg_1": 1.0,
+        }
+        result = warm_start(peaks=peaks, seed=seed, global_=0)
+        assert result["1"]["gaussian"]["amplitude"] == {"value": 2.0, "min": 0}
+        assert result["1"]["gaussian"]["center"] == {"value": 0.5, "vary": False}
+        assert "value" not in result["1"]["gaussian"]["fwhmg"]
+        assert peaks["1"]["gaussian"]["amplitude"]["value"] == 1
+
+        result = warm_start(
+            peaks=peaks,
+            seed={"gaussian_amplitude_1_1": 3.0},
+            global_=1,
+        )
+        assert result["1"]["gaussian"]["amplitude"]["value"] == 3.0
+
+        result = warm_start(
+            peaks={"1": peaks},
+            seed={"gaussian_amplitude_1_1": 4.0},
+            global_=2,
+        )
+        assert result["1"]["1"]["gaussian"]["amplitude"]["value"] == 4.0
+
+    def test_jobs(self, batch_dir: Path) -> None:
+        """Testing the expansion of the manifest and the unique export names."""
+        nested = batch_dir / "spectra" / "nested"
+        nested.mkdir()
+        shutil.copy(DATA, nested / "a.txt")
+        manifest = batch_dir / "manifest.txt"
+        manifest.write_text(
+            f"# spectra\n{batch_dir / 'spectra' / 'a.txt'}\n\n"
+            f"{batch_dir / 'spectra' / '**' / 'a.txt'}\n",
+            encoding="utf-8",
+        )
+        jobs = BatchFitting(
+            args=batch_args(batch_dir, infiles=[], manifest=str(manifest)),
+        ).jobs()
+        assert list(jobs) == [
+            str(batch_dir / "spectra" / "a.txt"),
+            str(nested / "a.txt"),
+        ]
+        names = [Path(outfile).name for outfile in jobs.values()]
+        assert len(set(names)) == 2
+        assert all(name.startswith("a_") for name in names)
+
+    def test_no_spectra(self, batch_dir: Path) -> None:
+        """Testing the error for missing spectra."""
+        with pytest.raises(FileNotFoundError, match="No spectra found"):
+            BatchFitting(args=batch_args(batch_dir, infiles=["missing/*.txt"]))()
+
+    def test_timeout(self, batch_dir: Path) -> None:
+        """Testing that the timeout is passed to the monitor of each fit."""
+        batch = BatchFitting(args=batch_args(batch_dir, timeout=5))
+        assert batch.fit_args["monitor"] == {"timeout": 5}
+        assert "monitor" not in BatchFitting(args=batch_args(batch_dir)).fit_args
+
+    def test_get_args(self, monkeypatch: Any) -> None:
+        """Testing the command line arguments."""
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "spectrafit-batch",
+                "a.txt",
+                "b/*.txt",
+                "-w",
+                "3",
+                "-t",
+                "30",
+                "--no-resume",
+            ],
+        )
+        args = get_args()
+        assert args["infiles"] == ["a.txt", "b/*.txt"]
+        assert args["workers"] == 3
+        assert args["resume"] is False
+        assert args["retries"] == 1
+        assert args["timeout"] == 30
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import gzip
+import os
 import pickle
 
 from pathlib import Path
@@ -16,13 +17,17 @@ from pandas._testing import assert_frame_equal
 
 from spectrafit.models.builtin import DistributionModels
 from spectrafit.models.builtin import SolverModels
+from spectrafit.tools import DataCache
+from spectrafit.tools import FitCache
 from spectrafit.tools import PostProcessing
 from spectrafit.tools import PreProcessing
 from spectrafit.tools import SaveResult
 from spectrafit.tools import check_keywords_consistency
 from spectrafit.tools import exclude_none_dictionary
+from spectrafit.tools import load_data
 from spectrafit.tools import pkl2any
 from spectrafit.tools import pure_fname
+from spectrafit.tools import read_data
 from spectrafit.tools import transform_nested_types
 from spectrafit.tools import unicode_check
 
@@ -280,6 +285,93 @@ class TestPreProcessing:
             PreProcessing(random_dataframe, args)()[0]["energy"].min() == args["shift"]
         )
 
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_pipeline(self, descending: bool) -> None:
+        """Testing that the pipeline only copies the changed columns."""
+        energy = np.linspace(0, 10, 101)
+        df = pd.DataFrame(
+            np.column_stack(
+                [
+                    energy[::-1] if descending else energy,
+                    np.random.default_rng(0).normal(size=(101, 3)),
+                ],
+            ),
+            columns=["energy", "a", "b", "c"],
+        )
+        args = {
+            "energy_start": 2,
+            "energy_stop": 7.5,
+            "shift": 0.5,
+            "oversampling": None,
+            "smooth": 3,
+            "column": ["energy", "a"],
+        }
+        result, args = PreProcessing(df, args)()
+        expected = df[(df["energy"] >= 2) & (df["energy"] <= 7.5)].copy()
+        expected["energy"] += 0.5
+        expected["a"] = np.convolve(expected["a"], np.ones(3) / 3, mode="same")
+        assert_frame_equal(result, expected)
+        assert np.shares_memory(result["c"].to_numpy(), df["c"].to_numpy())
+        assert args["preprocessing_insights"] == {
+            "input": 0,
+            "range": 0,
+            "shift": 56 * 8,
+            "smooth": 56 * 8,
+        }
+
+    def test_pipeline_unsorted(self, random_dataframe: pd.DataFrame) -> None:
+        """Testing the energy range and the oversampling of an unsorted axis."""
+        df = random_dataframe.sample(frac=1, random_state=0)
+        args = {
+            "energy_start": 2,
+            "energy_stop": 6,
+            "shift": 1.0,
+            "oversampling": True,
+            "smooth": None,
+            "column": ["energy", "intensity"],
+        }
+        result, args = PreProcessing(df, args)()
+        expected = PreProcessing.oversampling(
+            PreProcessing.energy_shift(PreProcessing.energy_range(df, args), args),
+            args,
+        )
+        assert_frame_equal(result, expected)
+        assert args["preprocessing_insights"]["range"] > 0
+
+    @pytest.mark.parametrize("method", ["box", "gaussian", "savgol", "kernel"])
+    def test_smoothing_global(self, method: str) -> None:
+        """Testing that all intensity columns of a global fit are smoothed."""
+        df = pd.DataFrame(
+            np.column_stack(
+                [
+                    np.linspace(0, 10, 101),
+                    np.random.default_rng(0).normal(size=(101, 3)),
+                ],
+            ),
+            columns=["energy", "a", "b", "c"],
+        )
+        args = {
+            "energy_start": None,
+            "energy_stop": None,
+            "shift": 0.5,
+            "oversampling": None,
+            "smooth": 5,
+            "smooth_method": method,
+            "smooth_kernel": [0.25, 0.5, 0.25],
+            "column": ["energy"],
+            "global_": 1,
+        }
+        result, args = PreProcessing(df, args)()
+        expected = PreProcessing.smooth_signal(
+            PreProcessing.energy_shift(df, args),
+            args,
+        )
+        assert_frame_equal(result, expected)
+        for column in ("a", "b", "c"):
+            smoothed = PreProcessing.smooth(df[column].to_numpy(), args)
+            np.testing.assert_allclose(result[column], smoothed)
+        assert args["preprocessing_insights"]["smooth"] == 2 * 101 * 4 * 8 - 101 * 8
+
     def test_return_args(self, random_dataframe: pd.DataFrame) -> None:
         """Testing return args."""
         args = {
@@ -439,6 +531,288 @@ class TestPostProcessing:
         pp.make_insight_report()
         assert pp.args["confidence_interval"] == {}
 
+    @pytest.mark.parametrize("trace", [True, False])
+    def test_insight_report_parallel_conf_interval(self, trace: bool) -> None:
+        """Testing the parallel confidence intervals against the serial ones."""
+        x = np.linspace(-5, 5, 200, dtype=np.float64)
+        noise = np.random.default_rng(0).normal(scale=0.01, size=x.size)
+        df = pd.DataFrame(
+            {
+                "energy": x,
+                "intensity": DistributionModels.gaussian(x, 1, 0.5, 1.5) + noise,
+            },
+        )
+        confidence_interval = {}
+        traces = {}
+        for workers in (None, 2):
+            args = {
+                "autopeak": False,
+                "global_": 0,
+                "column": ["energy", "intensity"],
+                "minimizer": {"nan_policy": "propagate", "calc_covar": True},
+                "optimizer": {"max_nfev": 1000, "method": "leastsq"},
+                "conf_interval": {"sigmas": [1, 2], "trace": trace},
+                "peaks": {
+                    "1": {
+                        "gaussian": {
+                            "amplitude": {"value": 2, "min": 0},
+                            "center": {"value": 0},
+                            "fwhmg": {"value": 1, "min": 0.1},
+                        },
+                    },
+                },
+            }
+            if workers is not None:
+                args["conf_interval"]["workers"] = workers
+            minimizer, result = SolverModels(df=df, args=args)()
+            pp = PostProcessing(df=df, args=args, minimizer=minimizer, result=result)
+            pp.make_insight_report()
+            if trace:
+                confidence_interval[workers], traces[workers] = pp.args[
+                    "confidence_interval"
+                ]
+            else:
+                confidence_interval[workers] = pp.args["confidence_interval"]
+            assert args["conf_interval"].get("workers") == workers
+
+        assert confidence_interval[2].keys() == confidence_interval[None].keys()
+        for name, limits in confidence_interval[None].items():
+            assert len(confidence_interval[2][name]) == len(limits) == 5
+            for (prob, value), (prob_2, value_2) in zip(
+                limits,
+                confidence_interval[2][name],
+            ):
+                assert prob_2 == pytest.approx(prob)
+                assert value_2 == pytest.approx(value, rel=1e-3)
+        if trace:
+            assert traces[2].keys() == traces[None].keys()
+            for name, trace_dict in traces[None].items():
+                assert traces[2][name].keys() == trace_dict.keys()
+
+
+class TestFitCache:
+    """Test the fit cache."""
+
+    @pytest.fixture
+    def df_cache(self) -> pd.DataFrame:
+        """Fixture for a noisy Gaussian."""
+        x = np.linspace(-5, 5, 100, dtype=np.float64)
+        noise = np.random.default_rng(0).normal(scale=0.01, size=x.size)
+        return pd.DataFrame(
+            {
+                "energy": x,
+                "intensity": DistributionModels.gaussian(x, 1, 0.5, 1.5) + noise,
+            },
+        )
+
+    @staticmethod
+    def args_cache() -> dict[str, Any]:
+        """Return the arguments of the fit."""
+        return {
+            "autopeak": False,
+            "global_": 0,
+            "column": ["energy", "intensity"],
+            "minimizer": {"nan_policy": "propagate", "calc_covar": True},
+            "optimizer": {"max_nfev": 1000, "method": "leastsq"},
+            "conf_interval": None,
+            "multistart": {"starts": 2, "workers": 1, "seed": 0},
+            "peaks": {
+                "1": {
+                    "gaussian": {
+                        "amplitude": {"value": 2, "min": 0},
+                        "center": {"value": 0},
+                        "fwhmg": {"value": 1, "min": 0.1},
+                    },
+                },
+            },
+        }
+
+    def test_hit(
+        self,
+        df_cache: pd.DataFrame,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Testing that a cache hit reproduces the fit without minimization."""
+        cache = FitCache(tmp_path)
+        args = self.args_cache()
+        minimizer, result = cache(df=df_cache, args=args)
+        assert len(list(tmp_path.glob("*.npz"))) == 1
+        _, args = PostProcessing(
+            df=df_cache,
+            args=args,
+            minimizer=minimizer,
+            result=result,
+        )()
+
+        def fail(*_: Any) -> None:
+            msg = "The minimizer must not be called for a cache hit!"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(SolverModels, "__call__", fail)
+        args_hit = self.args_cache()
+        minimizer_hit, result_hit = cache(df=df_cache, args=args_hit)
+        for name, param in result.params.items():
+            assert result_hit.params[name].value == param.value
+            assert result_hit.params[name].stderr == param.stderr
+        np.testing.assert_array_equal(result_hit.covar, result.covar)
+        assert minimizer_hit.max_nfev == minimizer.max_nfev
+        multistart = args["multistart_insights"]
+        assert args_hit["multistart_insights"]["best"] == multistart["best"]
+        _, args_hit = PostProcessing(
+            df=df_cache,
+            args=args_hit,
+            minimizer=minimizer_hit,
+            result=result_hit,
+        )()
+        insights = args["fit_insights"]
+        assert args_hit["fit_insights"]["statistics"] == insights["statistics"]
+        assert args_hit["fit_insights"]["variables"] == insights["variables"]
+
+    def test_types(self, df_cache: pd.DataFrame, tmp_path: Path) -> None:
+        """Testing that a cache hit returns the same types as the fit."""
+
+        def types(obj: Any) -> Any:
+            if isinstance(obj, dict):
+                return {key: types(value) for key, value in obj.items()}
+            if isinstance(obj, (list, tuple)):
+                return [type(obj), *[types(value) for value in obj]]
+            return type(obj)
+
+        cache = FitCache(tmp_path)
+        insights = []
+        for _ in range(2):
+            args = self.args_cache()
+            args["conf_interval"] = {"sigmas": [1, 2]}
+            minimizer, result = cache(df=df_cache, args=args)
+            _, args = PostProcessing(
+                df=df_cache,
+                args=args,
+                minimizer=minimizer,
+                result=result,
+            )()
+            insights.append(
+                types(
+                    {key: args[key] for key in ("fit_insights", "confidence_interval")}
+                ),
+            )
+        assert insights[1] == insights[0]
+        assert result.init_vals is not None
+
+    def test_key(self, df_cache: pd.DataFrame) -> None:
+        """Testing that the key depends on the data, the peaks, and the solver."""
+        args = self.args_cache()
+        key = FitCache.key(df_cache, args)
+        assert key == FitCache.key(df_cache.copy(), self.args_cache())
+
+        df_shifted = df_cache.copy()
+        df_shifted["intensity"] += 1e-12
+        assert FitCache.key(df_shifted, args) != key
+
+        args_peaks = self.args_cache()
+        args_peaks["peaks"]["1"]["gaussian"]["center"]["value"] = 0.1
+        assert FitCache.key(df_cache, args_peaks) != key
+
+        args_solver = self.args_cache()
+        args_solver["optimizer"]["method"] = "least_squares"
+        assert FitCache.key(df_cache, args_solver) != key
+
+    def test_evict(self, df_cache: pd.DataFrame, tmp_path: Path) -> None:
+        """Testing the eviction by size and age."""
+        for center in (0.0, 0.1, 0.2):
+            args = self.args_cache()
+            args["peaks"]["1"]["gaussian"]["center"]["value"] = center
+            FitCache(tmp_path)(df=df_cache, args=args)
+        entries = sorted(tmp_path.glob("*.npz"))
+        assert len(entries) == 3
+
+        os.utime(entries[0], (0, 0))
+        FitCache(tmp_path, max_age=1).evict()
+        assert not entries[0].exists()
+        assert entries[1].exists()
+
+        size = entries[1].stat().st_size
+        FitCache(tmp_path, max_size=1.5 * size / 1024**2).evict()
+        assert len(list(tmp_path.glob("*.npz"))) == 1
+
+
+class TestDataCache:
+    """Test the binary sidecar of the data file."""
+
+    @staticmethod
+    def args_data(infile: Path, global_: int) -> dict[str, Any]:
+        """Return the arguments of the parser."""
+        return {
+            "infile": infile,
+            "global_": global_,
+            "column": [0, 2],
+            "separator": ",",
+            "header": None,
+            "decimal": ".",
+            "comment": None,
+            "data_cache": True,
+        }
+
+    @pytest.mark.parametrize("global_", [0, 1])
+    def test_sidecar(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        global_: int,
+    ) -> None:
+        """Testing that the sidecar reproduces the parsed data without parsing."""
+        infile = tmp_path / "data.csv"
+        data = np.random.default_rng(0).normal(size=(20, 4))
+        np.savetxt(infile, data, delimiter=",")
+        args = self.args_data(infile, global_)
+        df = load_data(args)
+        assert len(list(tmp_path.glob(".data.csv.*.npy"))) == 1
+
+        def fail(*_: Any, **__: Any) -> None:
+            msg = "The data file must not be parsed for an existing sidecar!"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(pd, "read_csv", fail)
+        df_cached = load_data(args)
+        assert_frame_equal(df_cached, df)
+        df_cached.iloc[0, 0] = 1e3
+        assert_frame_equal(load_data(args), df)
+
+    def test_outdated(self, tmp_path: Path) -> None:
+        """Testing that a changed data file or parser replaces the sidecar."""
+        infile = tmp_path / "data.csv"
+        np.savetxt(infile, np.ones((5, 3)), delimiter=",")
+        args = self.args_data(infile, 1)
+        key = DataCache(args).key()
+        load_data(args)
+        np.savetxt(infile, np.zeros((6, 3)), delimiter=",")
+        os.utime(infile, ns=(0, 0))
+        assert DataCache(args).key() != key
+        assert load_data(args).shape == (6, 3)
+        assert len(list(tmp_path.glob(".data.csv.*"))) == 2
+        assert DataCache({**args, "decimal": ","}).key() != DataCache(args).key()
+
+    @pytest.mark.parametrize("header", [None, 0])
+    def test_engine(self, tmp_path: Path, header: int | None) -> None:
+        """Testing that the pyarrow engine parses like the default engine."""
+        pytest.importorskip("pyarrow")
+        infile = tmp_path / "data.csv"
+        data = pd.DataFrame(
+            np.random.default_rng(0).normal(size=(20, 4)),
+            columns=["energy", "a", "b", "c"],
+        )
+        data.to_csv(infile, index=False, header=header is not None)
+        args = {**self.args_data(infile, 1), "header": header}
+        assert DataCache(args).engine == "pyarrow"
+        assert_frame_equal(read_data(args, engine="pyarrow"), read_data(args))
+
+    def test_engine_default(self, tmp_path: Path) -> None:
+        """Testing that only the cache of global data selects another engine."""
+        args = self.args_data(tmp_path / "data.csv", 0)
+        assert DataCache(args).engine is None
+        assert DataCache({**args, "global_": 1, "comment": "#"}).engine is None
+        assert DataCache({**args, "global_": 1, "separator": r"\s+"}).engine is None
+
 
 class TestPickle:
     """Test Pickle tool."""
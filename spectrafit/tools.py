@@ -7,28 +7,43 @@ import json
 import pickle
 import sys
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from hashlib import sha256
+from importlib.util import find_spec
 from pathlib import Path
+from time import time
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import ClassVar
 
 import numpy as np
 import pandas as pd
 import tomli
 import yaml
 
+from lmfit import Minimizer
+from lmfit import Parameters
 from lmfit.confidence import ConfidenceInterval
+from lmfit.confidence import map_trace_to_names
 from lmfit.minimizer import MinimizerException
+from lmfit.minimizer import MinimizerResult
 
+from spectrafit import __version__
 from spectrafit.api.tools_model import ColumnNamesAPI
+from spectrafit.api.tools_model import SolverModelsAPI
+from spectrafit.models.builtin import SolverModels
 from spectrafit.models.builtin import calculated_model
 from spectrafit.report import RegressionMetrics
 from spectrafit.report import fit_report_as_dict
+from spectrafit.utilities.smoothing import smooth_signal
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from collections.abc import MutableMapping
 
-    from lmfit import Minimizer
+    from numpy.typing import NDArray
 
 
 class PreProcessing:
@@ -62,25 +77,185 @@ class PreProcessing:
             Dict[str,Any]: Adding a descriptive statistics to the input dictionary.
 
         """
-        df_copy: pd.DataFrame = self.df.copy()
-        self.args["data_statistic"] = df_copy.describe(
+        self.args["data_statistic"] = self.df.describe(
             percentiles=np.arange(0.1, 1.0, 0.1).tolist(),
         ).to_dict(orient="split")
         try:
-            if isinstance(self.args["energy_start"], (int, float)) or isinstance(
-                self.args["energy_stop"],
-                (int, float),
-            ):
-                df_copy = self.energy_range(df_copy, self.args)
-            if self.args["shift"]:
-                df_copy = self.energy_shift(df_copy, self.args)
-            if self.args["oversampling"]:
-                df_copy = self.oversampling(df_copy, self.args)
-            if self.args["smooth"]:
-                df_copy = self.smooth_signal(df_copy, self.args)
+            df = self.pipeline()
         except KeyError:
             sys.exit(1)
-        return (df_copy, self.args)
+        return (df, self.args)
+
+    def pipeline(self) -> pd.DataFrame:
+        """Apply all pre-processing-filters on the array of the data.
+
+        !!! info "About the copy-free pre-processing"
+
+            Instead of copying the DataFrame in every filter, the filters are
+            applied to the `NumPy` array of the data, and the DataFrame is built
+            once from the processed array without copying it. The energy range of
+            a sorted energy axis is selected by `numpy.searchsorted`, which results
+            in a view of the rows. The shift and the smoothing only replace their
+            column, or are applied in place, if the array is already owned by the
+            pre-processing, e.g. after the oversampling. The bytes copied by each
+            filter are reported as `preprocessing_insights`.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the pre-processed input data.
+
+        """
+        args = self.args
+        columns, index = self.df.columns, self.df.index
+        values = self.df.to_numpy(dtype=np.float64)
+        owned = not columns.size or not np.may_share_memory(
+            values,
+            self.df.iloc[:, 0].to_numpy(),
+        )
+        insights = {"input": values.nbytes if owned else 0}
+        replaced: dict[int, NDArray[np.float64]] = {}
+        if isinstance(args["energy_start"], (int, float)) or isinstance(
+            args["energy_stop"],
+            (int, float),
+        ):
+            energy = values[:, columns.get_loc(args["column"][0])]
+            rows = self.energy_slice(energy, args)
+            values, index = values[rows], index[rows]
+            insights["range"] = 0 if isinstance(rows, slice) else values.nbytes
+            owned |= not isinstance(rows, slice)
+        if args["shift"]:
+            loc = columns.get_loc(args["column"][0])
+            if owned:
+                values[:, loc] += args["shift"]
+            else:
+                replaced[loc] = values[:, loc] + args["shift"]
+            insights["shift"] = 0 if owned else replaced[loc].nbytes
+        if args["oversampling"]:
+            locs = [columns.get_loc(column) for column in args["column"][:2]]
+            energy, intensity = (replaced.get(loc, values[:, loc]) for loc in locs)
+            values = np.column_stack(self.oversample(energy, intensity))
+            columns, index = pd.Index(args["column"][:2]), pd.RangeIndex(len(values))
+            replaced, owned = {}, True
+            insights["oversampling"] = values.nbytes
+        if args["smooth"] or args.get("smooth_method") == "kernel":
+            locs = self.intensity_columns(columns, args)
+            insights["smooth"] = 0
+            if len(locs) > 1 and not owned:
+                values, owned = np.array(values), True
+                for loc, column in replaced.items():
+                    values[:, loc] = column
+                replaced = {}
+                insights["smooth"] = values.nbytes
+            if owned:
+                smoothed = self.smooth(values[:, locs], args)
+                values[:, locs] = smoothed
+            else:
+                smoothed = self.smooth(replaced.get(locs[0], values[:, locs[0]]), args)
+                replaced[locs[0]] = smoothed
+            insights["smooth"] += smoothed.nbytes
+        df = pd.DataFrame(values, index=index, columns=columns, copy=False)
+        for loc, column in replaced.items():
+            df.isetitem(loc, column)
+        args["preprocessing_insights"] = insights
+        return df
+
+    @staticmethod
+    def energy_slice(
+        energy: NDArray[np.float64],
+        args: dict[str, Any],
+    ) -> slice | NDArray[np.bool_]:
+        """Select the rows within the energy range.
+
+        Args:
+            energy (NDArray[np.float64]): Energy axis of the data.
+            args (Dict[str,Any]): The input file arguments as a dictionary with
+                 additional information beyond the command line arguments.
+
+        Returns:
+            Union[slice, NDArray[np.bool_]]: Slice of the rows for a monotonic
+                energy axis, otherwise the boolean mask of the rows.
+
+        """
+        start = args["energy_start"]
+        stop = args["energy_stop"]
+        start = -np.inf if not isinstance(start, (int, float)) else start
+        stop = np.inf if not isinstance(stop, (int, float)) else stop
+        step = np.diff(energy)
+        if np.all(step >= 0):
+            return slice(
+                int(np.searchsorted(energy, start, side="left")),
+                int(np.searchsorted(energy, stop, side="right")),
+            )
+        if np.all(step <= 0):
+            reverse = energy[::-1]
+            return slice(
+                energy.size - int(np.searchsorted(reverse, stop, side="right")),
+                energy.size - int(np.searchsorted(reverse, start, side="left")),
+            )
+        return (energy >= start) & (energy <= stop)
+
+    @staticmethod
+    def oversample(
+        energy: NDArray[np.float64],
+        intensity: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Oversample the intensity by the factor of 5 by linear interpolation.
+
+        Args:
+            energy (NDArray[np.float64]): Energy axis of the data.
+            intensity (NDArray[np.float64]): Intensity of the data.
+
+        Returns:
+            Tuple[NDArray[np.float64], NDArray[np.float64]]: Oversampled energy axis
+                and intensity.
+
+        """
+        x_values = np.linspace(energy.min(), energy.max(), 5 * energy.size)
+        return x_values, np.interp(x_values, energy, intensity)
+
+    @staticmethod
+    def intensity_columns(columns: pd.Index, args: dict[str, Any]) -> list[int]:
+        """Return the position of the intensity columns.
+
+        Args:
+            columns (pd.Index): Columns of the data.
+            args (Dict[str,Any]): The input file arguments as a dictionary with
+                 additional information beyond the command line arguments.
+
+        Returns:
+            List[int]: Position of all columns except the energy axis in case of
+                global fitting, otherwise the position of the second column of
+                `column`.
+
+        """
+        if args.get("global_"):
+            energy = columns.get_loc(args["column"][0])
+            return [loc for loc in range(columns.size) if loc != energy]
+        return [columns.get_loc(args["column"][1])]
+
+    @staticmethod
+    def smooth(
+        intensity: NDArray[np.float64],
+        args: dict[str, Any],
+    ) -> NDArray[np.float64]:
+        """Smooth the intensity by the filter of the input file.
+
+        Args:
+            intensity (NDArray[np.float64]): Intensity of the shape `(n_points,)` or
+                `(n_points, n_spectra)`.
+            args (Dict[str,Any]): The input file arguments as a dictionary with
+                 additional information beyond the command line arguments.
+
+        Returns:
+            NDArray[np.float64]: Smoothed intensity.
+
+        """
+        return smooth_signal(
+            intensity,
+            args["smooth"],
+            method=args.get("smooth_method", "box"),
+            order=args.get("smooth_order", 2),
+            kernel=args.get("smooth_kernel"),
+        )
 
     @staticmethod
     def energy_range(df: pd.DataFrame, args: dict[str, Any]) -> pd.DataFrame:
@@ -98,23 +273,8 @@ class PreProcessing:
                  (`x` and `data`), which are shrinked according to the energy range.
 
         """
-        energy_start: int | float = args["energy_start"]
-        energy_stop: int | float = args["energy_stop"]
-
-        df_copy = df.copy()
-        if isinstance(energy_start, (int, float)) and isinstance(
-            energy_stop,
-            (int, float),
-        ):
-            return df_copy.loc[
-                (df[args["column"][0]] >= energy_start)
-                & (df[args["column"][0]] <= energy_stop)
-            ]
-        if isinstance(energy_start, (int, float)):
-            return df_copy.loc[df[args["column"][0]] >= energy_start]
-        if isinstance(energy_stop, (int, float)):
-            return df_copy.loc[df[args["column"][0]] <= energy_stop]
-        return None  # pragma: no cover
+        rows = PreProcessing.energy_slice(df[args["column"][0]].to_numpy(), args)
+        return df.iloc[rows]
 
     @staticmethod
     def energy_shift(df: pd.DataFrame, args: dict[str, Any]) -> pd.DataFrame:
@@ -132,10 +292,8 @@ class PreProcessing:
                  (`x` and `data`), which are energy-shifted by the given value.
 
         """
-        df_copy: pd.DataFrame = df.copy()
-        df_copy.loc[:, args["column"][0]] = (
-            df[args["column"][0]].to_numpy() + args["shift"]
-        )
+        df_copy: pd.DataFrame = df.copy(deep=False)
+        df_copy[args["column"][0]] = df[args["column"][0]].to_numpy() + args["shift"]
         return df_copy
 
     @staticmethod
@@ -160,13 +318,7 @@ class PreProcessing:
                  (`x` and `data`), which are oversampled by the factor of 5.
 
         """
-        x_values = np.linspace(
-            df[args["column"][0]].min(),
-            df[args["column"][0]].max(),
-            5 * df.shape[0],
-        )
-        y_values = np.interp(
-            x_values,
+        x_values, y_values = PreProcessing.oversample(
             df[args["column"][0]].to_numpy(),
             df[args["column"][1]].to_numpy(),
         )
@@ -176,6 +328,12 @@ class PreProcessing:
     def smooth_signal(df: pd.DataFrame, args: dict[str, Any]) -> pd.DataFrame:
         """Smooth the intensity values.
 
+        !!! note "About the smoothing"
+
+            The filter is selected by `smooth_method`, see
+            `spectrafit.utilities.smoothing.smooth_signal`. In case of global
+            fitting, all intensity columns are smoothed in one vectorized call.
+
         Args:
             df (pd.DataFrame): DataFrame containing the input data (`x` and `data`).
             args (Dict[str,Any]): The input file arguments as a dictionary with
@@ -186,13 +344,16 @@ class PreProcessing:
                  (`x` and `data`), which are smoothed by the given value.
 
         """
-        box = np.ones(args["smooth"]) / args["smooth"]
-        df_copy: pd.DataFrame = df.copy()
-        df_copy.loc[:, args["column"][1]] = np.convolve(
-            df[args["column"][1]].to_numpy(),
-            box,
-            mode="same",
+        locs = PreProcessing.intensity_columns(df.columns, args)
+        smoothed = PreProcessing.smooth(
+            df.iloc[:, locs].to_numpy(dtype=np.float64),
+            args,
         )
+        df_copy: pd.DataFrame = df.copy(deep=len(locs) > 1)
+        if len(locs) > 1:
+            df_copy.iloc[:, locs] = smoothed
+        else:
+            df_copy.isetitem(locs[0], smoothed[:, 0])
         return df_copy
 
 
@@ -315,11 +476,21 @@ class PostProcessing:
         if self.args["conf_interval"]:
             try:
                 _min_rel_change = self.args["conf_interval"].pop("min_rel_change", None)
-                ci = ConfidenceInterval(
-                    self.minimizer,
-                    self.result,
-                    **self.args["conf_interval"],
-                )
+                _workers = self.args["conf_interval"].pop("workers", None)
+                if _workers is not None:
+                    ci = ParallelConfidenceInterval(
+                        self.minimizer,
+                        self.result,
+                        workers=_workers,
+                        **self.args["conf_interval"],
+                    )
+                    self.args["conf_interval"]["workers"] = _workers
+                else:
+                    ci = ConfidenceInterval(
+                        self.minimizer,
+                        self.result,
+                        **self.args["conf_interval"],
+                    )
                 if _min_rel_change is not None:
                     ci.min_rel_change = _min_rel_change
                     self.args["conf_interval"]["min_rel_change"] = _min_rel_change
@@ -386,6 +557,9 @@ class PostProcessing:
             x=self.df.iloc[:, 0].to_numpy(),
             df=self.df,
             global_fit=self.args["global_"],
+            window=self.args.get("window"),
+            backend=self.args.get("backend", "numpy"),
+            faddeeva=self.args.get("faddeeva", "wofz"),
         )
 
     def export_correlation2args(self) -> None:
@@ -438,6 +612,167 @@ class PostProcessing:
         ).to_dict(orient="split")
 
 
+class ParallelConfidenceInterval(ConfidenceInterval):
+    """Confidence intervals of the parameters computed by worker processes.
+
+    !!! info "About the parallel confidence intervals"
+
+        The profile of each parameter is a sequence of independent refits for each
+        direction and sigma level. Hence, the combinations of the parameters, the
+        directions, and the sigma levels are distributed over a pool of worker
+        processes, which are refitting a copy of the problem. The limits of each
+        sigma level are bracketed by the best value instead of the limit of the
+        previous sigma level, so that they agree with the serial `calc_all_ci`
+        within the tolerance of the root finding. The `confidence_interval` and
+        the optional `trace_dict` are reassembled in the same structure.
+    """
+
+    def __init__(
+        self,
+        minimizer: Minimizer,
+        result: Any,
+        workers: int | None = None,
+        **kws: Any,
+    ) -> None:
+        """Initialize the parallel confidence intervals.
+
+        Args:
+            minimizer (Minimizer): The minimizer class of the fit.
+            result (Any): The result of the minimization of the best fit.
+            workers (int, optional): Number of worker processes. Defaults to None,
+                 which uses the number of CPUs.
+            **kws (Any): Keywords of `lmfit.confidence.ConfidenceInterval`.
+
+        """
+        super().__init__(minimizer, result, **kws)
+        self.workers = workers
+        self.kws = {
+            key: value for key, value in kws.items() if key not in {"p_names", "sigmas"}
+        }
+
+    def calc_all_ci(self) -> dict[str, list[tuple[float, float]]]:
+        """Calculate all confidence intervals in parallel.
+
+        Returns:
+            Dict[str, List[Tuple[float, float]]]: Probabilities and limits of each
+                parameter like `ConfidenceInterval.calc_all_ci`.
+
+        """
+        if self.workers == 1:
+            return super().calc_all_ci()
+        problem = {
+            "fcn_args": self.minimizer.userargs,
+            "fcn_kws": self.minimizer.userkws,
+            "scale_covar": self.minimizer.scale_covar,
+            "nan_policy": self.minimizer.nan_policy,
+            "reduce_fcn": self.minimizer.reduce_fcn,
+            "calc_covar": self.minimizer.calc_covar,
+            "max_nfev": self.minimizer.max_nfev,
+            **self.minimizer.kws,
+        }
+        result = MinimizerResult(
+            params=self.result.params,
+            var_names=self.result.var_names,
+            nvarys=self.result.nvarys,
+            ndata=self.result.ndata,
+            nfree=self.result.nfree,
+            chisqr=self.result.chisqr,
+            redchi=self.result.redchi,
+        )
+        tasks = [
+            (name, direction, sigma)
+            for name in self.p_names
+            for direction in (-1, 1)
+            for sigma in self.sigmas
+        ]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    _calc_ci,
+                    self.minimizer.userfcn,
+                    problem,
+                    result,
+                    name,
+                    direction,
+                    sigma,
+                    self.kws,
+                    self.min_rel_change,
+                )
+                for name, direction, sigma in tasks
+            ]
+            outputs = [future.result() for future in futures]
+
+        limits: dict[tuple[str, int], list[tuple[float, float]]] = {
+            (name, direction): [] for name in self.p_names for direction in (-1, 1)
+        }
+        traces: dict[str, list[list[float]]] = {name: [] for name in self.p_names}
+        for (name, direction, _), (limit, trace) in zip(tasks, outputs):
+            limits[name, direction].extend(limit)
+            traces[name].extend(trace)
+        if self.trace:
+            self.trace_dict = map_trace_to_names(traces, self.params)
+        return {
+            name: [
+                *self.truncate(limits[name, -1])[::-1],
+                (0.0, self.params[name].value),
+                *self.truncate(limits[name, 1]),
+            ]
+            for name in self.p_names
+        }
+
+    @staticmethod
+    def truncate(limits: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        """Truncate the limits after the first failed sigma level.
+
+        Args:
+            limits (List[Tuple[float, float]]): Probabilities and limits of one
+                direction in ascending order of the sigma levels.
+
+        Returns:
+            List[Tuple[float, float]]: Limits up to the first `NaN` like the serial
+                computation, which stops at the first failed root finding.
+
+        """
+        for i, (_, value) in enumerate(limits):
+            if np.isnan(value):
+                return limits[: i + 1]
+        return limits
+
+
+def _calc_ci(
+    userfcn: Callable[..., Any],
+    problem: dict[str, Any],
+    result: MinimizerResult,
+    name: str,
+    direction: int,
+    sigma: float,
+    kws: dict[str, Any],
+    min_rel_change: float,
+) -> tuple[list[tuple[float, float]], list[list[float]]]:
+    """Calculate the limit of one parameter, direction, and sigma level.
+
+    Args:
+        userfcn (Callable[..., Any]): Objective function of the minimizer.
+        problem (Dict[str, Any]): Arguments and options of the minimizer.
+        result (MinimizerResult): Parameters and statistics of the best fit.
+        name (str): Name of the parameter.
+        direction (int): Direction of the limit, which is `-1` or `1`.
+        sigma (float): Sigma level or probability of the limit.
+        kws (Dict[str, Any]): Keywords of `lmfit.confidence.ConfidenceInterval`.
+        min_rel_change (float): Minimum relative change of the probability.
+
+    Returns:
+        Tuple[List[Tuple[float, float]], List[List[float]]]: Probability and limit,
+            and the raw trace of the refits.
+
+    """
+    minimizer = Minimizer(userfcn, result.params, **problem)
+    ci = ConfidenceInterval(minimizer, result, p_names=[name], sigmas=[sigma], **kws)
+    ci.min_rel_change = min_rel_change
+    limit = ci.calc_ci(name, direction)
+    return limit, ci.trace_dict[name] if ci.trace else []
+
+
 class SaveResult:
     """Saving the result of the fitting process."""
 
@@ -547,6 +882,451 @@ class SaveResult:
             raise FileNotFoundError(msg)
 
 
+class FitCache:
+    """Content-addressed on-disk cache of the fit results.
+
+    !!! info "About the fit cache"
+
+        The key of an entry is the SHA-256 hash of the preprocessed data, the
+        definition of the parameters, the solver settings, and the version of
+        SpectraFit. Each entry is a compressed `npz`-file containing the
+        parameters of the best fit, the covariance matrix, the residual, and the
+        statistics of the fit. Hence, a cache hit skips the minimization and
+        continues with the post-processing, which recomputes the fitted frame and
+        the confidence interval from the cached parameters. Fits aborted by the
+        wall-clock budget of the `FitMonitor` are not cached, since their result
+        depends on the load of the machine.
+
+    !!! tip "About the eviction"
+
+        Entries, which have not been used for `max_age` days, are removed. If the
+        cache is larger than `max_size` megabytes, the least recently used entries
+        are removed.
+    """
+
+    # Statistics of the `MinimizerResult`, which are required by the reports
+    statistics: ClassVar[tuple[str, ...]] = (
+        "method",
+        "success",
+        "message",
+        "errorbars",
+        "nfev",
+        "ndata",
+        "nvarys",
+        "nfree",
+        "var_names",
+        "init_vals",
+        "init_values",
+        "chisqr",
+        "redchi",
+        "aic",
+        "bic",
+    )
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_size: float | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        """Initialize the fit cache.
+
+        Args:
+            directory (str | Path): Directory of the cache.
+            max_size (float, optional): Maximum size of the cache in megabytes.
+                 Defaults to None.
+            max_age (float, optional): Maximum age of the entries in days. Defaults
+                 to None.
+
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def __call__(
+        self,
+        df: pd.DataFrame,
+        args: dict[str, Any],
+    ) -> tuple[Minimizer, Any]:
+        """Solve the fitting model or load its result from the cache.
+
+        Args:
+            df (pd.DataFrame): DataFrame containing the preprocessed input data.
+            args (Dict[str, Any]): The input file arguments as a dictionary with
+                 additional information beyond the command line arguments.
+
+        Returns:
+            Tuple[Minimizer, Any]: Minimizer class and the fitting results.
+
+        """
+        key = self.key(df, args)
+        solver = SolverModels(df=df, args=args)
+        entry = self.load(key)
+        if entry is None:
+            minimizer, result = solver()
+            if (args.get("monitor_insights") or {}).get("reason") == "timeout":
+                return minimizer, result
+            self.save(
+                key,
+                minimizer=minimizer,
+                result=result,
+                insights={
+                    name: value
+                    for name, value in args.items()
+                    if name.endswith("_insights") and name != "fit_insights"
+                },
+            )
+            return minimizer, result
+        result, max_nfev, insights = entry
+        args.update(insights)
+        minimizer = solver.minimizer()
+        minimizer.max_nfev = max_nfev
+        return minimizer, result
+
+    @staticmethod
+    def key(df: pd.DataFrame, args: dict[str, Any]) -> str:
+        """Return the key of the fit.
+
+        Args:
+            df (pd.DataFrame): DataFrame containing the preprocessed input data.
+            args (Dict[str, Any]): The input file arguments as a dictionary with
+                 additional information beyond the command line arguments.
+
+        Returns:
+            str: Hexadecimal SHA-256 hash of the fit.
+
+        """
+        digest = sha256()
+        digest.update(
+            json.dumps(
+                {
+                    "version": __version__,
+                    "columns": [str(column) for column in df.columns],
+                    "shape": df.shape,
+                    "column": args["column"],
+                    "global_": args["global_"],
+                    "autopeak": args["autopeak"],
+                    "peaks": args.get("peaks"),
+                    "solver": SolverModelsAPI(**args).model_dump(),
+                },
+                sort_keys=True,
+                default=str,
+            ).encode(),
+        )
+        digest.update(np.ascontiguousarray(df.to_numpy(dtype=np.float64)).tobytes())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Return the filename of an entry.
+
+        Args:
+            key (str): Key of the fit.
+
+        Returns:
+            Path: Filename of the entry.
+
+        """
+        return self.directory / f"{key}.npz"
+
+    def load(
+        self,
+        key: str,
+    ) -> tuple[MinimizerResult, int | None, dict[str, Any]] | None:
+        """Load the fit result of an entry.
+
+        Args:
+            key (str): Key of the fit.
+
+        Returns:
+            Optional[Tuple[MinimizerResult, Optional[int], Dict[str, Any]]]: The fit
+                result, the maximum number of function evaluations of the minimizer,
+                and the additional insights of the solver, or `None` for a cache
+                miss.
+
+        """
+        self.evict()
+        fname = self.path(key)
+        if not fname.is_file():
+            return None
+        with np.load(fname, allow_pickle=False) as npz:
+            meta = json.loads(str(npz["meta"]))
+            result = MinimizerResult(**meta["statistics"])
+            result.params = Parameters().loads(meta["params"])
+            result.covar = npz.get("covar")
+            result.residual = npz["residual"]
+        self.restore_types(result, meta["dtypes"])
+        fname.touch()
+        return result, meta["max_nfev"], meta["insights"]
+
+    def save(
+        self,
+        key: str,
+        minimizer: Minimizer,
+        result: MinimizerResult,
+        insights: dict[str, Any],
+    ) -> None:
+        """Save the fit result as an entry.
+
+        Args:
+            key (str): Key of the fit.
+            minimizer (Minimizer): The minimizer class.
+            result (MinimizerResult): The result of the minimization of the best
+                 fit.
+            insights (Dict[str, Any]): Additional insights of the solver like the
+                 `multistart_insights`.
+
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "statistics": {
+                name: getattr(result, name)
+                for name in self.statistics
+                if hasattr(result, name)
+            },
+            "params": result.params.dumps(),
+            "dtypes": self.dtypes(result),
+            "max_nfev": minimizer.max_nfev,
+            "insights": insights,
+        }
+        arrays = {
+            "meta": np.array(json.dumps(transform_nested_types(meta))),
+            "residual": np.asarray(result.residual, dtype=np.float64),
+        }
+        if result.covar is not None:
+            arrays["covar"] = np.asarray(result.covar, dtype=np.float64)
+        tmp = self.directory / f"{key}.tmp"
+        with tmp.open("wb") as f:
+            np.savez_compressed(f, **arrays)
+        tmp.replace(self.path(key))
+        self.evict()
+
+    def dtypes(self, result: MinimizerResult) -> dict[str, dict[str, str]]:
+        """Return the NumPy data types of the statistics and the parameters.
+
+        !!! note "About the data types"
+
+            JSON stores NumPy scalars as native Python types, so the data types
+            are saved alongside to return the same types as an uncached fit,
+            e.g. `numpy.float64` for the best values and `numpy.bool` for the
+            `errorbars`.
+
+        Args:
+            result (MinimizerResult): The result of the minimization of the best
+                 fit.
+
+        Returns:
+            Dict[str, Dict[str, str]]: Data types of the NumPy scalars of the
+                statistics, and of the values, errors, and correlations of the
+                parameters.
+
+        """
+        dtypes = {
+            "statistics": {
+                name: getattr(result, name).dtype.str
+                for name in self.statistics
+                if isinstance(getattr(result, name, None), np.generic)
+            },
+        }
+        for name, param in result.params.items():
+            attrs = {"value": param.value, "stderr": param.stderr}
+            if param.correl:
+                attrs["correl"] = next(iter(param.correl.values()))
+            dtypes[name] = {
+                attr: value.dtype.str
+                for attr, value in attrs.items()
+                if isinstance(value, np.generic)
+            }
+        return dtypes
+
+    @staticmethod
+    def restore_types(result: MinimizerResult, dtypes: dict[str, Any]) -> None:
+        """Restore the NumPy data types of a loaded fit result.
+
+        Args:
+            result (MinimizerResult): The result of the minimization loaded from
+                 the cache.
+            dtypes (Dict[str, Any]): Data types of the NumPy scalars as returned by
+                 `dtypes`.
+
+        """
+        for name, dtype in dtypes["statistics"].items():
+            setattr(result, name, np.dtype(dtype).type(getattr(result, name)))
+        for name, param in result.params.items():
+            dtype = dtypes.get(name, {})
+            if "value" in dtype and param.expr is None:
+                param.value = np.dtype(dtype["value"]).type(param.value)
+            if "stderr" in dtype:
+                param.stderr = np.dtype(dtype["stderr"]).type(param.stderr)
+            if "correl" in dtype:
+                param.correl = {
+                    key: np.dtype(dtype["correl"]).type(value)
+                    for key, value in param.correl.items()
+                }
+
+    def evict(self) -> None:
+        """Remove the expired and least recently used entries."""
+        if not self.directory.is_dir():
+            return
+        entries = sorted(
+            (fname.stat().st_mtime, fname.stat().st_size, fname)
+            for fname in self.directory.glob("*.npz")
+        )
+        if self.max_age is not None:
+            expiry = time() - self.max_age * 86400
+            for mtime, _, fname in entries:
+                if mtime < expiry:
+                    fname.unlink(missing_ok=True)
+            entries = [entry for entry in entries if entry[0] >= expiry]
+        if self.max_size is not None:
+            size = sum(entry[1] for entry in entries)
+            for _, fsize, fname in entries:
+                if size <= self.max_size * 1024**2:
+                    break
+                fname.unlink(missing_ok=True)
+                size -= fsize
+
+
+class DataCache:
+    """Binary sidecar of the parsed data file.
+
+    !!! info "About the data cache"
+
+        Parsing a text file with thousands of columns dominates the runtime of a
+        global fit, and the file is parsed again for every "fit again". Hence,
+        the parsed data is stored as a hidden `npy`-file next to the data file,
+        together with its column names as `json`-file. The key of the sidecar is
+        the SHA-256 hash of the size and the modification time of the data file,
+        the options of the parser, and the version of SpectraFit. Later runs
+        memory-map the sidecar in copy-on-write mode instead of parsing the file.
+        Sidecars of previous versions of the data file are removed.
+
+    !!! tip "About the parser"
+
+        If `pyarrow` is installed, the first load of global data into the cache
+        uses the multithreaded `pyarrow` engine of `pandas.read_csv` for single
+        character separators without comments. Otherwise, and for all loads
+        without the cache, the default `C` engine is used.
+    """
+
+    def __init__(self, args: dict[str, Any]) -> None:
+        """Initialize the data cache.
+
+        Args:
+            args (Dict[str, Any]): The input file arguments as a dictionary with
+                 additional information beyond the command line arguments.
+
+        """
+        self.args = args
+        self.fname = Path(args["infile"])
+
+    def __call__(self) -> pd.DataFrame:
+        """Load the data from the sidecar or parse and store it.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the input data.
+
+        """
+        key = self.key()
+        df = self.load(key)
+        if df is None:
+            df = read_data(self.args, engine=self.engine)
+            with suppress(OSError):
+                self.save(key, df)
+        return df
+
+    @property
+    def engine(self) -> str | None:
+        """Return the engine of the parser for the first load.
+
+        Returns:
+            Optional[str]: `pyarrow` for global data, if it is installed and
+                supports the separator and the comments, otherwise `None` for the
+                default engine.
+
+        """
+        if (
+            self.args["global_"]
+            and find_spec("pyarrow") is not None
+            and self.args["comment"] is None
+            and len(self.args["separator"]) == 1
+        ):
+            return "pyarrow"
+        return None
+
+    def key(self) -> str:
+        """Return the key of the sidecar.
+
+        Returns:
+            str: Hexadecimal SHA-256 hash of the data file and the parser options.
+
+        """
+        stat = self.fname.stat()
+        return sha256(
+            json.dumps(
+                {
+                    "version": __version__,
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime_ns,
+                    "separator": self.args["separator"],
+                    "header": self.args["header"],
+                    "decimal": self.args["decimal"],
+                    "comment": self.args["comment"],
+                    "column": None if self.args["global_"] else self.args["column"],
+                },
+                sort_keys=True,
+                default=str,
+            ).encode(),
+        ).hexdigest()
+
+    def path(self, key: str, suffix: str) -> Path:
+        """Return the filename of the sidecar.
+
+        Args:
+            key (str): Key of the sidecar.
+            suffix (str): Suffix of the sidecar, either `.npy` or `.json`.
+
+        Returns:
+            Path: Filename of the sidecar.
+
+        """
+        return self.fname.with_name(f".{self.fname.name}.{key[:16]}{suffix}")
+
+    def load(self, key: str) -> pd.DataFrame | None:
+        """Memory-map the data of the sidecar.
+
+        Args:
+            key (str): Key of the sidecar.
+
+        Returns:
+            Optional[pd.DataFrame]: DataFrame containing the input data, or `None`
+                if there is no sidecar for the key.
+
+        """
+        fname = self.path(key, ".npy")
+        if not fname.is_file():
+            return None
+        columns = json.loads(self.path(key, ".json").read_text(encoding="utf-8"))
+        return pd.DataFrame(np.load(fname, mmap_mode="c"), columns=columns, copy=False)
+
+    def save(self, key: str, df: pd.DataFrame) -> None:
+        """Store the data as sidecar and remove the outdated sidecars.
+
+        Args:
+            key (str): Key of the sidecar.
+            df (pd.DataFrame): DataFrame containing the input data.
+
+        """
+        fname, columns = self.path(key, ".npy"), self.path(key, ".json")
+        for sidecar in self.fname.parent.glob(f".{self.fname.name}.*"):
+            if sidecar.suffix in {".npy", ".json"}:
+                sidecar.unlink(missing_ok=True)
+        columns.write_text(json.dumps(df.columns.tolist()), encoding="utf-8")
+        tmp = fname.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            np.save(f, df.to_numpy(dtype=np.float64))
+        tmp.replace(fname)
+
+
 def read_input_file(fname: Path) -> MutableMapping[str, Any]:
     """Read the input file.
 
@@ -607,28 +1387,40 @@ def load_data(args: dict[str, str]) -> pd.DataFrame:
 
     """
     try:
-        if args["global_"]:
-            return pd.read_csv(
-                args["infile"],
-                sep=args["separator"],
-                header=args["header"],
-                dtype=np.float64,
-                decimal=args["decimal"],
-                comment=args["comment"],
-            )
-        return pd.read_csv(
-            args["infile"],
-            sep=args["separator"],
-            header=args["header"],
-            usecols=args["column"],
-            dtype=np.float64,
-            decimal=args["decimal"],
-            comment=args["comment"],
-        )
+        if args.get("data_cache"):
+            return DataCache(args)()
+        return read_data(args)
     except ValueError:
         sys.exit(1)
 
 
+def read_data(args: dict[str, Any], engine: str | None = None) -> pd.DataFrame:
+    """Parse the data file by `pandas.read_csv`.
+
+    Args:
+        args (Dict[str, Any]): The input file arguments as a dictionary with
+             additional information beyond the command line arguments.
+        engine (str, optional): Engine of the parser for global data, see
+             `DataCache.engine`. Defaults to None for the default engine.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the input data.
+
+    """
+    kwargs: dict[str, Any] = {
+        "sep": args["separator"],
+        "header": args["header"],
+        "dtype": np.float64,
+        "decimal": args["decimal"],
+        "comment": args["comment"],
+    }
+    if not args["global_"]:
+        kwargs["usecols"] = args["column"]
+    elif engine is not None:
+        kwargs["engine"] = engine
+    return pd.read_csv(args["infile"], **kwargs)
+
+
 def check_keywords_consistency(
     check_args: MutableMapping[str, Any],
     ref_args: dict[str, Any],
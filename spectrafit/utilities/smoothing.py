@@ -0,0 +1,140 @@
+"""Smoothing filters for the pre-processing of the spectra.
+
+All filters smooth along the first axis, so that a 2d-array with one spectrum per
+column, e.g. of a global fit, is smoothed in one vectorized call.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from scipy.signal import oaconvolve
+from scipy.signal import savgol_filter
+
+from spectrafit.models.regular import FWHMG2SIG
+
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+SMOOTHING = ("box", "gaussian", "savgol", "kernel")
+
+
+def moving_average(y: NDArray[np.float64], width: int) -> NDArray[np.float64]:
+    r"""Return the moving average of the data by cumulative sums.
+
+    !!! info "About the moving average"
+
+        The sum over the window is the difference of two cumulative sums, which
+        costs $O(N)$ independent of the width of the window. The result is
+        identical to `numpy.convolve` with a box kernel and `mode="same"`, i.e.
+        the data is padded by zeros at the edges.
+
+    Args:
+        y (NDArray[np.float64]): Data of the shape `(n_points,)` or `(n_points,
+            n_spectra)`.
+        width (int): Width of the window in points.
+
+    Returns:
+        NDArray[np.float64]: Moving average of the same shape as `y`.
+
+    """
+    y = np.asarray(y, dtype=np.float64)
+    before = width - 1 - (width - 1) // 2
+    cumulative = np.zeros((y.shape[0] + width, *y.shape[1:]), dtype=np.float64)
+    cumulative[before + 1 : before + 1 + y.shape[0]] = y
+    np.cumsum(cumulative, axis=0, out=cumulative)
+    return (cumulative[width:] - cumulative[:-width]) / width
+
+
+def fft_convolve(
+    y: NDArray[np.float64],
+    kernel: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    r"""Return the convolution of the data with an arbitrary kernel.
+
+    !!! info "About the FFT convolution"
+
+        The convolution is evaluated by the overlap-add method of
+        `scipy.signal.oaconvolve`, which costs $O(N \log k)$ for a kernel of $k$
+        points. The result is identical to `numpy.convolve` with `mode="same"`.
+
+    Args:
+        y (NDArray[np.float64]): Data of the shape `(n_points,)` or `(n_points,
+            n_spectra)`.
+        kernel (NDArray[np.float64]): Kernel of the convolution.
+
+    Returns:
+        NDArray[np.float64]: Convolved data of the same shape as `y`.
+
+    """
+    y = np.asarray(y, dtype=np.float64)
+    kernel = np.asarray(kernel, dtype=np.float64).reshape(-1, *[1] * (y.ndim - 1))
+    return oaconvolve(y, kernel, mode="same", axes=0)
+
+
+def gaussian_smooth(y: NDArray[np.float64], fwhm: float) -> NDArray[np.float64]:
+    """Return the data convolved with a normalized Gaussian.
+
+    Args:
+        y (NDArray[np.float64]): Data of the shape `(n_points,)` or `(n_points,
+            n_spectra)`.
+        fwhm (float): Full width at half maximum of the Gaussian in points, which
+            is truncated at four standard deviations.
+
+    Returns:
+        NDArray[np.float64]: Smoothed data of the same shape as `y`.
+
+    """
+    sigma = fwhm * FWHMG2SIG
+    points = np.arange(-np.ceil(4 * sigma), np.ceil(4 * sigma) + 1)
+    kernel = np.exp(-0.5 * (points / sigma) ** 2)
+    return fft_convolve(y, kernel / kernel.sum())
+
+
+def smooth_signal(
+    y: NDArray[np.float64],
+    width: int,
+    method: str = "box",
+    order: int = 2,
+    kernel: list[float] | None = None,
+) -> NDArray[np.float64]:
+    """Smooth the data by the selected filter.
+
+    Args:
+        y (NDArray[np.float64]): Data of the shape `(n_points,)` or `(n_points,
+            n_spectra)`.
+        width (int): Width of the window in points, or the FWHM of the Gaussian.
+        method (str, optional): Filter of the smoothing, which is one of `box` for
+            the moving average, `gaussian` for the Gaussian filter, `savgol` for the
+            Savitzky-Golay filter, and `kernel` for the convolution with `kernel`.
+            Defaults to "box".
+        order (int, optional): Order of the polynomial of the Savitzky-Golay
+            filter. Defaults to 2.
+        kernel (List[float], optional): Kernel of the convolution for the method
+            `kernel`. Defaults to None.
+
+    Raises:
+        ValueError: If the method is unknown or the kernel is missing.
+
+    Returns:
+        NDArray[np.float64]: Smoothed data of the same shape as `y`.
+
+    """
+    if method == "box":
+        return moving_average(y, width)
+    if method == "gaussian":
+        return gaussian_smooth(y, width)
+    if method == "savgol":
+        return savgol_filter(y, width, order, axis=0)
+    if method == "kernel" and kernel:
+        return fft_convolve(y, np.asarray(kernel, dtype=np.float64))
+    msg = (
+        f"Smoothing method '{method}' requires a kernel."
+        if method == "kernel"
+        else f"Unknown smoothing method '{method}', expected one of {SMOOTHING}."
+    )
+    raise ValueError(msg)
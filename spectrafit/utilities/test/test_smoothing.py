@@ -0,0 +1,70 @@
+"""Test of the smoothing filters."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from scipy.signal import savgol_filter
+
+from spectrafit.utilities.smoothing import fft_convolve
+from spectrafit.utilities.smoothing import moving_average
+from spectrafit.utilities.smoothing import smooth_signal
+
+
+@pytest.fixture
+def spectra() -> np.ndarray:
+    """Fixture for three noisy spectra as columns."""
+    return np.random.default_rng(0).normal(size=(500, 3))
+
+
+@pytest.mark.parametrize("width", [1, 4, 5, 101])
+def test_moving_average(spectra: np.ndarray, width: int) -> None:
+    """Test the moving average against the box convolution."""
+    box = np.ones(width) / width
+    expected = np.column_stack(
+        [np.convolve(spectrum, box, mode="same") for spectrum in spectra.T],
+    )
+    np.testing.assert_allclose(moving_average(spectra, width), expected, atol=1e-12)
+    np.testing.assert_allclose(
+        moving_average(spectra[:, 0], width),
+        expected[:, 0],
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(fft_convolve(spectra, box), expected, atol=1e-12)
+
+
+def test_gaussian(spectra: np.ndarray) -> None:
+    """Test the normalization and the width of the Gaussian filter."""
+    impulse = smooth_signal(np.eye(51)[25], 5, method="gaussian")
+    assert impulse.sum() == pytest.approx(1.0)
+    assert np.count_nonzero(impulse >= impulse.max() / 2) == 5
+    assert smooth_signal(spectra, 6, method="gaussian").shape == spectra.shape
+
+
+def test_savgol(spectra: np.ndarray) -> None:
+    """Test the Savitzky-Golay filter along the spectra."""
+    np.testing.assert_allclose(
+        smooth_signal(spectra, 11, method="savgol", order=3),
+        savgol_filter(spectra, 11, 3, axis=0),
+    )
+
+
+def test_kernel(spectra: np.ndarray) -> None:
+    """Test the convolution with an arbitrary kernel."""
+    kernel = [0.25, 0.5, 0.25]
+    np.testing.assert_allclose(
+        smooth_signal(spectra, 0, method="kernel", kernel=kernel)[:, 1],
+        np.convolve(spectra[:, 1], kernel, mode="same"),
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize(
+    ("method", "match"),
+    [("kernel", "requires a kernel"), ("median", "Unknown smoothing")],
+)
+def test_unknown(spectra: np.ndarray, method: str, match: str) -> None:
+    """Test the errors of a missing kernel or an unknown method."""
+    with pytest.raises(ValueError, match=match):
+        smooth_signal(spectra, 5, method=method)
@@ -0,0 +1,65 @@
+"""Benchmark the implementations of the Faddeeva function of the Voigt model."""
+
+from __future__ import annotations
+
+import argparse
+
+from timeit import repeat
+
+import numpy as np
+
+from spectrafit.models.regular import FADDEEVA
+from spectrafit.models.regular import voigt
+
+
+def benchmark(n_points: int, n_peaks: int, number: int) -> None:
+    """Print the runtime and the maximum relative error of the Voigt evaluation.
+
+    Args:
+        n_points (int): Number of points of the spectrum.
+        n_peaks (int): Number of Voigt peaks, which are evaluated in one call.
+        number (int): Number of evaluations per timing.
+    """
+    x = np.linspace(-50, 50, n_points)[:, np.newaxis]
+    center = np.linspace(-40, 40, n_peaks)
+    fwhmv = np.linspace(0.2, 5.0, n_peaks)
+    gamma = np.linspace(0.01, 2.0, n_peaks)
+    reference = voigt(x, center=center, fwhmv=fwhmv, gamma=gamma)
+    timings = {}
+    for approximation in FADDEEVA:
+        result = voigt(
+            x,
+            center=center,
+            fwhmv=fwhmv,
+            gamma=gamma,
+            approximation=approximation,
+        )
+        runtime = min(
+            repeat(
+                lambda approximation=approximation: voigt(
+                    x,
+                    center=center,
+                    fwhmv=fwhmv,
+                    gamma=gamma,
+                    approximation=approximation,
+                ),
+                number=number,
+                repeat=5,
+            ),
+        )
+        timings[approximation] = runtime / number
+        error = np.max(np.abs(result / reference - 1))
+        print(  # noqa: T201
+            f"{approximation:>10}: {timings[approximation] * 1e3:8.3f} ms, "
+            f"speed-up {timings['wofz'] / timings[approximation]:5.2f}, "
+            f"max. relative error {error:.2e}",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--peaks", type=int, default=20)
+    parser.add_argument("--number", type=int, default=10)
+    args = parser.parse_args()
+    benchmark(n_points=args.points, n_peaks=args.peaks, number=args.number)